@@ -0,0 +1,138 @@
+import datetime
+import hashlib
+import os
+import threading
+import time
+import jwt
+from cache import LRUCache
+
+
+class InvalidToken(Exception):
+    """
+    Raised when a token is missing, malformed, forged or expired.
+    """
+
+
+class TokenVerifier:
+    """
+    Issues and verifies the JWTs handed out by /api/login.
+
+    The secret and algorithm are read once, when the verifier is created,
+    instead of on every request. Verified tokens are kept in a bounded LRU
+    keyed by the token itself, so a client sending the same token again costs
+    a dict lookup instead of a signature check; a cached token is still
+    rejected once its `exp` claim has passed. Since entries are keyed by the
+    exact token string, a forged or altered token can never hit the cache.
+    Callers get a copy of the claims, never the cached dict itself.
+
+    Args:
+        secret (str): The signing key; defaults to the `secret` environment variable.
+        algorithm (str): The JWT algorithm; defaults to `algorithm`.
+        lifetime (float): Seconds a new token is valid (`token_lifetime`, default 3600).
+        max_entries (int): Verified tokens kept (`token_cache_max_entries`, default 10000).
+    """
+
+    def __init__(self, secret=None, algorithm=None, lifetime=None, max_entries=None):
+        if lifetime is None:
+            lifetime = float(os.getenv('token_lifetime', 3600))
+        if max_entries is None:
+            max_entries = int(os.getenv('token_cache_max_entries', 10000))
+        self.secret = secret if secret is not None else os.getenv('secret')
+        self.algorithm = algorithm if algorithm is not None else os.getenv('algorithm')
+        self.lifetime = lifetime
+        self._cache = LRUCache(max_entries=max_entries, sizeof=lambda claims: 1)
+        self._lock = threading.Lock()
+        self.verified = 0
+        self.rejected = 0
+        self.expired = 0
+
+    def issue(self, email):
+        """
+        Args:
+            email (str): The user's email.
+
+        Returns:
+            str: A signed token for the user, expiring after `lifetime` seconds.
+        """
+        expires = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=self.lifetime)
+        return jwt.encode({"email": email, "exp": int(expires.timestamp())}, self.secret, self.algorithm)
+
+    def verify(self, token):
+        """
+        Args:
+            token (str): A token issued by `issue`.
+
+        Returns:
+            dict: A copy of the token's claims.
+
+        Raises:
+            InvalidToken: If the token's signature or claims are not valid, or it expired.
+        """
+        claims = self._cache.get(token)
+        if claims is not None:
+            if claims.get("exp") is None or claims["exp"] > time.time():
+                return dict(claims)
+            self._cache.pop(token)
+            with self._lock:
+                self.expired += 1
+            raise InvalidToken("Token expired.")
+        try:
+            claims = jwt.decode(token, self.secret, algorithms=[self.algorithm], options={"require": ["exp"]})
+        except jwt.ExpiredSignatureError:
+            with self._lock:
+                self.expired += 1
+            raise InvalidToken("Token expired.")
+        except jwt.InvalidTokenError as e:
+            with self._lock:
+                self.rejected += 1
+            raise InvalidToken(f"Invalid token: {e}")
+        if "email" not in claims:
+            with self._lock:
+                self.rejected += 1
+            raise InvalidToken("Invalid token: missing the email claim.")
+        claims["user_key"] = user_key(claims["email"])
+        with self._lock:
+            self.verified += 1
+        self._cache.put(token, claims)
+        return dict(claims)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Signature checks, rejected and expired tokens, and the cache's LRU counters.
+        """
+        stats = self._cache.stats()
+        stats.pop("bytes")
+        with self._lock:
+            return {"verified": self.verified, "rejected": self.rejected, "expired": self.expired, "cache": stats}
+
+def user_key(email):
+    """
+    Stable per-user key for partitioning sessions and caches, without
+    putting the email itself into keys.
+
+    Args:
+        email (str): The user's email.
+
+    Returns:
+        str: A 32-character hex digest of the normalized email.
+    """
+    return hashlib.sha256(email.strip().lower().encode('utf-8')).hexdigest()[:32]
+
+def bearer_token(authorization):
+    """
+    Args:
+        authorization (str): The Authorization request header.
+
+    Returns:
+        str | None: The token of a "Bearer <token>" header, or None.
+    """
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
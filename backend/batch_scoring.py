@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from skills import skill_taxonomy, skill_keys, extract_skill_keys, weighted_fit_score
+from skill_matrix import SkillMatrixScorer
+
+BATCH_ENGINES = ("matrix", "scalar")
+
+
+class BatchStats:
+    """
+    Throughput counters of batch scoring, fed with the size and duration of
+    every completed batch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.pairs = 0
+        self.seconds = 0.0
+
+    def record(self, pairs, seconds):
+        with self._lock:
+            self.batches += 1
+            self.pairs += pairs
+            self.seconds += seconds
+
+    def stats(self):
+        """
+        Returns:
+            dict: Batches, pairs scored and pairs/sec.
+        """
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "pairs": self.pairs,
+                "seconds": round(self.seconds, 4),
+                "pairs_per_sec": round(self.pairs / self.seconds, 2) if self.seconds else 0.0,
+            }
+
+
+def batch_fit_scores(resumes, job_descriptions, index=None, engine=None):
+    """
+    Score every resume against every job description.
+
+    Each document is tokenized exactly once, then every pair is scored like
+    `calculate_fit_score` from the resulting skill keys, with identical
+    results from either engine:
+    - "matrix" scores blocks of resumes against all job descriptions at once
+      with `SkillMatrixScorer`.
+    - "scalar" scores pair by pair; the longer of the two lists drives the
+      outer loop and is parsed lazily.
+
+    Args:
+        resumes (list): Resume texts.
+        job_descriptions (list): Job description texts.
+        index (SkillIndex): The taxonomy to use, defaults to the current one.
+        engine (str): One of `BATCH_ENGINES`, defaults to the batch_engine
+            setting or "matrix".
+
+    Yields:
+        tuple: (resume_index, job_index, fit_score) for every pair.
+
+    Raises:
+        ValueError: If the engine is unknown.
+    """
+    engine = engine or os.getenv('batch_engine', 'matrix')
+    if engine not in BATCH_ENGINES:
+        raise ValueError(f"Unknown batch engine: {engine}")
+    index = index or skill_taxonomy.current()
+
+    if engine == "matrix":
+        scorer = SkillMatrixScorer(job_descriptions, index)
+        for start, scores in scorer.iter_scores(resumes):
+            for offset, row in enumerate(scores.tolist()):
+                for job_index, fit_score in enumerate(row):
+                    yield start + offset, job_index, fit_score
+        return
+
+    def parse_resume(text):
+        return set(skill_keys(text, index)) if isinstance(text, str) else None
+
+    def parse_job(text):
+        if not isinstance(text, str):
+            return None
+        required, preferred = extract_skill_keys(text, index)
+        return required, len(required), preferred, len(preferred)
+
+    def score(resume, job):
+        if resume is None or job is None:
+            return 0
+        required, required_total, preferred, preferred_total = job
+        return weighted_fit_score(
+            len(required & resume), required_total,
+            len(preferred & resume), preferred_total
+        )
+
+    if len(resumes) >= len(job_descriptions):
+        jobs = [parse_job(text) for text in job_descriptions]
+        for resume_index, text in enumerate(resumes):
+            resume = parse_resume(text)
+            for job_index, job in enumerate(jobs):
+                yield resume_index, job_index, score(resume, job)
+    else:
+        parsed_resumes = [parse_resume(text) for text in resumes]
+        for job_index, text in enumerate(job_descriptions):
+            job = parse_job(text)
+            for resume_index, resume in enumerate(parsed_resumes):
+                yield resume_index, job_index, score(resume, job)
@@ -0,0 +1,116 @@
+"""
+Measure concurrent /api/register and /api/login throughput per database engine setup.
+
+Each setup gets a fresh SQLite file: "bare" is the engine the backend used
+to create (`create_engine(url)` with every default), "tuned" the engine of
+`database.engine.create_database_engine` (WAL, pragmas, sized pool, busy
+timeout), both with sync sessions run in worker threads (`ThreadedSession`),
+and "async" the aiosqlite engine of `create_async_database_engine`.
+Registrations and then logins are fired concurrently at the app in-process;
+bcrypt runs with a low work factor and the user cache is off, so the
+database dominates. Run from the backend directory:
+    python -m benchmarks.bench_auth [--users 500] [--concurrency 50] [--rounds 4]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault('secret', 'bench-secret-of-at-least-thirty-two-bytes')
+os.environ.setdefault('algorithm', 'HS256')
+
+import main
+from database.engine import create_database_engine, create_async_database_engine
+
+
+def use_engine(engine):
+    main.models.Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    async def get_async_db():
+        db = main.models.ThreadedSession(SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    main.app.dependency_overrides[main.get_async_db] = get_async_db
+
+def use_async_engine(engine):
+    main.models.Base.metadata.create_all(bind=create_engine(str(engine.url).replace("+aiosqlite", "")))
+    SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def get_async_db():
+        async with SessionLocal() as db:
+            yield db
+
+    main.app.dependency_overrides[main.get_async_db] = get_async_db
+
+async def run_load(path, payloads, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = {}
+    transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def one(payload):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(path, json=payload)
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(payload) for payload in payloads))
+        elapsed = time.perf_counter() - start
+    return elapsed, sorted(latencies), statuses
+
+def report(label, count, elapsed, latencies, statuses):
+    def pct(fraction):
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+    print(
+        f"{label}: {count} requests in {elapsed:.2f}s = {count / elapsed:.1f} req/s, "
+        f"p50 {pct(0.5):.1f} ms, p95 {pct(0.95):.1f} ms, p99 {pct(0.99):.1f} ms, statuses {statuses}"
+    )
+
+async def run_setup(label, engine, users, logins, concurrency):
+    # One event loop per setup: pooled aiosqlite connections belong to the loop that opened them
+    report(f"{label} register", len(users), *await run_load("/api/register", users, concurrency))
+    report(f"{label} login", len(logins), *await run_load("/api/login", logins, concurrency))
+    disposed = engine.dispose()
+    if disposed is not None:
+        await disposed
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=4, help="bcrypt work factor")
+    args = parser.parse_args()
+
+    main.password_hasher = main.PasswordHasher(rounds=args.rounds, max_queue_depth=args.concurrency)
+    main.user_cache = main.UserCache(ttl=0)
+    users = [
+        {"email": f"user{i}@example.com", "password": f"password-{i}", "username": f"user{i}"}
+        for i in range(args.users)
+    ]
+    logins = [{"email": user["email"], "password": user["password"]} for user in users]
+    setups = {
+        "bare": lambda url: (create_engine(url, connect_args={"check_same_thread": False}), use_engine),
+        "tuned": lambda url: (create_database_engine(url), use_engine),
+        "async": lambda url: (create_async_database_engine(url), use_async_engine),
+    }
+    for label, make_engine in setups.items():
+        with tempfile.TemporaryDirectory() as directory:
+            engine, use = make_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+            use(engine)
+            asyncio.run(run_setup(label, engine, users, logins, args.concurrency))
+    main.app.dependency_overrides.pop(main.get_async_db, None)
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,77 @@
+"""
+Measure /api/fit-score throughput under concurrent load, fully offline.
+
+Starts the local LLM stub with an artificial latency, points the backend's
+LLM client at it and fires concurrent requests at the app in-process.
+Run from the backend directory:
+    python -m benchmarks.bench_fit_score [--requests 200] [--concurrency 50] [--latency 0.2]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+import httpx
+import main
+from benchmarks.llm_stub import LLMStubServer
+
+RESUME = "Experienced software engineer skilled in Python, AWS, Docker and REST APIs."
+
+JOB_DESCRIPTION = (
+    "Looking for a backend engineer.\n"
+    "Required Skills:\n- Python\n- AWS\n- REST APIs\n\n"
+    "Preferred Skills:\n- Docker\n- Kubernetes"
+)
+
+
+def seed_sessions(count, unique=False):
+    session_ids = []
+    for i in range(count):
+        session_id = str(uuid.uuid4())
+        resume = f"{RESUME} Candidate {i}." if unique else RESUME
+        main.session_store.set(session_id, {"resume_text": resume, "job_description": JOB_DESCRIPTION})
+        session_ids.append(session_id)
+    return session_ids
+
+async def run_load(session_ids, concurrency, path="/api/fit-score"):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def one(session_id):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(path, headers={"X-Session-Id": session_id})
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(session_id) for session_id in session_ids))
+        elapsed = time.perf_counter() - start
+    return elapsed, sorted(latencies), statuses
+
+def report(label, count, elapsed, latencies, statuses):
+    def pct(fraction):
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+    print(
+        f"{label}: {count} requests in {elapsed:.2f}s = {count / elapsed:.1f} req/s, "
+        f"p50 {pct(0.5):.1f} ms, p95 {pct(0.95):.1f} ms, p99 {pct(0.99):.1f} ms, statuses {statuses}"
+    )
+
+def run(requests, concurrency, latency, unique=True):
+    with LLMStubServer(latency=latency) as stub:
+        main.llm_client.base_url = stub.base_url
+        main.llm_client.api_key = "stub-key"
+        session_ids = seed_sessions(requests, unique=unique)
+        elapsed, latencies, statuses = asyncio.run(run_load(session_ids, concurrency))
+        report("fit-score", requests, elapsed, latencies, statuses)
+        print(f"upstream calls: {stub.requests}, llm client: {main.llm_client.stats()}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.latency)
@@ -0,0 +1,92 @@
+"""
+Benchmark every available PDF extraction backend over a corpus of PDFs.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pdf_backends [--iterations N] [--corpus-dir DIR]
+
+The corpus is generated with reportlab (1, 10 and 50 text-dense pages) plus
+e2e/tests/resume.pdf and any PDF found in --corpus-dir. For each backend and
+document it reports p50/p90/p99 latency, pages/sec, bytes/sec and whether
+the extracted text equals the PyPDF2 output.
+"""
+import argparse
+import difflib
+import glob
+import os
+import time
+from io import BytesIO
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from pdf_extraction import BACKENDS, DEFAULT_BACKEND, extract_pdf_document
+
+RESUME_PDF = os.path.join(os.path.dirname(__file__), "..", "..", "e2e", "tests", "resume.pdf")
+
+LINE = "Experienced engineer with Python, AWS, Docker and REST APIs delivering services."
+
+
+def generate_pdf(pages, lines_per_page=45):
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(pages):
+        for i in range(lines_per_page):
+            c.drawString(40, 760 - 16 * i, f"{page}.{i} {LINE}")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+def build_corpus(corpus_dir=None):
+    corpus = {f"generated-{pages}p.pdf": generate_pdf(pages) for pages in (1, 10, 50)}
+    paths = [RESUME_PDF] if os.path.exists(RESUME_PDF) else []
+    if corpus_dir:
+        paths += sorted(glob.glob(os.path.join(corpus_dir, "*.pdf")))
+    for path in paths:
+        with open(path, "rb") as f:
+            corpus[os.path.basename(path)] = f.read()
+    return corpus
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run(iterations, corpus_dir=None):
+    corpus = build_corpus(corpus_dir)
+    backends = [backend for backend in BACKENDS.values() if backend.available()]
+    baseline = {
+        name: extract_pdf_document(data, backends=[BACKENDS[DEFAULT_BACKEND]]).text
+        for name, data in corpus.items()
+    }
+    header = f"{'backend':<10} {'document':<22} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'pages/s':>9} {'MB/s':>7}  text vs {DEFAULT_BACKEND}"
+    print(header)
+    print("-" * len(header))
+    for backend in backends:
+        for name, data in corpus.items():
+            latencies = []
+            try:
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    result = extract_pdf_document(data, backends=[backend])
+                    latencies.append(time.perf_counter() - start)
+            except ValueError as e:
+                print(f"{backend.name:<10} {name:<22} failed: {str(e)}")
+                continue
+            total = sum(latencies)
+            if result.text == baseline[name]:
+                equality = "equal"
+            else:
+                ratio = difflib.SequenceMatcher(None, baseline[name], result.text).ratio()
+                equality = f"differs (similarity {ratio:.3f})"
+            print(
+                f"{backend.name:<10} {name:<22} "
+                f"{percentile(latencies, 0.5) * 1000:>9.2f} "
+                f"{percentile(latencies, 0.9) * 1000:>9.2f} "
+                f"{percentile(latencies, 0.99) * 1000:>9.2f} "
+                f"{result.pages * iterations / total:>9.1f} "
+                f"{len(data) * iterations / total / 1e6:>7.2f}  {equality}"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--corpus-dir", default=None)
+    args = parser.parse_args()
+    run(args.iterations, args.corpus_dir)
@@ -0,0 +1,93 @@
+"""
+Measure top-K query latency of the resume index at growing corpus sizes.
+
+Fills a temporary index with synthetic resumes drawing skills from
+data/skill_taxonomy.json with a skewed popularity, then times top-K queries
+for random job descriptions, next to a full scan over in-memory token sets.
+Run from the backend directory:
+    python -m benchmarks.bench_resume_index [--sizes 10000,100000] [--queries 50] [--k 10]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from resume_index import ResumeIndex
+from skills import tokenize, extract_skills, weighted_fit_score
+from taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy
+
+FILLER = "led delivered built designed owned improved reliable scalable services teams customers".split()
+
+
+def skewed_sample(rng, skills, count):
+    # Low indexes are far more popular, like "python" versus "terraform"
+    return {skills[min(int(rng.paretovariate(1.2)) - 1, len(skills) - 1)] for _ in range(count)}
+
+def resume_text(rng, skills, number):
+    words = list(skewed_sample(rng, skills, rng.randint(3, 12))) + rng.sample(FILLER, 5)
+    rng.shuffle(words)
+    return f"Candidate {number}: " + ", ".join(words)
+
+def job_text(rng, skills):
+    required = skewed_sample(rng, skills, 5)
+    preferred = skewed_sample(rng, skills, 3) - required
+    return (
+        "Required Skills:\n" + "\n".join(f"- {skill}" for skill in required)
+        + "\n\nPreferred Skills:\n" + "\n".join(f"- {skill}" for skill in preferred)
+    )
+
+def percentile(latencies, fraction):
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+def run(sizes, queries, k):
+    with open(DEFAULT_TAXONOMY_PATH, "rb") as file:
+        skills = load_taxonomy(file.read())["skills"]
+    rng = random.Random(0)
+    skills = skills[:]
+    rng.shuffle(skills)
+    jobs = [job_text(rng, skills) for _ in range(queries)]
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            index = ResumeIndex(os.path.join(directory, "resume_index.db"))
+            token_sets = {}
+            start = time.perf_counter()
+            for number in range(size):
+                text = resume_text(rng, skills, number)
+                token_sets[index.add(text)] = set(tokenize(text))
+            build = time.perf_counter() - start
+
+            latencies = []
+            for job in jobs:
+                start = time.perf_counter()
+                index.top_k(job, k)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+
+            scan_latencies = []
+            for job in jobs:
+                start = time.perf_counter()
+                required, preferred = extract_skills(job)
+                scores = sorted(
+                    ((weighted_fit_score(len(required & tokens), len(required), len(preferred & tokens), len(preferred)), resume_id)
+                     for resume_id, tokens in token_sets.items()),
+                    key=lambda item: (-item[0], item[1])
+                )[:k]
+                scan_latencies.append(time.perf_counter() - start)
+            scan_latencies.sort()
+
+            stats = index.stats()
+            print(
+                f"{size:>7} resumes (built in {build:.1f}s, {stats['postings']} postings): "
+                f"top-{k} p50 {percentile(latencies, 0.5):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms, "
+                f"{stats['postings_read'] / queries:.0f} postings read/query, "
+                f"{stats['early_terminations']}/{queries} terminated early | "
+                f"full scan p50 {percentile(scan_latencies, 0.5):.2f} ms"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.queries, args.k)
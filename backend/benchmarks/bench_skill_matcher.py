@@ -0,0 +1,73 @@
+"""
+Compare the multi-word skill regex with the Aho-Corasick SkillMatcher.
+
+Builds both matchers over vocabularies of growing size (the real
+skills of data/skill_taxonomy.json padded with synthetic phrases) and times building them and
+scanning a resume-sized text. Run from the backend directory:
+    python -m benchmarks.bench_skill_matcher [--sizes 50,5000,50000] [--repeat 20]
+"""
+import argparse
+import random
+import re
+import time
+from skill_matcher import SkillMatcher
+from taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy
+
+WORDS = [
+    "data", "cloud", "platform", "distributed", "systems", "stream", "processing", "graph",
+    "learning", "security", "mobile", "web", "design", "testing", "network", "edge",
+    "compute", "storage", "analytics", "pipeline", "service", "mesh", "vision", "language",
+]
+
+
+def vocabulary(size, rng):
+    with open(DEFAULT_TAXONOMY_PATH, "rb") as file:
+        skills = load_taxonomy(file.read())["skills"]
+    seen = set(skills)
+    while len(skills) < size:
+        phrase = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))) + f" {rng.randint(0, size)}"
+        if phrase not in seen:
+            seen.add(phrase)
+            skills.append(phrase)
+    return skills[:size]
+
+def resume_text(skills, rng, length=5000):
+    parts = []
+    while sum(len(part) + 1 for part in parts) < length:
+        parts.append(rng.choice(skills) if rng.random() < 0.2 else rng.choice(WORDS))
+    return " ".join(parts)
+
+def build_regex(skills):
+    return re.compile(
+        r'\b(' + '|'.join(re.escape(skill) for skill in sorted(skills, key=lambda x: -len(x))) + r')\b',
+        re.IGNORECASE
+    )
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+def run(sizes, repeat):
+    rng = random.Random(0)
+    for size in sizes:
+        skills = vocabulary(size, rng)
+        text = resume_text(skills, rng)
+        regex_build, pattern = timed(lambda: build_regex(skills), 1)
+        trie_build, matcher = timed(lambda: SkillMatcher(skills), 1)
+        regex_match, regex_spans = timed(lambda: [match.span() for match in pattern.finditer(text)], repeat)
+        trie_match, trie_spans = timed(lambda: list(matcher.finditer(text)), repeat)
+        assert regex_spans == trie_spans
+        print(
+            f"{size:>6} skills, {len(text)} chars, {len(trie_spans)} matches: "
+            f"regex build {regex_build:.1f} ms, match {regex_match:.2f} ms | "
+            f"trie build {trie_build:.1f} ms, match {trie_match:.2f} ms"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="50,5000,50000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.repeat)
@@ -0,0 +1,113 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+Answers every POST to .../chat/completions with a canned resume analysis
+after an artificial latency, so LLM-bound endpoints can be tested and load
+tested offline. Run from the backend directory:
+    python -m benchmarks.llm_stub [--port 8100] [--latency 0.5]
+then start the backend with openai_base_url=http://127.0.0.1:8100/v1.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_ANALYSIS = {
+    "fit_score": 80,
+    "feedback": [
+        {"category": "skills", "text": "Include experience with AWS services."},
+        {"category": "experience", "text": "Add projects demonstrating REST API development."}
+    ]
+}
+
+
+class LLMStubServer:
+    """
+    Threaded HTTP server imitating the chat completions endpoint.
+
+    Args:
+        port (int): The port to listen on, 0 picks a free one.
+        latency (float): Seconds to wait before answering each request.
+        analysis (dict): The JSON document returned as message content.
+        fail_first (int): Number of initial requests answered with HTTP 500.
+    """
+
+    def __init__(self, port=0, latency=0.0, analysis=None, fail_first=0):
+        self.latency = latency
+        self.analysis = analysis or DEFAULT_ANALYSIS
+        self.fail_first = fail_first
+        self.requests = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with stub._lock:
+                    stub.requests += 1
+                    failing = stub.requests <= stub.fail_first
+                    stub.prompts.append(body.get("messages", [{}])[-1].get("content"))
+                time.sleep(stub.latency)
+                if failing or not self.path.endswith("/chat/completions"):
+                    self._send(500 if failing else 404, {"error": {"message": "stub error", "type": "server_error"}})
+                    return
+                self._send(200, {
+                    "id": f"chatcmpl-stub-{stub.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": json.dumps(stub.analysis)}
+                    }],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+                })
+
+            def _send(self, code, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}/v1"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    server = LLMStubServer(args.port, args.latency)
+    print(f"LLM stub listening on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,224 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Size-bounded least-recently-used cache with optional expiry.
+
+    Entries are evicted oldest-first once either `max_entries` or `max_bytes`
+    is exceeded. The size of an entry is computed by `sizeof`, which defaults
+    to `len` of the value. With `ttl` set, entries expire `ttl` seconds after
+    they were stored and are then treated as misses.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, sizeof=len, ttl=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, entry, now):
+        return entry[2] is not None and entry[2] <= now
+
+    def _discard(self, key):
+        self._bytes -= self._data.pop(key)[1]
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._expired(entry, time.monotonic()):
+                self._discard(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._data:
+                self._discard(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (value, size, expires_at)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._data[key][0]
+            self._discard(key)
+            return value
+
+    def purge_expired(self):
+        """
+        Drop every expired entry.
+
+        Returns:
+            int: The number of entries dropped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, entry in self._data.items() if self._expired(entry, now)]
+            for key in expired:
+                self._discard(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def keys(self):
+        """
+        Returns:
+            list: The keys of live entries, least recently used first.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [key for key, entry in self._data.items() if not self._expired(entry, now)]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry is not None and not self._expired(entry, time.monotonic())
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Entry count, stored bytes and hit/miss/eviction counters.
+        """
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class PdfTextCache:
+    """
+    Content-addressed cache of extracted resume text.
+
+    Keys are SHA-256 digests of the uploaded PDF bytes, so re-uploading the
+    same file skips parsing entirely. Text lives in an in-memory LRU and, when
+    `directory` is set, in a second on-disk tier that survives restarts and is
+    shared by every worker process pointing at the same directory.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, directory=None):
+        if max_entries is None:
+            max_entries = int(os.getenv('pdf_cache_max_entries', 1024))
+        if max_bytes is None:
+            max_bytes = int(os.getenv('pdf_cache_max_bytes', 16 * 1024 * 1024))
+        if directory is None:
+            directory = os.getenv('pdf_cache_dir') or None
+        self.memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.directory = directory
+        self.disk_hits = 0
+
+    @staticmethod
+    def digest(data):
+        """
+        Args:
+            data (bytes): The raw content of the PDF file.
+
+        Returns:
+            str: The hex SHA-256 digest used as cache key.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, digest):
+        return os.path.join(self.directory, digest[:2], f"{digest}.txt")
+
+    def get(self, digest):
+        """
+        Look up the extracted text of a PDF.
+
+        Args:
+            digest (str): The digest returned by `digest`.
+
+        Returns:
+            str | None: The cached text, or None on a miss.
+        """
+        text = self.memory.get(digest)
+        if text is not None or not self.directory:
+            return text
+        try:
+            with open(self._path(digest), encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return None
+        self.disk_hits += 1
+        self.memory.put(digest, text)
+        return text
+
+    def put(self, digest, text):
+        """
+        Store the extracted text of a PDF in every configured tier.
+
+        Args:
+            digest (str): The digest returned by `digest`.
+            text (str): The cleaned text extracted from the PDF.
+        """
+        self.memory.put(digest, text)
+        if not self.directory:
+            return
+        path = self._path(digest)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Unable to write PDF text cache entry: {str(e)}")
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Memory tier statistics plus disk hits and overall misses.
+        """
+        memory = self.memory.stats()
+        return {
+            "entries": memory["entries"],
+            "bytes": memory["bytes"],
+            "evictions": memory["evictions"],
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "hits": memory["hits"] + self.disk_hits,
+            "misses": memory["misses"] - self.disk_hits,
+        }
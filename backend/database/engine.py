@@ -0,0 +1,152 @@
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+DEFAULT_DATABASE_URL = "sqlite:///./database/database.db"
+# Async drivers used for URLs that do not name one
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+
+def sqlite_pragmas():
+    """
+    The pragmas set on every SQLite connection, read from the environment.
+
+    `sqlite_journal_mode` (default WAL, so readers never block the writer),
+    `sqlite_synchronous` (default NORMAL, safe with WAL), `sqlite_cache_size`
+    (default -65536, i.e. 64 MiB of page cache per connection) and
+    `sqlite_mmap_size` (default 256 MiB of memory-mapped I/O).
+
+    Returns:
+        dict: Pragma values keyed by pragma name.
+    """
+    return {
+        "journal_mode": os.getenv('sqlite_journal_mode', 'WAL'),
+        "synchronous": os.getenv('sqlite_synchronous', 'NORMAL'),
+        "cache_size": int(os.getenv('sqlite_cache_size', -65536)),
+        "mmap_size": int(os.getenv('sqlite_mmap_size', 256 * 1024 * 1024)),
+        "foreign_keys": "ON",
+    }
+
+def is_sqlite_memory(url):
+    """
+    Args:
+        url (str): A database URL.
+
+    Returns:
+        bool: Whether the URL is an in-memory SQLite database.
+    """
+    return url.split("?")[0] in ("sqlite://", "sqlite:///:memory:", "sqlite+aiosqlite://", "sqlite+aiosqlite:///:memory:")
+
+def engine_options(url, pool_size=None, max_overflow=None, pool_timeout=None, busy_timeout=None):
+    """
+    Keyword arguments of `create_engine` for a database URL.
+
+    The pool is sized by `database_pool_size` (default 5), `database_max_overflow`
+    (default 10) and `database_pool_timeout` (seconds to wait for a connection,
+    default 30). SQLite connections may be used from any thread and wait up to
+    `database_busy_timeout` seconds (default 5) for a lock instead of failing
+    with "database is locked". An in-memory SQLite database is a single shared
+    connection, since each new connection would see an empty database.
+
+    Args:
+        url (str): The database URL.
+
+    Returns:
+        dict: The engine options.
+    """
+    if busy_timeout is None:
+        busy_timeout = float(os.getenv('database_busy_timeout', 5))
+    if url.startswith("sqlite") and is_sqlite_memory(url):
+        return {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+    options = {
+        "pool_size": pool_size if pool_size is not None else int(os.getenv('database_pool_size', 5)),
+        "max_overflow": max_overflow if max_overflow is not None else int(os.getenv('database_max_overflow', 10)),
+        "pool_timeout": pool_timeout if pool_timeout is not None else float(os.getenv('database_pool_timeout', 30)),
+    }
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False, "timeout": busy_timeout}
+    else:
+        options["pool_pre_ping"] = True
+    return options
+
+def set_sqlite_pragmas(engine, pragmas=None):
+    """
+    Set `pragmas` (defaults to `sqlite_pragmas()`) on every new connection of `engine`.
+
+    Args:
+        engine (Engine): A SQLite engine; pass `engine.sync_engine` for an async engine.
+        pragmas (dict): Pragma values keyed by pragma name.
+    """
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+def create_database_engine(url=None, **options):
+    """
+    Create the engine of the users database.
+
+    The URL is read from `database_url` (default: the SQLite file
+    ./database/database.db), so the same models run against any database
+    SQLAlchemy supports. SQLite engines get the pragmas of `sqlite_pragmas`.
+
+    Args:
+        url (str): The database URL, overriding `database_url`.
+        **options: Overrides of `engine_options`.
+
+    Returns:
+        Engine: The engine.
+    """
+    url = url or os.getenv('database_url') or DEFAULT_DATABASE_URL
+    engine = create_engine(url, **engine_options(url, **options))
+    if url.startswith("sqlite"):
+        set_sqlite_pragmas(engine)
+    return engine
+
+def async_database_url(url):
+    """
+    Args:
+        url (str): A database URL.
+
+    Returns:
+        str: The URL with the async driver of its database (`ASYNC_DRIVERS`),
+            unless it already names a driver.
+    """
+    parsed = make_url(url)
+    if "+" in parsed.drivername or parsed.drivername not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=f"{parsed.drivername}+{ASYNC_DRIVERS[parsed.drivername]}").render_as_string(hide_password=False)
+
+def create_async_database_engine(url=None, **options):
+    """
+    Create an async engine of the users database, configured like `create_database_engine`.
+
+    Args:
+        url (str): The database URL, overriding `database_url`; its async
+            driver is picked by `async_database_url`.
+        **options: Overrides of `engine_options`.
+
+    Returns:
+        AsyncEngine: The engine.
+
+    Raises:
+        ImportError: If the async driver (such as aiosqlite) is not installed.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = async_database_url(url or os.getenv('database_url') or DEFAULT_DATABASE_URL)
+    engine_kwargs = engine_options(url, **options)
+    if url.startswith("sqlite") and not is_sqlite_memory(url):
+        # aiosqlite defaults to opening a connection per session
+        engine_kwargs["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(url, **engine_kwargs)
+    if url.startswith("sqlite"):
+        set_sqlite_pragmas(engine.sync_engine)
+    return engine
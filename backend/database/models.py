@@ -1,7 +1,10 @@
+import asyncio
+import os
 from sqlalchemy import Column, String
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from database.engine import create_database_engine, create_async_database_engine, DEFAULT_DATABASE_URL
 
 Base = declarative_base()
 
@@ -15,10 +18,134 @@ class User(Base):
         self.email = email
         self.username = username
         self.hashed_password = hashed_password
+
+def find_user(session, email):
+    """
+    Look a user up and end the read transaction.
+
+    The user is detached from the session with its attributes loaded, so
+    the caller holds no pooled connection while it awaits something else
+    (such as bcrypt). Run it with `run_sync` on an async session.
+
+    Args:
+        session (Session): A sync session.
+        email (str): The user's email.
+
+    Returns:
+        User | None: The user, or None if unknown.
+    """
+    user = session.query(User).filter(User.email == email).first()
+    if user is not None:
+        session.expunge(user)
+    session.rollback()
+    return user
+
+def add_user(session, user):
+    """
+    Insert a user in one transaction. Run it with `run_sync` on an async session.
+
+    A concurrent registration of the same email may commit first; the
+    insert then fails on the primary key and is rolled back.
+
+    Args:
+        session (Session): A sync session.
+        user (User): The new user.
+
+    Returns:
+        bool: False if a user with the same email already exists.
+    """
+    session.add(user)
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        return False
+    return True
+
+def delete_user(session, email):
+    """
+    Delete a user in one transaction. Run it with `run_sync` on an async session.
+
+    Args:
+        session (Session): A sync session.
+        email (str): The user's email.
+
+    Returns:
+        bool: False if the user does not exist.
+    """
+    user = session.query(User).filter_by(email=email).first()
+    if not user:
+        return False
+    session.delete(user)
+    session.commit()
+    return True
+
+
+class ThreadedSession:
+    """
+    Async facade over a sync `Session`, covering the part of the `AsyncSession`
+    API the request handlers use. Every database call runs in a worker
+    thread, so it never blocks the event loop; each call ends its own
+    transaction, so no connection stays checked out between calls.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await asyncio.to_thread(fn, self.session, *args, **kwargs)
+
+    def add(self, instance):
+        self.session.add(instance)
+
+    async def commit(self):
+        await asyncio.to_thread(self.session.commit)
+
+    async def close(self):
+        await asyncio.to_thread(self.session.close)
         
-DATABASE_URL = "sqlite:///./database/database.db"
-engine = create_engine(DATABASE_URL)
+DATABASE_URL = os.getenv('database_url') or DEFAULT_DATABASE_URL
+engine = create_database_engine(DATABASE_URL)
 
 Base.metadata.create_all(bind=engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async sessions for the request handlers, opened by the app's startup hook.
+# Until then, or without an async driver installed (such as aiosqlite), the
+# handlers fall back to sync sessions run in the threadpool
+async_engine = None
+AsyncSessionLocal = None
+
+def open_async_sessions():
+    """
+    Create the async engine and session factory, unless they are open.
+
+    The engine is created at startup rather than on import, since drivers
+    such as aiosqlite keep a non-daemon thread per pooled connection: an
+    engine that is never disposed would keep the interpreter from exiting.
+
+    Returns:
+        AsyncEngine | None: The new engine, or None if they were already open
+            or no async driver is installed.
+    """
+    global async_engine, AsyncSessionLocal
+    if async_engine is not None:
+        return None
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        engine = create_async_database_engine(DATABASE_URL)
+    except ImportError:
+        return None
+    async_engine = engine
+    AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    return engine
+
+async def close_async_sessions():
+    """
+    Dispose of the async engine, closing its pooled connections and their threads.
+    """
+    global async_engine, AsyncSessionLocal
+    engine, async_engine, AsyncSessionLocal = async_engine, None, None
+    if engine is not None:
+        await engine.dispose()
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class ExtractionPoolSaturated(Exception):
+    """
+    Raised when the extraction pool already holds the maximum number of
+    queued and running jobs.
+    """
+
+
+class ExtractionPool:
+    """
+    Bounded process pool that runs CPU-bound PDF parsing off the event loop.
+
+    Jobs are admitted until `max_queue_depth` jobs are queued or running; past
+    that point `submit` raises `ExtractionPoolSaturated` instead of queueing,
+    so callers can answer with 429 rather than piling up work. Each job is
+    awaited for at most `timeout` seconds. A job that times out before it
+    started is cancelled and frees its slot at once; one that is already
+    running keeps its slot until it finishes, so the admission count always
+    reflects real load on the pool. Once `max_hung` timed-out jobs are still
+    running, the pool is recycled: its worker processes are killed, every
+    slot they held is freed, and the next submit starts new workers. Jobs
+    that were running beside the hung ones fail as if their worker crashed.
+
+    With `max_workers` set to 0 the jobs run in a thread pool instead, which
+    keeps the event loop free without forking processes. Threads cannot be
+    killed, so that pool is never recycled.
+    """
+
+    def __init__(self, max_workers=None, max_queue_depth=None, timeout=None, max_hung=None):
+        if max_workers is None:
+            max_workers = int(os.getenv('pdf_pool_workers', os.cpu_count() or 1))
+        if max_queue_depth is None:
+            max_queue_depth = int(os.getenv('pdf_pool_max_queue', max(max_workers, 1) * 4))
+        if timeout is None:
+            timeout = float(os.getenv('pdf_pool_timeout', 10))
+        if max_hung is None:
+            max_hung = int(os.getenv('pdf_pool_max_hung', max(max_workers // 2, 1)))
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.timeout = timeout
+        self.max_hung = max_hung
+        self._executor = None
+        self._lock = threading.Lock()
+        # Jobs of the current executor holding a slot, and those among them that timed out
+        self._running = set()
+        self._hung = set()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._recycled = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.max_workers == 0:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="pdf-extraction")
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _release(self, future):
+        # Called when the worker is done with the job, or when it was cancelled before it started
+        with self._lock:
+            if future not in self._running:
+                return  # Its slot was freed when the pool was recycled
+            self._running.discard(future)
+            self._hung.discard(future)
+            self._in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                self._completed += 1
+            else:
+                self._failed += 1
+
+    def _abandon(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def submit(self, fn, *args):
+        """
+        Run `fn(*args)` in the pool and wait for its result.
+
+        Args:
+            fn: A picklable module-level function.
+            *args: Picklable arguments for `fn`.
+
+        Returns:
+            The return value of `fn`.
+
+        Raises:
+            ExtractionPoolSaturated: If the queue-depth limit is reached.
+            TimeoutError: If the job does not finish within `timeout` seconds.
+        """
+        with self._lock:
+            if self._in_flight >= self.max_queue_depth:
+                self._rejected += 1
+                raise ExtractionPoolSaturated(
+                    f"Extraction queue is full ({self.max_queue_depth} jobs)."
+                )
+            self._in_flight += 1
+            self._submitted += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            executor = self._get_executor()
+            concurrent_future = executor.submit(fn, *args)
+            with self._lock:
+                self._running.add(concurrent_future)
+            concurrent_future.add_done_callback(self._release)
+            future = asyncio.wrap_future(concurrent_future, loop=loop)
+        except BrokenProcessPool:
+            self._abandon()
+            self._reset_executor(executor)
+            raise ValueError("PDF extraction worker is unavailable, please retry.")
+        except Exception:
+            self._abandon()
+            raise
+
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+                # Cancelling only stops jobs that had not started
+                if concurrent_future in self._running:
+                    self._hung.add(concurrent_future)
+                recycle = self.max_workers > 0 and len(self._hung) >= self.max_hung
+            if recycle:
+                self._recycle(executor)
+            raise TimeoutError(f"PDF extraction exceeded {self.timeout:g} seconds.")
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            raise ValueError("PDF extraction worker crashed while parsing the file.")
+
+    def _reset_executor(self, executor):
+        # Only the executor the job ran on, which may already have been replaced
+        if executor is None or self._executor is not executor:
+            return
+        self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _recycle(self, executor):
+        # Kill the workers, stuck on hung jobs, and free every slot of their jobs
+        if self._executor is not executor:
+            return
+        self._executor = None
+        with self._lock:
+            self._in_flight -= len(self._running)
+            self._running.clear()
+            self._hung.clear()
+            self._recycled += 1
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Pool configuration and job counters.
+        """
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "timeout": self.timeout,
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "hung": len(self._hung),
+                "recycled": self._recycled,
+            }
+
+    def shutdown(self):
+        """
+        Stop the workers. The pool is recreated on the next submit.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,376 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+JOB_STATUSES = ("queued", "running", "done", "dead")
+
+
+class JobQueue:
+    """
+    Durable queue of background jobs kept in a SQLite file.
+
+    Jobs survive restarts and are shared by every worker process pointing at
+    the same path. `claim` hands a queued job to one worker and leases it for
+    `lease` seconds; a job whose worker died (or whose process restarted)
+    without completing it is claimed again once the lease runs out. A failed
+    job is retried after an exponential backoff of `retry_backoff` seconds,
+    and after `max_attempts` attempts it is dead-lettered: kept with its last
+    error under the status "dead" and never retried.
+
+    A job's outcome is only stored by the attempt that currently holds it, so
+    a worker whose lease expired cannot overwrite the result of the worker
+    that claimed the job again. The payload is dropped once a job is done or
+    dead, and finished jobs are deleted `retention` seconds later.
+
+    Args:
+        path (str): The SQLite file, or ":memory:".
+        max_attempts (int): Attempts before a job is dead-lettered.
+        retry_backoff (float): Seconds before the first retry, doubled on each attempt.
+        lease (float): Seconds a claimed job stays with its worker.
+        retention (float): Seconds finished jobs are kept.
+    """
+
+    def __init__(self, path, max_attempts=3, retry_backoff=2.0, lease=300.0, retention=86400.0):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.lease = lease
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, available_at REAL NOT NULL, lease_until REAL, "
+            "started_at REAL, finished_at REAL, run_seconds REAL NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at)")
+        self._purged_at = 0.0
+        self.retries = 0
+        self.reclaimed = 0
+        self.stale = 0
+        self.purged = 0
+
+    def submit(self, kind, payload):
+        """
+        Queue a job.
+
+        Args:
+            kind (str): The job type, which selects its handler.
+            payload (dict): The job's JSON-serializable input.
+
+        Returns:
+            str: The job ID.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at, available_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, json.dumps(payload), now, now)
+            )
+        return job_id
+
+    def claim(self):
+        """
+        Lease the oldest job that is due, including jobs whose lease expired.
+        At most once a minute, also delete the jobs that finished more than
+        `retention` seconds ago.
+
+        Returns:
+            dict | None: The job's id, kind, payload and attempt number, or None if no job is due.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs that lost their worker on their last attempt are not run again
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'dead', payload = NULL, error = COALESCE(error, 'Lease expired'), "
+                    "lease_until = NULL, finished_at = ? WHERE status = 'running' AND lease_until <= ? AND attempts >= ?",
+                    (now, now, self.max_attempts)
+                )
+                purge = now - self._purged_at >= 60
+                if purge:
+                    purged = self._conn.execute(
+                        "DELETE FROM jobs WHERE finished_at <= ?", (now - self.retention,)
+                    ).rowcount
+                row = self._conn.execute(
+                    "SELECT id, kind, payload, attempts, status FROM jobs "
+                    "WHERE (status = 'queued' AND available_at <= ?) OR (status = 'running' AND lease_until <= ?) "
+                    "ORDER BY available_at LIMIT 1",
+                    (now, now)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, "
+                        "started_at = COALESCE(started_at, ?) WHERE id = ?",
+                        (now + self.lease, now, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if purge:
+                self._purged_at = now
+                self.purged += purged
+            if row is None:
+                return None
+            self.reclaimed += row[4] == "running"
+        return {"id": row[0], "kind": row[1], "payload": json.loads(row[2]), "attempt": row[3] + 1}
+
+    def complete(self, job_id, attempt, result, seconds=0.0):
+        """
+        Store a job's result and drop its payload.
+
+        Args:
+            job_id (str): The job ID.
+            attempt (int): The attempt number returned by `claim`.
+            result (dict): The job's JSON-serializable result.
+            seconds (float): The time spent running this attempt.
+
+        Returns:
+            bool: Whether the result was stored, False if the job was claimed
+                again after this attempt's lease expired.
+        """
+        with self._lock:
+            stored = self._conn.execute(
+                "UPDATE jobs SET status = 'done', payload = NULL, result = ?, error = NULL, lease_until = NULL, "
+                "finished_at = ?, run_seconds = run_seconds + ? WHERE id = ? AND status = 'running' AND attempts = ?",
+                (json.dumps(result), time.time(), seconds, job_id, attempt)
+            ).rowcount == 1
+            self.stale += not stored
+        return stored
+
+    def fail(self, job_id, attempt, error, seconds=0.0):
+        """
+        Record a failed attempt: retry the job later, or dead-letter it once
+        it used up its attempts.
+
+        Args:
+            job_id (str): The job ID.
+            attempt (int): The attempt number returned by `claim`.
+            error (str): The error of this attempt.
+            seconds (float): The time spent running this attempt.
+
+        Returns:
+            bool | None: Whether the job will be retried, or None if the job
+                was claimed again after this attempt's lease expired.
+        """
+        now = time.time()
+        with self._lock:
+            retry = attempt < self.max_attempts
+            if retry:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = ?, lease_until = NULL, available_at = ?, "
+                    "run_seconds = run_seconds + ? WHERE id = ? AND status = 'running' AND attempts = ?",
+                    (error, now + self.retry_backoff * 2 ** (attempt - 1), seconds, job_id, attempt)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = 'dead', payload = NULL, error = ?, lease_until = NULL, finished_at = ?, "
+                    "run_seconds = run_seconds + ? WHERE id = ? AND status = 'running' AND attempts = ?",
+                    (error, now, seconds, job_id, attempt)
+                )
+            if cursor.rowcount != 1:
+                self.stale += 1
+                return None
+            self.retries += retry
+        return retry
+
+    def get(self, job_id):
+        """
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            dict | None: The job's status, attempts, result or last error and
+                timings, or None if unknown.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, status, attempts, result, error, created_at, started_at, finished_at, run_seconds "
+                "FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, kind, job_status, attempts, result, error, created_at, started_at, finished_at, run_seconds = row
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "status": job_status,
+            "attempts": attempts,
+            "result": json.loads(result) if result is not None else None,
+            "error": error,
+            "created_at": created_at,
+            "queue_seconds": round(started_at - created_at, 4) if started_at is not None else None,
+            "run_seconds": round(run_seconds, 4),
+            "total_seconds": round(finished_at - created_at, 4) if finished_at is not None else None,
+        }
+
+    def stats(self):
+        """
+        Returns:
+            dict: Jobs by status, retries, reclaimed leases, outcomes of expired
+                attempts that were discarded, purged jobs and mean timings of
+                finished jobs.
+        """
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            mean_queue, mean_run = self._conn.execute(
+                "SELECT AVG(started_at - created_at), AVG(run_seconds) FROM jobs WHERE status = 'done'"
+            ).fetchone()
+            return {
+                **{job_status: counts.get(job_status, 0) for job_status in JOB_STATUSES},
+                "retries": self.retries,
+                "reclaimed": self.reclaimed,
+                "stale": self.stale,
+                "purged": self.purged,
+                "mean_queue_seconds": round(mean_queue, 4) if mean_queue is not None else 0.0,
+                "mean_run_seconds": round(mean_run, 4) if mean_run is not None else 0.0,
+            }
+
+
+class JobWorkerPool:
+    """
+    Async workers that run the jobs of a `JobQueue` on the current event loop.
+
+    Each of the `concurrency` workers claims a job, runs the handler
+    registered for its kind with the job's payload and stores the result, or
+    records the failure so the queue retries or dead-letters the job. Idle
+    workers poll the queue every `poll_interval` seconds, or sooner when
+    `wake` is called after a submit. A worker whose queue access fails (such
+    as "database is locked" under contention) logs the error, waits
+    `poll_interval` seconds and carries on; a job whose outcome could not be
+    stored is claimed again when its lease expires.
+
+    Args:
+        queue (JobQueue): The queue to work on.
+        handlers (dict): Async functions taking a payload and returning a result, keyed by job kind.
+        concurrency (int): Number of jobs run at once.
+        timeout (float): Seconds an attempt may run before it fails.
+        poll_interval (float): Seconds between polls of an idle queue.
+    """
+
+    def __init__(self, queue, handlers, concurrency=2, timeout=120.0, poll_interval=1.0):
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._tasks = []
+        self._wakeup = None
+        self.running = 0
+        self.errors = 0
+
+    def start(self):
+        """
+        Start the workers on the running event loop; a no-op if they are running.
+        """
+        if any(not task.done() for task in self._tasks):
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        """
+        Stop the workers. Jobs they were running are claimed again when their lease expires.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self):
+        """
+        Let idle workers look for new jobs now.
+        """
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _work(self):
+        while True:
+            try:
+                job = await asyncio.to_thread(self.queue.claim)
+                if job is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self.run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"Job worker error, retrying in {self.poll_interval}s: {str(e) or type(e).__name__}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def run(self, job):
+        """
+        Run one claimed job and record its outcome.
+
+        Args:
+            job (dict): A job returned by `JobQueue.claim`.
+        """
+        self.running += 1
+        start = time.perf_counter()
+        try:
+            handler = self.handlers.get(job["kind"])
+            if handler is None:
+                raise ValueError(f"No handler for jobs of kind {job['kind']}")
+            result = await asyncio.wait_for(handler(job["payload"]), self.timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            retry = await asyncio.to_thread(self.queue.fail, job["id"], job["attempt"], error, time.perf_counter() - start)
+            outcome = ", lease expired" if retry is None else ", will retry" if retry else ", dead-lettered"
+            print(f"Job {job['id']} attempt {job['attempt']} failed{outcome}: {error}")
+        else:
+            await asyncio.to_thread(self.queue.complete, job["id"], job["attempt"], result, time.perf_counter() - start)
+        finally:
+            self.running -= 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: Worker configuration, jobs running in this process and queue errors survived.
+        """
+        return {
+            "concurrency": self.concurrency,
+            "timeout": self.timeout,
+            "workers": sum(1 for task in self._tasks if not task.done()),
+            "running": self.running,
+            "errors": self.errors,
+        }
+
+def create_job_queue(min_lease=0.0):
+    """
+    Create the job queue configured by job_queue_path, job_max_attempts,
+    job_retry_backoff, job_lease and job_retention.
+
+    Args:
+        min_lease (float): The shortest lease allowed, such as the workers'
+            timeout, so a job is not claimed again while an attempt may
+            still be running.
+
+    Returns:
+        JobQueue: The queue; it lives in memory when job_queue_path is empty.
+    """
+    return JobQueue(
+        os.getenv('job_queue_path', './database/jobs.db') or ":memory:",
+        max_attempts=int(os.getenv('job_max_attempts', 3)),
+        retry_backoff=float(os.getenv('job_retry_backoff', 2)),
+        lease=max(float(os.getenv('job_lease', 300)), min_lease),
+        retention=float(os.getenv('job_retention', 86400)),
+    )
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from cache import LRUCache
+
+
+def normalize_text(text):
+    """
+    Collapse whitespace so inputs that only differ in spacing share a cache entry.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The text with runs of whitespace replaced by single spaces.
+    """
+    return " ".join(text.split())
+
+
+class AnalysisCache:
+    """
+    Cache of validated LLM analyses keyed on model, prompt version and inputs.
+
+    Values are the `OutputData` fields as a dict. They live in an in-memory
+    LRU with expiry and, when `path` is set, in a persistent SQLite tier
+    shared by every worker. Entries are tagged with the prompt version they
+    were produced with; opening the SQLite tier drops every entry from other
+    versions, and `invalidate` drops everything explicitly.
+    """
+
+    def __init__(self, prompt_version, max_entries=None, max_bytes=None, ttl=None, path=None):
+        if max_entries is None:
+            max_entries = int(os.getenv('llm_cache_max_entries', 1024))
+        if max_bytes is None:
+            max_bytes = int(os.getenv('llm_cache_max_bytes', 8 * 1024 * 1024))
+        if ttl is None:
+            ttl = float(os.getenv('llm_cache_ttl', 24 * 3600))
+        if path is None:
+            path = os.getenv('llm_cache_path') or None
+        self.prompt_version = prompt_version
+        self.ttl = ttl
+        self.memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+        self.path = path
+        self.disk_hits = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "key TEXT PRIMARY KEY, prompt_version INTEGER NOT NULL, "
+                "value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "DELETE FROM analysis_cache WHERE prompt_version != ? OR expires_at <= ?",
+                (prompt_version, time.time())
+            )
+
+    def key(self, model, resume_text, job_description):
+        """
+        Args:
+            model (str): The model name.
+            resume_text (str): The resume text.
+            job_description (str): The job description text.
+
+        Returns:
+            str: The hex SHA-256 digest identifying this analysis.
+        """
+        digest = hashlib.sha256()
+        for part in (model, str(self.prompt_version), normalize_text(resume_text), normalize_text(job_description)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Args:
+            key (str): The key returned by `key`.
+
+        Returns:
+            dict | None: The cached analysis, or None on a miss.
+        """
+        value = self.memory.get(key)
+        if value is None and self._conn is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM analysis_cache WHERE key = ? AND prompt_version = ? AND expires_at > ?",
+                    (key, self.prompt_version, time.time())
+                ).fetchone()
+            if row is not None:
+                value = row[0]
+                self.disk_hits += 1
+                self.memory.put(key, value)
+        return json.loads(value) if value is not None else None
+
+    def put(self, key, analysis):
+        """
+        Args:
+            key (str): The key returned by `key`.
+            analysis (dict): The validated analysis.
+        """
+        value = json.dumps(analysis)
+        self.memory.put(key, value)
+        if self._conn is not None:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, prompt_version, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, self.prompt_version, value, time.time() + self.ttl)
+                )
+
+    def invalidate(self):
+        """
+        Drop every cached analysis from all tiers.
+        """
+        self.memory.clear()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.execute("DELETE FROM analysis_cache")
+
+    def stats(self):
+        """
+        Returns:
+            dict: Memory tier statistics plus disk hits and overall misses.
+        """
+        memory = self.memory.stats()
+        return {
+            "prompt_version": self.prompt_version,
+            "entries": memory["entries"],
+            "bytes": memory["bytes"],
+            "evictions": memory["evictions"],
+            "expirations": memory["expirations"],
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "hits": memory["hits"] + self.disk_hits,
+            "misses": memory["misses"] - self.disk_hits,
+        }
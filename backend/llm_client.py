@@ -0,0 +1,145 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import httpx
+import openai
+
+# Errors worth retrying: the request may succeed on a later attempt
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class LLMClient:
+    """
+    Shared async client for the OpenAI chat completions API.
+
+    The underlying `AsyncOpenAI` client and its HTTP connection pool are
+    created lazily on first use and reused by every request. At most
+    `max_concurrency` calls are in flight at once; extra callers wait for a
+    slot. Connection errors, rate limits and 5xx responses are retried up to
+    `max_retries` times with full-jitter exponential backoff.
+
+    The client is bound to the event loop it was created on; used from
+    another loop (as happens under the test client), it is closed and
+    rebuilt. `aclose` closes it at shutdown.
+    """
+
+    def __init__(self, api_key=None, base_url=None, max_concurrency=None, timeout=None,
+                 max_retries=None, max_connections=None, backoff_base=0.5, backoff_cap=8.0):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency or int(os.getenv('llm_max_concurrency', 8))
+        self.timeout = timeout if timeout is not None else float(os.getenv('llm_timeout', 30))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('llm_max_retries', 2))
+        self.max_connections = max_connections or int(os.getenv('llm_max_connections', 20))
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.total_latency = 0.0
+
+    async def _get_client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is not loop:
+            await self.aclose()
+        if self._client is None:
+            http_client = openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+            )
+            self._client = openai.AsyncOpenAI(
+                api_key=self.api_key or os.getenv('gpt_key'),
+                base_url=self.base_url or os.getenv('openai_base_url') or None,
+                timeout=self.timeout,
+                max_retries=0,  # Retries are handled here, with jitter
+                http_client=http_client,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client, self._semaphore
+
+    async def aclose(self):
+        """
+        Close the client and its connection pool; the next call opens new ones.
+        """
+        client, self._client, self._semaphore, self._loop = self._client, None, None, None
+        if client is None:
+            return
+        try:
+            await client.close()
+        except RuntimeError:
+            # Connections of an event loop that was already closed cannot be
+            # closed cleanly; they are dropped with the pool
+            pass
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    async def chat_completion(self, **kwargs):
+        """
+        Create a chat completion, retrying transient failures.
+
+        Args:
+            **kwargs: Arguments of `chat.completions.create`.
+
+        Returns:
+            ChatCompletion: The API response.
+
+        Raises:
+            openai.OpenAIError: If the call fails after all retries.
+        """
+        client, semaphore = await self._get_client()
+        async with semaphore:
+            with self._lock:
+                self.requests += 1
+                self.in_flight += 1
+            start = time.perf_counter()
+            try:
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        return await client.chat.completions.create(**kwargs)
+                    except RETRYABLE_ERRORS:
+                        if attempt == self.max_retries:
+                            raise
+                        with self._lock:
+                            self.retries += 1
+                        await asyncio.sleep(self._backoff(attempt))
+            except Exception:
+                with self._lock:
+                    self.failures += 1
+                raise
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    self.total_latency += time.perf_counter() - start
+
+    def stats(self):
+        """
+        Returns:
+            dict: Configuration and call counters.
+        """
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_connections": self.max_connections,
+                "timeout": self.timeout,
+                "requests": self.requests,
+                "retries": self.retries,
+                "failures": self.failures,
+                "in_flight": self.in_flight,
+                "mean_latency": round(self.total_latency / self.requests, 4) if self.requests else 0.0,
+            }
@@ -0,0 +1,213 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from skills import skill_taxonomy, tokenize, extract_skills
+
+SIMILARITY_METHODS = ("bm25", "tfidf")
+# Job description tokens listed under the skill sections weigh more than the rest
+SECTION_WEIGHTS = {"required": 3.0, "preferred": 2.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class JobCorpus:
+    """
+    Document frequencies of tokens over the job descriptions submitted so
+    far, the corpus behind the IDF weights of `SimilarityScorer`.
+
+    Frequencies are kept in a SQLite file shared by all workers. Each
+    process loads them into a precomputed IDF table, reloaded at most every
+    `refresh_interval` seconds when the corpus grew.
+
+    Args:
+        path (str): The SQLite file, or ":memory:".
+        refresh_interval (float): Minimum seconds between reloads of the IDF table.
+    """
+
+    def __init__(self, path, refresh_interval=10.0):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents (digest TEXT PRIMARY KEY, length INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS frequencies (token TEXT PRIMARY KEY, documents INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self._table = None
+        self._documents = 0
+        self._loaded_at = 0.0
+        self.loads = 0
+
+    def add(self, job_description):
+        """
+        Count a job description in the corpus; adding the same text again is a no-op.
+
+        Args:
+            job_description (str): The job description text.
+
+        Returns:
+            bool: Whether the job description was new.
+        """
+        tokens = tokenize(job_description)
+        digest = hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = self._conn.execute(
+                    "INSERT OR IGNORE INTO documents (digest, length) VALUES (?, ?)", (digest, len(tokens))
+                ).rowcount
+                if added:
+                    self._conn.executemany(
+                        "INSERT INTO frequencies (token, documents) VALUES (?, 1) "
+                        "ON CONFLICT(token) DO UPDATE SET documents = documents + 1",
+                        ((token,) for token in set(tokens))
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return bool(added)
+
+    def idf_table(self):
+        """
+        Returns:
+            tuple: The IDF of every known token (dict), the IDF of unknown
+                tokens and the average job description length in tokens.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._table is not None and now - self._loaded_at < self.refresh_interval:
+                return self._table
+            self._loaded_at = now
+            documents, total_length = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents"
+            ).fetchone()
+            if self._table is not None and self._documents == documents:
+                return self._table
+            # BM25's IDF, which stays positive for tokens in most documents
+            idf = {
+                token: math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+                for token, frequency in self._conn.execute("SELECT token, documents FROM frequencies")
+            }
+            unknown_idf = math.log(1 + (documents + 0.5) / 0.5)
+            average_length = total_length / documents if documents else 0.0
+            self._documents = documents
+            self._table = (idf, unknown_idf, average_length)
+            self.loads += 1
+            return self._table
+
+    def stats(self):
+        """
+        Returns:
+            dict: Corpus size and IDF table reloads.
+        """
+        idf, _, average_length = self.idf_table()
+        return {
+            "documents": self._documents,
+            "tokens": len(idf),
+            "average_length": round(average_length, 2),
+            "loads": self.loads,
+        }
+
+
+class SimilarityScorer:
+    """
+    Local, network-free similarity between a resume and a job description.
+
+    Both texts go through `tokenize` and become term vectors weighted by
+    term frequency (BM25 saturation or logarithmic TF-IDF) times the IDF of
+    the job corpus; tokens listed under the job description's "Required
+    Skills" and "Preferred Skills" sections weigh more (`SECTION_WEIGHTS`).
+    The score is the cosine similarity of the two vectors.
+
+    Args:
+        corpus (JobCorpus): The corpus providing IDF weights.
+    """
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.seconds = 0.0
+
+    @staticmethod
+    def _tf(count, length, average_length, method):
+        if method == "tfidf":
+            return 1 + math.log(count)
+        normalization = 1 - BM25_B + BM25_B * length / average_length if average_length else 1
+        return count * (BM25_K1 + 1) / (count + BM25_K1 * normalization)
+
+    def score(self, resume_text, job_description, method="bm25"):
+        """
+        Args:
+            resume_text (str): The resume text.
+            job_description (str): The job description text.
+            method (str): One of `SIMILARITY_METHODS`.
+
+        Returns:
+            int: The similarity between 0 and 100.
+
+        Raises:
+            ValueError: If the method is unknown.
+        """
+        if method not in SIMILARITY_METHODS:
+            raise ValueError(f"Unknown similarity method: {method}")
+        start = time.perf_counter()
+        idf, unknown_idf, average_length = self.corpus.idf_table()
+        index = skill_taxonomy.current()
+        resume_counts = Counter(tokenize(resume_text, index))
+        job_tokens = tokenize(job_description, index)
+        job_counts = Counter(job_tokens)
+        required, preferred = extract_skills(job_description, index)
+        section_weights = {}
+        for section, skills in (("preferred", preferred), ("required", required)):
+            for skill in skills:
+                job_counts[skill] = job_counts[skill] or 1
+                section_weights[skill] = SECTION_WEIGHTS[section]
+
+        def vector(counts, length, normalize_length):
+            return {
+                token: self._tf(count, length, average_length if normalize_length else 0.0, method)
+                * idf.get(token, unknown_idf) * section_weights.get(token, 1.0)
+                for token, count in counts.items()
+            }
+
+        resume_vector = vector(resume_counts, sum(resume_counts.values()), False)
+        job_vector = vector(job_counts, len(job_tokens), True)
+        dot = sum(weight * job_vector[token] for token, weight in resume_vector.items() if token in job_vector)
+        norms = math.sqrt(sum(weight * weight for weight in resume_vector.values())) * \
+            math.sqrt(sum(weight * weight for weight in job_vector.values()))
+        similarity = int(round(100 * dot / norms)) if norms else 0
+        with self._lock:
+            self.requests += 1
+            self.seconds += time.perf_counter() - start
+        return min(similarity, 100)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Requests scored and mean latency, with the corpus statistics.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "mean_ms": round(self.seconds / self.requests * 1000, 3) if self.requests else 0.0,
+                "corpus": self.corpus.stats(),
+            }
+
+def create_similarity_scorer():
+    """
+    Create the similarity scorer over the job corpus configured by job_corpus_path.
+
+    Returns:
+        SimilarityScorer: The scorer; its corpus lives in memory when job_corpus_path is empty.
+    """
+    path = os.getenv('job_corpus_path', './database/job_corpus.db')
+    return SimilarityScorer(JobCorpus(path or ":memory:"))
@@ -1,68 +1,190 @@
-from fastapi import FastAPI, Response, status, UploadFile, Depends
+from fastapi import FastAPI, Request, Response, status, UploadFile, Depends, Header, Cookie
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import os 
-import io 
-import bcrypt
-import jwt
-import datetime
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from database import models
-from user_models import RegisterPayload, LoginPayload, JobDescriptionPayload, InputData, OutputData
-from PyPDF2 import PdfReader
+from user_models import RegisterPayload, LoginPayload, JobDescriptionPayload, SessionPayload, FitScorePayload, BatchFitScorePayload, TopResumesPayload, InputData, OutputData
+from pdf_extraction import extract_text_from_pdf, extract_pdf_document, BackendStats
+from extraction_pool import ExtractionPool, ExtractionPoolSaturated
+from password_hashing import PasswordHasher, HasherSaturated
+from user_cache import UserCache
+from auth import TokenVerifier, InvalidToken, bearer_token
+from query_stats import QueryStats
+from cache import PdfTextCache
+from session_store import create_session_store, SessionTooLarge
+from skills import skill_taxonomy, tokenize, extract_skills, analyze_skills, calculate_fit_score, generate_feedback
+from llm_client import LLMClient
+from llm_cache import AnalysisCache
+from single_flight import SingleFlight
+from batch_scoring import batch_fit_scores, BatchStats
+from resume_index import create_resume_index
+from local_scorer import create_similarity_scorer, SIMILARITY_METHODS
+from job_queue import create_job_queue, JobWorkerPool
+from upload import read_pdf_upload, content_length_exceeds, UploadStats, UploadTooLarge, NotAPdf
 import uuid
+import sqlite3
 import openai
 import json
-import re
-from collections import Counter
-from typing import List, Dict, Set
-import pdb
+import time
+from typing import Optional
 import traceback
 from dotenv import load_dotenv
 
 load_dotenv()  # Load environment variables from .env file
 
-# For tokenizing 
-STOP_WORDS = set([
-    'a', 'an', 'the', 'and', 'or', 'but', 'if', 'while', 'with', 'is', 'are',
-    'was', 'were', 'in', 'on', 'for', 'to', 'of', 'at', 'by', 'from', 'up',
-    'down', 'out', 'over', 'under', 'again', 'further', 'then', 'once', 'here',
-    'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few',
-    'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own',
-    'same', 'so', 'than', 'too', 'very', 'can', 'will', 'just', "don't", 'should',
-    'now', 'into', 'during', 'before', 'after', 'above', 'below', 'between', 'because',
-    'until', 'while', 'about', 'against', 'among', 'through', 'during', 'without',
-    'within', 'along', 'following', 'across', 'behind', 'beyond', 'plus', 'is a plus',
-    'nice to have', 'preferred', 'desired', 'is a plus', 'would be a plus', 'preferably', 'skill',
-    'skills', 'required', 'looking', 'knowledge', 'experience', 'software', 'we', 'skilled', 'familiarity', 'developer', 'desirable',
-    'seeking', 'functional', 'collaborate', 'implement', 'cross', 'responsibilities', 'develop', 'engineer', 'proficient', 'teams', 'include',
-    'maintain', "requirements", 'requirement', 'other'
-])
-
-# For tokenizing
-MULTI_WORD_SKILLS = [
-    'rest api', 'rest apis', 'machine learning', 'data analysis', 'sql database',
-    'project management', 'customer service', 'agile methodology', 'object oriented programming',
-    'software development', 'c++', 'c#', 'java', 'python', 'aws', 'docker', 'kubernetes',
-    'html5', 'css3', 'javascript', 'react js', 'node js', 'sql server', 'git version control',
-    'continuous integration', 'continuous deployment', 'linux administration', 'data structures',
-    'network security', 'cloud computing', 'api development', 'unit testing',
-    'test driven development', 'behavior driven development', 'user experience', 'ui design',
-    'cicd pipelines', 'ngs pipelines', 'automated deployment processes', 'big data technologies',
-    'data warehousing', 'database design', 'server side frameworks', 'terraform',
-    'ci/cd pipelines', 'node.js', 'express.js', 'ngs data analysis'
-]
+# Model and prompt version used for /api/analyze, both part of the analysis cache key
+ANALYSIS_MODEL = "gpt-4o-mini"
+ANALYSIS_PROMPT_VERSION = 1
+
+ANALYSIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "resume_analysis",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "fit_score": {
+                    "description": "A score representing how well the resume fits the job description.",
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": 100
+                },
+                "feedback": {
+                    "description": "List of feedback points on how the user can improve their resume.",
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "category": {
+                                "type": "string",
+                                "description": "Category of the feedback: skills, experience, or formatting"
+                            },
+                            "text": {
+                                "type": "string",
+                                "description": "The feedback text"
+                            }
+                        },
+                        "required": ["category", "text"]
+                    }
+                }
+            },
+            "required": ["fit_score", "feedback"],
+            "additionalProperties": False
+        }
+    }
+}
 
-# Sort multi-word skills by length in descending order to match longer phrases first
-# Escape special characters and allow optional non-word characters within multi-word skills
-MULTI_WORD_PATTERN = re.compile(
-    r'\b(' + '|'.join(re.escape(skill) for skill in sorted(MULTI_WORD_SKILLS, key=lambda x: -len(x))) + r')\b',
-    re.IGNORECASE
-)
+def build_analysis_prompt(resume_text, job_description):
+    """
+    Build the NLP API prompt asking for a fit score and categorized feedback.
 
+    Bump `ANALYSIS_PROMPT_VERSION` whenever this wording changes so cached
+    analyses built from the old prompt are no longer served.
 
-resume_file_content = io.BytesIO()
+    Args:
+        resume_text (str): The text extracted from the resume.
+        job_description (str): The job description text.
 
-temp_storage = {}
+    Returns:
+        str: The prompt.
+    """
+    return (
+        "You are a career coach. Based on the given resume and job description, "
+        "evaluate the fit and provide specific feedback for improvement.\n\n"
+        f"Resume:\n{resume_text}\n\n"
+        f"Job Description:\n{job_description}\n\n"
+        "Provide:\n1. A fit score (0-100).\n"
+        "2. Feedback as a JSON array where each element is an object with "
+        "'category' and 'text' fields. Categories should be one of 'skills', 'experience', or 'formatting', "
+        "based on the type of improvement suggested. The 'text' should be a concise improvement suggestion.\n\n"
+        "Example:\n"
+        "{\n"
+        "  \"fit_score\": 85,\n"
+        "  \"feedback\": [\n"
+        "    { \"category\": \"skills\", \"text\": \"Include experience with AWS services.\" },\n"
+        "    { \"category\": \"experience\", \"text\": \"Add projects demonstrating REST API development.\" }\n"
+        "  ]\n"
+        "}"
+    )
+
+# Resumes with more extracted characters than this are rejected
+MAX_RESUME_CHARS = 5000
+
+# Largest accepted resume upload
+MAX_RESUME_BYTES = 2 * 1024 * 1024
+
+# Largest number of resume/job description pairs scored by one batch request
+BATCH_MAX_PAIRS = int(os.getenv('batch_max_pairs', 100000))
+# Pairs serialized per chunk of a streamed batch response
+BATCH_CHUNK_PAIRS = 1000
+
+# Largest number of resumes returned by one top resumes query
+TOP_RESUMES_MAX_K = 100
+
+# How /api/fit-score builds its feedback when the request does not say:
+# "llm" asks the LLM, "bm25" and "tfidf" score locally without any network call
+FIT_SCORE_SCORING = os.getenv('fit_score_scoring', 'llm')
+SCORING_MODES = ("llm",) + SIMILARITY_METHODS
+
+# Resume text and job description per upload session, bounded and expiring
+session_store = create_session_store()
+
+# Pooled async OpenAI client shared by every analysis request
+llm_client = LLMClient()
+
+# Validated analyses keyed on model, prompt version and normalized inputs
+analysis_cache = AnalysisCache(ANALYSIS_PROMPT_VERSION)
+
+# Identical analyses requested concurrently share one OpenAI call
+analysis_single_flight = SingleFlight()
+
+# Cookie set by /api/resume-upload so later calls find their session
+SESSION_COOKIE = "session_id"
+
+# CPU-bound PDF parsing runs here so it never blocks the event loop
+extraction_pool = ExtractionPool()
+
+# Bounded thread pool running bcrypt for register and login, off the event loop
+password_hasher = PasswordHasher()
+
+# Short-lived user records for login, and the SQL statements run per request
+user_cache = UserCache()
+query_stats = QueryStats()
+query_stats.install(models.engine)
+
+# JWTs of /api/login, signed and verified with settings read once, verified tokens cached until they expire
+token_verifier = TokenVerifier()
+# Whether the resume and analysis routes reject requests without a bearer token;
+# the metrics, batch scoring and resume search routes always do
+REQUIRE_AUTH = os.getenv('require_auth', 'false').lower() in ('1', 'true', 'yes')
+
+# Extracted resume text keyed by a digest of the uploaded PDF bytes
+pdf_text_cache = PdfTextCache()
+
+upload_stats = UploadStats()
+
+pdf_backend_stats = BackendStats()
+
+batch_stats = BatchStats()
+
+# Every uploaded resume, indexed by token for top-K retrieval (None when disabled)
+resume_index = create_resume_index()
+
+# Local resume/job description similarity, weighted by the corpus of submitted job descriptions
+similarity_scorer = create_similarity_scorer()
+
+# Durable queue of LLM analyses submitted to /api/analysis-jobs, and the workers running them
+JOB_TIMEOUT = float(os.getenv('job_timeout', 120))
+job_queue = create_job_queue(min_lease=JOB_TIMEOUT)
+analysis_workers = JobWorkerPool(
+    job_queue,
+    {"analysis": lambda payload: analysis_job(payload)},
+    concurrency=int(os.getenv('job_workers', 2)),
+    timeout=JOB_TIMEOUT,
+)
 
 app = FastAPI()
 
@@ -79,13 +201,175 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    # Starlette spools the whole multipart body before the endpoint runs, so
+    # an upload declaring too large a body is turned away here, unread
+    if request.url.path == "/api/resume-upload" and content_length_exceeds(request.headers, MAX_RESUME_BYTES):
+        upload_stats.record("rejected_too_large", 0)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"error": "File size exceeds the 2MB limit.", "status": "error"}
+        )
+    return await call_next(request)
+
+@app.middleware("http")
+async def count_db_queries(request: Request, call_next):
+    counter, token = query_stats.begin()
+    try:
+        return await call_next(request)
+    finally:
+        query_stats.end(request.url.path, counter, token)
+
 def get_db():
+    query_stats.session_opened()
     db = models.SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+async def get_async_db():
+    """
+    Yield an async database session for the request handlers.
+
+    It is an `AsyncSession` on the async engine, or a `ThreadedSession`
+    running a sync session in worker threads when no async driver is installed
+    or the app's startup hooks did not run (no async engine is open then).
+    Either way, database I/O does not block the event loop.
+    """
+    query_stats.session_opened()
+    if models.AsyncSessionLocal is not None:
+        async with models.AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = models.ThreadedSession(models.SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
+
+async def get_current_user(authorization: Optional[str] = Header(None)):
+    """
+    Verify the bearer token of the Authorization header.
+
+    A request without a token is let through as anonymous unless require_auth
+    is set; a request with a token that does not verify is always rejected.
+    Verified tokens are cached, so this runs on the event loop.
+
+    Args:
+        authorization (str): The Authorization request header.
+
+    Returns:
+        dict | None: The token's claims, with the caller's email and user_key, or None if anonymous.
+
+    Raises:
+        InvalidToken: If the token is missing while required, invalid or expired.
+    """
+    token = bearer_token(authorization)
+    if token is None:
+        if REQUIRE_AUTH:
+            raise InvalidToken("Missing bearer token.")
+        return None
+    return token_verifier.verify(token)
+
+async def require_user(user: Optional[dict] = Depends(get_current_user)):
+    """
+    Like `get_current_user`, but always rejects anonymous requests, for the
+    routes returning data of every user.
+
+    Args:
+        user (dict): The claims returned by `get_current_user`.
+
+    Returns:
+        dict: The token's claims.
+
+    Raises:
+        InvalidToken: If the token is missing.
+    """
+    if user is None:
+        raise InvalidToken("Missing bearer token.")
+    return user
+
+async def load_session(session_id, user):
+    """
+    Read the caller's session. A session uploaded with a bearer token belongs
+    to its user (by user_key), and other callers are answered as if it did
+    not exist; a session uploaded anonymously is shared by its ID alone.
+
+    Args:
+        session_id (str): The session ID.
+        user (dict): The caller's claims, or None if anonymous.
+
+    Returns:
+        dict | None: The session data, or None if unknown, expired or another user's.
+    """
+    if not session_id:
+        return None
+    session = await run_in_threadpool(session_store.get, session_id)
+    if session is not None and session.get("user_key") not in (None, user and user["user_key"]):
+        return None
+    return session
+
+def get_session_id(x_session_id: Optional[str] = Header(None), session_id: Optional[str] = Cookie(None)):
+    """
+    Resolve the caller's session ID from the X-Session-Id header or the session_id cookie.
+
+    Args:
+        x_session_id (str): The X-Session-Id request header.
+        session_id (str): The session_id cookie.
+
+    Returns:
+        str | None: The session ID, the header taking precedence.
+    """
+    return x_session_id or session_id
+
+@app.exception_handler(InvalidToken)
+async def invalid_token_handler(request: Request, exc: InvalidToken):
+    return JSONResponse(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        content={"error": str(exc), "status": "error"},
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+@app.on_event("startup")
+def watch_skill_taxonomy():
+    skill_taxonomy.start()
+
+@app.on_event("startup")
+async def start_analysis_workers():
+    analysis_workers.start()
+
+@app.on_event("startup")
+def open_async_database():
+    async_engine = models.open_async_sessions()
+    if async_engine is not None:
+        query_stats.install(async_engine.sync_engine)
+
+@app.on_event("shutdown")
+def shutdown_extraction_pool():
+    extraction_pool.shutdown()
+
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+def stop_watching_skill_taxonomy():
+    skill_taxonomy.stop()
+
+@app.on_event("shutdown")
+async def stop_analysis_workers():
+    await analysis_workers.stop()
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    await llm_client.aclose()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await models.close_async_sessions()
+
 @app.get("/")
 async def root():
     """
@@ -96,8 +380,36 @@ async def root():
     """
     return {"message": "Hello World"}
 
+@app.get("/api/metrics", dependencies=[Depends(require_user)])
+async def metrics():
+    """
+    Report runtime counters of the backend's processing stages.
+
+    Returns:
+        dict: Counters keyed by stage name.
+    """
+    return {
+        "extraction_pool": extraction_pool.stats(),
+        "password_hashing": password_hasher.stats(),
+        "user_cache": user_cache.stats(),
+        "auth_tokens": token_verifier.stats(),
+        "db_queries": query_stats.stats(),
+        "pdf_text_cache": pdf_text_cache.stats(),
+        "uploads": upload_stats.stats(),
+        "pdf_backends": pdf_backend_stats.stats(),
+        "sessions": session_store.stats(),
+        "llm": llm_client.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "analysis_single_flight": analysis_single_flight.stats(),
+        "skill_taxonomy": skill_taxonomy.stats(),
+        "batch_scoring": batch_stats.stats(),
+        "resume_index": resume_index.stats() if resume_index is not None else None,
+        "similarity": similarity_scorer.stats(),
+        "analysis_jobs": {**job_queue.stats(), **analysis_workers.stats()}
+    }
+
 @app.post("/api/register")
-async def register(payload: RegisterPayload, response: Response, db: Session = Depends(get_db)):
+async def register(payload: RegisterPayload, response: Response, db: AsyncSession = Depends(get_async_db)):
     """
       Register account from the given payload.
       
@@ -109,24 +421,29 @@ async def register(payload: RegisterPayload, response: Response, db: Session = D
         dict: A JSON response with a status message.
       """
     email = payload.email
-    db_user = db.query(models.User).filter(models.User.email == email).first()
+    db_user = await db.run_sync(models.find_user, email)
     if db_user:
       response.status_code = status.HTTP_400_BAD_REQUEST
       return {"error": "Username or email already registered"}
     else:
       username = payload.username
       password = payload.password
-      bytes = password.encode('utf-8') 
-      salt = bcrypt.gensalt() 
-      hashed_password = bcrypt.hashpw(bytes, salt) 
+      try:
+        hashed_password = await password_hasher.hash(password)
+      except HasherSaturated:
+        response.status_code = status.HTTP_429_TOO_MANY_REQUESTS
+        return {"error": "Too many requests, please retry."}
       user = models.User(email=email, username=username, hashed_password=hashed_password)
-      db.add(user)
-      db.commit()
+      # Another request may have registered the email while the password was hashed
+      if not await db.run_sync(models.add_user, user):
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {"error": "Username or email already registered"}
+      user_cache.invalidate(email)
       response.status_code = status.HTTP_201_CREATED
       return {"message": "User registered"}
 
 @app.delete("/api/delete")
-async def delete(email: str, response: Response, db: Session = Depends(get_db)):
+async def delete(email: str, response: Response, db: AsyncSession = Depends(get_async_db)):
     """
       Delete account given the email. ONLY USED BY TEST SUITES
       
@@ -138,12 +455,10 @@ async def delete(email: str, response: Response, db: Session = Depends(get_db)):
         dict: A JSON response with a status message.
       """
     try:
-        user_to_delete = db.query(models.User).filter_by(email=email).first()
-        if not user_to_delete:
+        if not await db.run_sync(models.delete_user, email):
             response.status_code = status.HTTP_400_BAD_REQUEST
             return {"message": "User not found"}
-        db.delete(user_to_delete)
-        db.commit()
+        user_cache.invalidate(email)
         response.status_code = status.HTTP_200_OK
         return {"message": "User deleted"}
     except ValueError as e:
@@ -151,7 +466,7 @@ async def delete(email: str, response: Response, db: Session = Depends(get_db)):
         return {"message": "User deletion failed"}
         
 @app.post("/api/login")
-async def login(payload: LoginPayload, response: Response, db: Session = Depends(get_db)):
+async def login(payload: LoginPayload, response: Response, db: AsyncSession = Depends(get_async_db)):
     """
       Register account from the given payload.
       
@@ -164,15 +479,17 @@ async def login(payload: LoginPayload, response: Response, db: Session = Depends
       """
     email = payload.email
     password = payload.password
-    db_user = db.query(models.User).filter(models.User.email == email).first()
-    if db_user and bcrypt.checkpw(password.encode('utf-8'), db.query(models.User).filter(models.User.email == email).first().hashed_password):
-      secret = os.getenv('secret')
-      algorithm = os.getenv('algorithm')
-      payload = {
-          "email" : email,
-          "exp" : (datetime.datetime.utcnow() + datetime.timedelta(hours=1)).timestamp()
-      }
-      jwt_token = jwt.encode(payload, secret, algorithm)
+    user = user_cache.get(email)
+    if user is None:
+      db_user = await db.run_sync(models.find_user, email)
+      user = user_cache.put(db_user) if db_user else None
+    try:
+      verified = user is not None and await password_hasher.verify(password, user["hashed_password"])
+    except HasherSaturated:
+      response.status_code = status.HTTP_429_TOO_MANY_REQUESTS
+      return {"error": "Too many requests, please retry."}
+    if verified:
+      jwt_token = token_verifier.issue(email)
       response.status_code = status.HTTP_200_OK
       return {"token": jwt_token}
     else:
@@ -180,18 +497,18 @@ async def login(payload: LoginPayload, response: Response, db: Session = Depends
       return {"error": "Email or password is not recognized"}
 
 @app.post("/api/resume-upload")
-async def resume_upload(file: UploadFile, response: Response):
+async def resume_upload(file: UploadFile, response: Response, user: Optional[dict] = Depends(get_current_user)):
     """
     Upload and process a resume file, validating its type and size.
 
     Args:
         file (UploadFile): The uploaded resume file.
         response (Response): The FastAPI Response object for setting the status code.
+        user (dict): The caller's token claims, or None if anonymous; the new session belongs to this user.
 
     Returns:
         dict: A JSON response with status and processing results.
     """
-    max_file_size = 2 * 1024 * 1024
     allowed_types = ["application/pdf"]
 
     # Validate file type
@@ -199,28 +516,48 @@ async def resume_upload(file: UploadFile, response: Response):
         response.status_code = status.HTTP_400_BAD_REQUEST
         return {"error": "Invalid file type. Only PDF files are allowed.", "status": "error"}
 
-    # Read file content
-    file_content = await file.read()
-    if len(file_content) > max_file_size:
+    # Read file content in chunks, stopping early on oversized or non-PDF uploads
+    try:
+        file_content, digest = await read_pdf_upload(file, MAX_RESUME_BYTES, upload_stats)
+    except UploadTooLarge:
         response.status_code = status.HTTP_400_BAD_REQUEST
         return {"error": "File size exceeds the 2MB limit.", "status": "error"}
+    except NotAPdf:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {"error": "Invalid file type. Only PDF files are allowed.", "status": "error"}
 
     # Extract and validate text
     try:
-        text = extract_text_from_pdf(io.BytesIO(file_content))
+        text = pdf_text_cache.get(digest)
+        if text is None:
+            # Extraction stops at the page that crosses the limit, so exceeded_by is a lower bound
+            extraction = await extraction_pool.submit(extract_pdf_document, file_content, MAX_RESUME_CHARS)
+            pdf_backend_stats.record(extraction)
+            text = extraction.text
+            pdf_text_cache.put(digest, text)
         current_char_count = len(text)
-        if current_char_count > 5000:
+        if current_char_count > MAX_RESUME_CHARS:
             response.status_code = status.HTTP_400_BAD_REQUEST
             return {
                 "error": "File contains more than 5,000 characters.",
                 "status": "error",
-                "exceeded_by": current_char_count - 5000
+                "exceeded_by": current_char_count - MAX_RESUME_CHARS
             }
         
         #Create a session ID to store data
         session_id = str(uuid.uuid4())
-        temp_storage[session_id] = {"resume_text": text}
+        session = {"resume_text": text}
+        if user is not None:
+            session["user_key"] = user["user_key"]
+        await run_in_threadpool(session_store.set, session_id, session)
+        if resume_index is not None:
+            # Indexing is a side effect: the upload succeeds without it
+            try:
+                await run_in_threadpool(resume_index.add, text, digest)
+            except sqlite3.Error as e:
+                print(f"Resume not added to the index: {str(e)}")
         #print("Request data:", text)
+        response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
         response.status_code = status.HTTP_200_OK
         return {
             "message": "Resume uploaded successfully.",
@@ -228,19 +565,34 @@ async def resume_upload(file: UploadFile, response: Response):
             "character_count": current_char_count,
             "session_id": session_id
         }
+    except SessionTooLarge:
+        response.status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        return {"error": "Resume is too large to store.", "status": "error"}
+    except ExtractionPoolSaturated:
+        response.status_code = status.HTTP_429_TOO_MANY_REQUESTS
+        response.headers["Retry-After"] = "1"
+        return {"error": "Server is busy processing other resumes. Please try again shortly.", "status": "error"}
+    except TimeoutError as e:
+        # The server ran out of time, the file may well be valid
+        print(str(e))
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        response.headers["Retry-After"] = "1"
+        return {"error": f"Timed out processing the PDF, please try again: {str(e)}", "status": "error"}
     except ValueError as e:
         print(str(e))
         response.status_code = status.HTTP_400_BAD_REQUEST
         return {"error": f"Error processing PDF: {str(e)}", "status": "error"}
       
 @app.post("/api/job-description")
-async def job_description_upload(payload: JobDescriptionPayload, response: Response):
+async def job_description_upload(payload: JobDescriptionPayload, response: Response, session_id: Optional[str] = Depends(get_session_id), user: Optional[dict] = Depends(get_current_user)):
     """
-    Upload and validate a job description, associating it with the current session.
+    Upload and validate a job description, associating it with the caller's session.
 
     Args:
-        payload (JobDescriptionPayload): The payload containing the job description text.
+        payload (JobDescriptionPayload): The payload containing the job description text and optionally the session ID.
         response (Response): The FastAPI Response object for setting the status code.
+        session_id (str): The session ID from the X-Session-Id header or session_id cookie.
+        user (dict): The caller's token claims, or None if anonymous.
 
     Returns:
         dict: A JSON response indicating success or error.
@@ -250,9 +602,9 @@ async def job_description_upload(payload: JobDescriptionPayload, response: Respo
       job_description.strip()
       max_char_count = 5000
       if len(job_description) <= max_char_count:
-        session_id = next(iter(temp_storage), None)
-        if session_id:
-           temp_storage[session_id]["job_description"] = job_description
+        session_id = payload.session_id or session_id
+        if await load_session(session_id, user) is not None and await run_in_threadpool(session_store.update, session_id, job_description=job_description):
+           await run_in_threadpool(similarity_scorer.corpus.add, job_description)
            response.status_code = status.HTTP_200_OK
            #print("Request data:", job_description)
            return {
@@ -271,410 +623,383 @@ async def job_description_upload(payload: JobDescriptionPayload, response: Respo
             "error": "Job description exceeds character limit.",
             "status": "error"
         }
+    except SessionTooLarge:
+      response.status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+      return {"error": "Session is too large to store the job description.", "status": "error"}
     except Exception as e: 
       return {"error": str(e)}
 
-@app.post("/api/analyze")
-async def analyze_text(response: Response):
+async def run_analysis(resume_text, job_description):
     """
-    Send uploaded resume and job description from temporary storage to NLP API.
-    
+    Analyze a resume against a job description with the LLM.
+
+    Identical inputs are served from the analysis cache, and concurrent
+    identical analyses share one LLM call.
+
     Args:
-      response (Response): The FastAPI Response object for setting the status code
+        resume_text (str): The resume text.
+        job_description (str): The job description text.
 
     Returns:
-      OutputData: standardized output data structure for fit score and feedback if succesful otherwise an error status message.
+        OutputData: The LLM's fit score and feedback.
+
+    Raises:
+        openai.APIError: If the LLM call fails.
+        ValueError: If the LLM's answer is not a valid analysis.
     """
+    # Identical inputs analyzed before are served from the cache
+    cache_key = analysis_cache.key(ANALYSIS_MODEL, resume_text, job_description)
+    cached_analysis = analysis_cache.get(cache_key)
+    if cached_analysis is not None:
+        return OutputData(**cached_analysis)
+
+    # Construct prompt for NLP API call:
+    prompt = build_analysis_prompt(resume_text, job_description)
+    # Making a request to OpenAI API, joining an identical one already in flight
+    analysis = await analysis_single_flight.do(cache_key, lambda: llm_client.chat_completion(
+        model=ANALYSIS_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        response_format=ANALYSIS_RESPONSE_FORMAT
+    ))
+
+    # Extract relevant fields
+    raw_response = analysis.choices[0].message.content
+
+    if not raw_response.strip():
+        raise ValueError("NLP API returned an empty response.")
+
+    # Attempt to parse response as JSON
     try:
-        session_id = next(iter(temp_storage), None)
-        if not session_id or "resume_text" not in temp_storage[session_id] or "job_description" not in temp_storage[session_id]:
-            response.status_code = status.HTTP_400_BAD_REQUEST
-            return {"error": "Resume or job description not provided.", "status": "error"}
-        
-        resume_text = temp_storage[session_id]["resume_text"]
-        job_description = temp_storage[session_id]["job_description"]
-
-        # Validating input
-        InputData.is_valid(resume_text)
-        InputData.is_valid(job_description)
-        InputData.validate_length(resume_text)
-        InputData.validate_length(job_description)
-
-        # Construct prompt for NLP API call:
-        openai.api_key = os.getenv('gpt_key')
-        prompt = (
-            "You are a career coach. Based on the given resume and job description, "
-            "evaluate the fit and provide specific feedback for improvement.\n\n"
-            f"Resume:\n{resume_text}\n\n"
-            f"Job Description:\n{job_description}\n\n"
-            "Provide:\n1. A fit score (0-100).\n"
-            "2. Feedback as a JSON array where each element is an object with "
-            "'category' and 'text' fields. Categories should be one of 'skills', 'experience', or 'formatting', "
-            "based on the type of improvement suggested. The 'text' should be a concise improvement suggestion.\n\n"
-            "Example:\n"
-            "{\n"
-            "  \"fit_score\": 85,\n"
-            "  \"feedback\": [\n"
-            "    { \"category\": \"skills\", \"text\": \"Include experience with AWS services.\" },\n"
-            "    { \"category\": \"experience\", \"text\": \"Add projects demonstrating REST API development.\" }\n"
-            "  ]\n"
-            "}"
-        )
-        # Making a request to OpenAI API
-        analysis = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "resume_analysis",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "fit_score": {
-                                "description": "A score representing how well the resume fits the job description.",
-                                "type": "integer",
-                                "minimum": 0,
-                                "maximum": 100
-                            },
-                            "feedback": {
-                                "description": "List of feedback points on how the user can improve their resume.",
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "category": {
-                                            "type": "string",
-                                            "description": "Category of the feedback: skills, experience, or formatting"
-                                        },
-                                        "text": {
-                                            "type": "string",
-                                            "description": "The feedback text"
-                                        }
-                                    },
-                                    "required": ["category", "text"]
-                                }
-                            }
-                        },
-                        "required": ["fit_score", "feedback"],
-                        "additionalProperties": False
-                    }
-                }
-            }
-        )
-
-        # Extract relevant fields
-        raw_response = analysis.choices[0].message.content
-
-        if not raw_response.strip():
-            raise ValueError("NLP API returned an empty response.")
-
-        # Attempt to parse response as JSON
-        try:
-            parsed_response = json.loads(raw_response)
-        except json.JSONDecodeError:
-            raise ValueError(f"Response is not in JSON format: {raw_response}")
-
-        fit_score = parsed_response['fit_score']
-        feedback = parsed_response.get('feedback', [])
-        #if not isinstance(feedback, list):
-         #  feedback = [feedback]
-        #feedback = [str(item) for item in feedback]
-
-        # Validate output data structure
-        if not isinstance(fit_score, int) or not isinstance(feedback, list):
-            raise ValueError("NLP API response has invalid 'fit_score' or 'feedback' format.")
-
-        # Additional validation checks if needed
-        for f_item in feedback:
-            if 'category' not in f_item or 'text' not in f_item:
-                raise ValueError("Each feedback item must contain 'category' and 'text' fields.")
-
-        # Map parsed data to OutputData (assuming you adjust OutputData accordingly)
-        # If OutputData still expects just a list of strings, you'll need to update it.
-        
-        output = OutputData(
-          fit_score = fit_score,
-          feedback = feedback
-        )
-        #print("Fit Score:", output.fit_score)
-        #print("Feedback:", output.feedback)
-        
-        #Validate output data
-        OutputData.validate_output(output)
-        response.status_code = status.HTTP_200_OK
-        return output
-    except openai.APIError as e:
-        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
-        return {"error": f"Unable to process the request due to OpenAI API: {str(e)}", "status": "error"}
-    except ValueError as e:
-        response.status_code = status.HTTP_400_BAD_REQUEST
-        return {"error": f"Validation error with input. Please try again. {str(e)}", "status": "error"}
-    except Exception as e:
-        response.status_code = status.HTTP_400_BAD_REQUEST
-        return {"error": f"Unable to process the request. Please try again later: {str(e)}", "status": "error"}
+        parsed_response = json.loads(raw_response)
+    except json.JSONDecodeError:
+        raise ValueError(f"Response is not in JSON format: {raw_response}")
+
+    fit_score = parsed_response['fit_score']
+    feedback = parsed_response.get('feedback', [])
+    #if not isinstance(feedback, list):
+     #  feedback = [feedback]
+    #feedback = [str(item) for item in feedback]
+
+    # Validate output data structure
+    if not isinstance(fit_score, int) or not isinstance(feedback, list):
+        raise ValueError("NLP API response has invalid 'fit_score' or 'feedback' format.")
+
+    # Additional validation checks if needed
+    for f_item in feedback:
+        if 'category' not in f_item or 'text' not in f_item:
+            raise ValueError("Each feedback item must contain 'category' and 'text' fields.")
+
+    # Map parsed data to OutputData (assuming you adjust OutputData accordingly)
+    # If OutputData still expects just a list of strings, you'll need to update it.
+    
+    output = OutputData(
+      fit_score = fit_score,
+      feedback = feedback
+    )
+    #print("Fit Score:", output.fit_score)
+    #print("Feedback:", output.feedback)
+    
+    #Validate output data
+    OutputData.validate_output(output)
+    analysis_cache.put(cache_key, output.dict())
+    return output
 
-def extract_text_from_pdf(file):
+async def analysis_job(payload):
     """
-    Extract text from a PDF file and clean up unnecessary line breaks and whitespace.
+    Run an analysis job of the job queue.
 
     Args:
-        file: The PDF file to extract text from.
-    
+        payload (dict): The job's resume_text and job_description.
+
     Returns:
-        str: The cleaned text extracted from the PDF.
+        dict: The fit score and feedback.
     """
-    try:
-        reader = PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""  # Handle cases where text extraction might return None
-        return " ".join(text.split())  # Remove extraneous whitespace
-    except Exception as e:
-        raise ValueError(f"Failed to extract text from PDF: {str(e)}")
+    output = await run_analysis(payload["resume_text"], payload["job_description"])
+    return output.dict()
 
-def tokenize(text):
+@app.post("/api/analyze")
+async def analyze_text(response: Response, payload: Optional[SessionPayload] = None, session_id: Optional[str] = Depends(get_session_id), user: Optional[dict] = Depends(get_current_user)):
     """
-    Tokenizes the input text into normalized tokens, handling multi-word skills.
-
-    This function processes the input text to:
-    - Replace multi-word skills with a single token (e.g., "machine learning" becomes "machine_learning").
-    - Normalize tokens by converting to lowercase and removing special characters.
-    - Remove stop words from the tokenized text.
-
+    Send uploaded resume and job description of the caller's session to NLP API.
+    
     Args:
-        text (str): The input text to tokenize.
+      response (Response): The FastAPI Response object for setting the status code
+      payload (SessionPayload): Optional body carrying the session ID
+      session_id (str): The session ID from the X-Session-Id header or session_id cookie
+      user (dict): The caller's token claims, or None if anonymous
 
     Returns:
-        list: A list of normalized tokens extracted from the input text.
+      OutputData: standardized output data structure for fit score and feedback if succesful otherwise an error status message.
     """
-    if not isinstance(text, str):
-        return []
+    if payload and payload.session_id:
+        session_id = payload.session_id
+    response.status_code, output = await analyze_session(session_id, user)
+    return output
 
-    # Replace multi-word skills with underscores
-    def replace_multi_word_skills(match):
-        return match.group(0).lower().replace(' ', '_').replace('/', '').replace('.', '')
-    
-    text = MULTI_WORD_PATTERN.sub(replace_multi_word_skills, text)
-    
-    # Find all word tokens (including those with underscores)
-    tokens = re.findall(r'\b\w+\b', text.lower())
-    
-    # Remove stop words
-    tokens = [token for token in tokens if token not in STOP_WORDS]
-    
-    return tokens
-
-def extract_skills(job_description):
+async def analyze_session(session_id, user):
     """
-    Extracts required and preferred skills from a job description.
-
-    The function parses the job description text to identify skills listed
-    under "Required Skills" and "Preferred Skills" sections. Skills are normalized
-    to lowercase and multi-word skills are converted to a single token using underscores.
+    Run the LLM analysis of a session's resume and job description, shared by
+    /api/analyze and /api/fit-score.
 
     Args:
-        job_description (str): The job description text to extract skills from.
+      session_id (str): The session ID.
+      user (dict): The caller's token claims, or None if anonymous.
 
     Returns:
-        tuple: A tuple containing two sets:
-            - required_skills (set): A set of skills identified as required.
-            - preferred_skills (set): A set of skills identified as preferred.
+      tuple: The HTTP status code, and the OutputData if succesful otherwise an error status message.
     """
-    required_skills = set()
-    preferred_skills = set()
+    try:
+        session = await load_session(session_id, user)
+        if not session or "resume_text" not in session or "job_description" not in session:
+            return status.HTTP_400_BAD_REQUEST, {"error": "Resume or job description not provided.", "status": "error"}
 
-    if not isinstance(job_description, str):
-        return required_skills, preferred_skills
+        resume_text = session["resume_text"]
+        job_description = session["job_description"]
 
-    # Split the job description into lines for processing
-    lines = job_description.splitlines()
+        # Validating input
+        InputData.is_valid(resume_text)
+        InputData.is_valid(job_description)
+        InputData.validate_length(resume_text)
+        InputData.validate_length(job_description)
 
-    current_section = None
-    section_headers = {
-        'required': re.compile(r'^required skills?:?$', re.IGNORECASE),
-        'preferred': re.compile(r'^preferred skills?:?$', re.IGNORECASE)
-    }
+        return status.HTTP_200_OK, await run_analysis(resume_text, job_description)
+    except openai.APIError as e:
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {"error": f"Unable to process the request due to OpenAI API: {str(e)}", "status": "error"}
+    except ValueError as e:
+        return status.HTTP_400_BAD_REQUEST, {"error": f"Validation error with input. Please try again. {str(e)}", "status": "error"}
+    except Exception as e:
+        return status.HTTP_400_BAD_REQUEST, {"error": f"Unable to process the request. Please try again later: {str(e)}", "status": "error"}
+
+@app.post("/api/analysis-jobs")
+async def submit_analysis_job(response: Response, payload: Optional[SessionPayload] = None, session_id: Optional[str] = Depends(get_session_id), user: Optional[dict] = Depends(get_current_user)):
+    """
+    Queue an LLM analysis of the caller's session, like /api/analyze without waiting for it.
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue  # Skip empty lines
-
-        # Check if the line is a section header
-        if section_headers['required'].match(line):
-            current_section = 'required'
-            continue
-        elif section_headers['preferred'].match(line):
-            current_section = 'preferred'
-            continue
-
-        # If within a recognized section, extract skills
-        if current_section in ['required', 'preferred']:
-            # Remove common bullet points if present
-            line = re.sub(r'^[-*•]\s*', '', line)
-            # Split skills by commas or semicolons
-            skills = re.split(r',|;', line)
-            for skill in skills:
-                skill = skill.strip().lower()  # Keep multi-word skills as is
-                if skill:
-                    # Replace multi-word skills with underscores
-                    skill_transformed = MULTI_WORD_PATTERN.sub(
-                        lambda match: match.group(0).lower().replace(' ', '_').replace('/', '').replace('.', ''),
-                        skill
-                    )
-                    if current_section == 'required':
-                        required_skills.add(skill_transformed)
-                    elif current_section == 'preferred':
-                        preferred_skills.add(skill_transformed)
-
-    return required_skills, preferred_skills
-
-def calculate_fit_score(resume_text, job_description):
-    """
-    Calculates a fit score based on the match between resume text and job description.
-
-    This function evaluates how well a resume aligns with a job description
-    by comparing the extracted skills from both. Required skills contribute 70%
-    to the score, while preferred skills contribute 30%.
+    The resume and job description are copied into the job, which is run by a
+    background worker and survives restarts; fetch the result from
+    GET /api/analysis-jobs/{job_id}.
 
     Args:
-        resume_text (str): The text extracted from the resume.
-        job_description (str): The job description text.
+        response (Response): The FastAPI Response object for setting the status code.
+        payload (SessionPayload): Optional body carrying the session ID.
+        session_id (str): The session ID from the X-Session-Id header or session_id cookie.
+        user (dict): The caller's token claims, or None if anonymous.
 
     Returns:
-        int: A fit score between 0 and 100, representing the degree of match.
+        dict: The job ID, or an error message.
     """
-    if not isinstance(resume_text, str) or not isinstance(job_description, str):
-        return 0
-
-    # Extract required and preferred skills
-    required_skills, preferred_skills = extract_skills(job_description)
-    #print("required skills",required_skills)
-    #print("preferred skills", preferred_skills)
-
-    if not required_skills and not preferred_skills:
-        return 0  # No skills to match
-
-    # Tokenize resume
-    resume_tokens = set(tokenize(resume_text))
-    #print("resume tokens", resume_tokens)
+    try:
+        if payload and payload.session_id:
+            session_id = payload.session_id
+        session = await load_session(session_id, user)
+        if not session or "resume_text" not in session or "job_description" not in session:
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return {"error": "Resume or job description not provided.", "status": "error"}
 
-    # Calculate matches
-    required_matches = required_skills.intersection(resume_tokens)
-    #print("required_matches", required_matches)
-    preferred_matches = preferred_skills.intersection(resume_tokens)
-    #print("preferred_matches", preferred_matches)
+        resume_text = session["resume_text"]
+        job_description = session["job_description"]
 
-    # Calculate weighted score
-    required_score = (len(required_matches) / len(required_skills)) * 70 if required_skills else 0
-    preferred_score = (len(preferred_matches) / len(preferred_skills)) * 30 if preferred_skills else 0
+        InputData.is_valid(resume_text)
+        InputData.is_valid(job_description)
+        InputData.validate_length(resume_text)
+        InputData.validate_length(job_description)
 
-    total_score = required_score + preferred_score
-    return min(int(total_score), 100)  # Ensure score does not exceed 100
+        job_id = await run_in_threadpool(
+            job_queue.submit, "analysis", {"resume_text": resume_text, "job_description": job_description}
+        )
+        analysis_workers.wake()
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {"job_id": job_id, "status": "queued"}
+    except ValueError as e:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {"error": f"Validation error with input. Please try again. {str(e)}", "status": "error"}
 
-def generate_feedback(resume_text, job_description):
+@app.get("/api/analysis-jobs/{job_id}", dependencies=[Depends(get_current_user)])
+async def get_analysis_job(job_id: str, response: Response):
     """
-    Generates actionable feedback on missing skills in the resume.
-
-    This function identifies the skills present in the job description but
-    missing from the resume, and provides suggestions on how to improve the resume
-    to align better with the job description.
+    Report the status of an analysis job.
 
     Args:
-        resume_text (str): The text extracted from the resume.
-        job_description (str): The job description text.
+        job_id (str): The job ID returned when the job was submitted.
+        response (Response): The FastAPI Response object for setting the status code.
 
     Returns:
-        dict: A dictionary containing:
-            - missing_keywords (list): A list of skills missing from the resume.
-            - suggestions (list): Suggestions on how to address the missing skills.
+        dict: The job's status ("queued", "running", "done" or "dead"), attempts,
+              result once done, last error and timings, or an error message.
     """
-    if not isinstance(resume_text, str) or not isinstance(job_description, str):
-        return {"missing_keywords": [], "suggestions": []}
-    
-    # Extract required and preferred skills
-    required_skills, preferred_skills = extract_skills(job_description)
-    
-    # Tokenize resume
-    resume_tokens = set(tokenize(resume_text))
-    
-    # Identify missing skills
-    missing_required = sorted(required_skills - resume_tokens)
-    missing_preferred = sorted(preferred_skills - resume_tokens)
-    
-    missing_keywords = missing_required + missing_preferred
-    
-    suggestions = []
-    for skill in missing_required:
-        suggestions.append(f"Include experience with {skill.replace('_', ' ')}.")
-    for skill in missing_preferred:
-        suggestions.append(f"Add projects demonstrating {skill.replace('_', ' ')}.")
-    
-    return {
-        "missing_keywords": missing_keywords,
-        "suggestions": suggestions
-    }
+    job = await run_in_threadpool(job_queue.get, job_id)
+    if job is None:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return {"error": "Unknown analysis job.", "status": "error"}
+    response.status_code = status.HTTP_200_OK
+    return job
 
 @app.post("/api/fit-score")
-async def fit_score_endpoint(response: Response):
+async def fit_score_endpoint(response: Response, payload: Optional[FitScorePayload] = None, session_id: Optional[str] = Depends(get_session_id), user: Optional[dict] = Depends(get_current_user)):
     """
     Endpoint to calculate fit score and provide feedback based on resume and job description.
 
-    It retrieves the resume and job description from the temporary storage, calculates
+    It retrieves the resume and job description of the caller's session, calculates
     the fit score using `calculate_fit_score` and generates feedback using `generate_feedback`.
+    With the "llm" scoring the feedback also includes the LLM analysis; with "bm25" or
+    "tfidf" the request is answered locally and includes a similarity score instead.
+
+    With "stream" set, the LLM analysis does not hold back the keyword results: they
+    are sent at once as the first line of a newline-delimited JSON response (status
+    "partial"), and the second line follows when the LLM answers, with the complete
+    feedback (status "complete") or the error (status "error").
 
     Args:
         response (Response): The FastAPI Response object for setting the status code.
+        payload (FitScorePayload): Optional body carrying the session ID, the scoring mode
+            and whether to stream.
+        session_id (str): The session ID from the X-Session-Id header or session_id cookie.
+        user (dict): The caller's token claims, or None if anonymous.
 
     Returns:
-        dict: A JSON response containing the fit score, matched keywords, missing keywords,
-              and suggestions, or an error message if something goes wrong.
+        dict | StreamingResponse: A JSON response containing the fit score, matched keywords,
+              missing keywords, and suggestions, or an error message if something goes wrong.
     """
     try:
-        session_id = next(iter(temp_storage), None)
-        if not session_id or "resume_text" not in temp_storage[session_id] or "job_description" not in temp_storage[session_id]:
+        scoring = payload.scoring if payload and payload.scoring else FIT_SCORE_SCORING
+        if scoring not in SCORING_MODES:
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return {"error": f"Unknown scoring: {scoring}. Use one of {', '.join(SCORING_MODES)}.", "status": "error"}
+        if payload and payload.session_id:
+            session_id = payload.session_id
+        session = await load_session(session_id, user)
+        if not session or "resume_text" not in session or "job_description" not in session:
             response.status_code = status.HTTP_400_BAD_REQUEST
             return {"error": "Resume or job description not provided.", "status": "error"}
 
-        resume_text = temp_storage[session_id]["resume_text"]
-        job_description = temp_storage[session_id]["job_description"]
+        resume_text = session["resume_text"]
+        job_description = session["job_description"]
 
         InputData.is_valid(resume_text)
         InputData.is_valid(job_description)
         InputData.validate_length(resume_text)
         InputData.validate_length(job_description)
 
-        analysis_result = await analyze_text(response)
-
-        if "error" in analysis_result:
-            return analysis_result
-
-
-        calculated_fit_score = calculate_fit_score(resume_text, job_description)
-        skill_feedback = generate_feedback(resume_text, job_description)
+        # Skills are extracted and the resume tokenized once for score, feedback and matches
+        skill_analysis = analyze_skills(resume_text, job_description)
+        calculated_fit_score = skill_analysis.fit_score()
+        skill_feedback = skill_analysis.feedback()
+        skill_items = [{"category": "skills", "text": suggestion} for suggestion in skill_feedback["suggestions"]]
 
-        sorted_feedback = analysis_result.feedback
-        for suggestion in skill_feedback["suggestions"]:
-            sorted_feedback.append({
-                "category": "skills",
-                "text": suggestion
-            })
-
-        required_skills, preferred_skills = extract_skills(job_description)
-        resume_tokens = set(tokenize(resume_text))
-        matched_skills = list(resume_tokens.intersection(required_skills | preferred_skills))
-
-        response.status_code = status.HTTP_200_OK
-        return {
+        result = {
             "fit_score": calculated_fit_score,
-            "feedback": sorted_feedback,
-            "matched_skills": matched_skills,
+            "feedback": skill_items,
+            "matched_skills": skill_analysis.matched_skills,
             "missing_keywords": skill_feedback["missing_keywords"],
             "suggestions": skill_feedback["suggestions"]
         }
 
+        if scoring != "llm":
+            # A stale corpus reloads its IDF weights from SQLite, so score off the event loop
+            result["similarity_score"] = await run_in_threadpool(similarity_scorer.score, resume_text, job_description, scoring)
+        elif payload and payload.stream:
+            async def lines():
+                yield json.dumps({**result, "status": "partial"}) + "\n"
+                _, analysis_result = await analyze_session(session_id, user)
+                if "error" in analysis_result:
+                    yield json.dumps(analysis_result) + "\n"
+                    return
+                feedback = [item.dict() for item in analysis_result.feedback] + skill_items
+                yield json.dumps({"feedback": feedback, "status": "complete"}) + "\n"
+
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+        else:
+            analysis_status, analysis_result = await analyze_session(session_id, user)
+
+            if "error" in analysis_result:
+                response.status_code = analysis_status
+                return analysis_result
+            result["feedback"] = analysis_result.feedback + skill_items
+
+        response.status_code = status.HTTP_200_OK
+        return result
+
     except Exception as e:
         response.status_code = status.HTTP_400_BAD_REQUEST
         print(traceback.format_exc())
-        return {"error": f"Unable to process the request. Please try again later: {str(e)}", "status": "error"}
\ No newline at end of file
+        return {"error": f"Unable to process the request. Please try again later: {str(e)}", "status": "error"}
+
+@app.post("/api/batch-fit-score", dependencies=[Depends(require_user)])
+async def batch_fit_score_endpoint(payload: BatchFitScorePayload, response: Response):
+    """
+    Score every resume of the payload against every job description.
+
+    Each document is tokenized once and the keyword fit score of every pair
+    is computed like `calculate_fit_score`. Results stream back as
+    newline-delimited JSON objects with the indexes of the resume and the
+    job description and their fit score, in chunks as they are computed. The
+    last line reports the number of pairs, the seconds spent and pairs/sec.
+
+    Args:
+        payload (BatchFitScorePayload): The resume texts and job description texts.
+        response (Response): The FastAPI Response object for setting the status code.
+
+    Returns:
+        StreamingResponse: The scores as application/x-ndjson, or an error message.
+    """
+    try:
+        if not payload.resumes or not payload.job_descriptions:
+            raise ValueError("At least one resume and one job description are required.")
+        pairs = len(payload.resumes) * len(payload.job_descriptions)
+        if pairs > BATCH_MAX_PAIRS:
+            raise ValueError(f"Too many pairs: {pairs} exceeds the limit of {BATCH_MAX_PAIRS}.")
+        for text in payload.resumes + payload.job_descriptions:
+            InputData.validate_length(text)
+    except ValueError as e:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {"error": str(e), "status": "error"}
+
+    def lines():
+        # Runs in the threadpool, so scoring never blocks the event loop
+        start = time.perf_counter()
+        count = 0
+        chunk = []
+        for resume_index, job_index, fit_score in batch_fit_scores(payload.resumes, payload.job_descriptions):
+            chunk.append(json.dumps({"resume": resume_index, "job_description": job_index, "fit_score": fit_score}))
+            if len(chunk) == BATCH_CHUNK_PAIRS:
+                count += len(chunk)
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        count += len(chunk)
+        seconds = time.perf_counter() - start
+        batch_stats.record(count, seconds)
+        summary = {"pairs": count, "seconds": round(seconds, 4), "pairs_per_sec": round(count / seconds, 2) if seconds else 0.0}
+        yield "".join(line + "\n" for line in chunk) + json.dumps(summary) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.post("/api/top-resumes", dependencies=[Depends(require_user)])
+async def top_resumes_endpoint(payload: TopResumesPayload, response: Response):
+    """
+    Find the uploaded resumes that best fit a job description.
+
+    The resume index is queried with the skills extracted from the job
+    description; scores are the keyword fit scores of `calculate_fit_score`.
+
+    Args:
+        payload (TopResumesPayload): The job description and the number of resumes to return.
+        response (Response): The FastAPI Response object for setting the status code.
+
+    Returns:
+        dict: A JSON response with the best resumes and their fit scores, or an error message.
+    """
+    if resume_index is None:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {"error": "The resume index is disabled.", "status": "error"}
+    try:
+        InputData.is_valid(payload.job_description)
+        InputData.validate_length(payload.job_description)
+        if not 1 <= payload.k <= TOP_RESUMES_MAX_K:
+            raise ValueError(f"k must be between 1 and {TOP_RESUMES_MAX_K}.")
+    except ValueError as e:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {"error": str(e), "status": "error"}
+
+    results = await run_in_threadpool(resume_index.best_matches, payload.job_description, payload.k)
+    response.status_code = status.HTTP_200_OK
+    return {"results": results, "status": "success"}
\ No newline at end of file
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+
+
+class HasherSaturated(Exception):
+    """
+    Raised when the password hasher already holds the maximum number of
+    queued and running jobs.
+    """
+
+
+class PasswordHasher:
+    """
+    Bounded thread pool that runs bcrypt off the event loop.
+
+    bcrypt releases the GIL while it hashes, so threads spread the work over
+    the cores without the cost of shipping jobs to processes. Jobs are
+    admitted until `max_queue_depth` jobs are queued or running; past that
+    point `hash` and `verify` raise `HasherSaturated` so callers can answer
+    with 429 instead of letting a login burst queue up without bound.
+
+    New hashes use `rounds` as the bcrypt work factor; existing hashes are
+    verified with the work factor stored in them.
+    """
+
+    def __init__(self, rounds=None, max_workers=None, max_queue_depth=None):
+        if rounds is None:
+            rounds = int(os.getenv('bcrypt_rounds', 12))
+        if max_workers is None:
+            max_workers = int(os.getenv('bcrypt_workers', os.cpu_count() or 1))
+        if max_queue_depth is None:
+            max_queue_depth = int(os.getenv('bcrypt_max_queue', max_workers * 8))
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._counts = {"hash": 0, "verify": 0}
+        self._seconds = {"hash": 0.0, "verify": 0.0}
+        self._queue_seconds = 0.0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+            return self._executor
+
+    async def _run(self, operation, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.max_queue_depth:
+                self._rejected += 1
+                raise HasherSaturated(f"Password hashing queue is full ({self.max_queue_depth} jobs).")
+            self._in_flight += 1
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._in_flight -= 1
+                    self._counts[operation] += 1
+                    self._seconds[operation] += finished - started
+                    self._queue_seconds += started - submitted
+
+        try:
+            future = self._get_executor().submit(timed)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password):
+        """
+        Args:
+            password (str): The plain text password.
+
+        Returns:
+            bytes: The bcrypt hash, salted with the configured work factor.
+
+        Raises:
+            HasherSaturated: If the queue-depth limit is reached.
+        """
+        return await self._run("hash", bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(self.rounds))
+
+    async def verify(self, password, hashed_password):
+        """
+        Args:
+            password (str): The plain text password.
+            hashed_password (bytes | str): A bcrypt hash.
+
+        Returns:
+            bool: Whether the password matches the hash.
+
+        Raises:
+            HasherSaturated: If the queue-depth limit is reached.
+        """
+        if isinstance(hashed_password, str):
+            hashed_password = hashed_password.encode('utf-8')
+        return await self._run("verify", bcrypt.checkpw, password.encode('utf-8'), hashed_password)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Pool configuration, job counters and mean latencies.
+        """
+        with self._lock:
+            jobs = self._counts["hash"] + self._counts["verify"]
+            return {
+                "rounds": self.rounds,
+                "workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": self._in_flight,
+                "rejected": self._rejected,
+                "hashes": self._counts["hash"],
+                "verifications": self._counts["verify"],
+                "mean_hash_ms": round(self._seconds["hash"] / self._counts["hash"] * 1000, 3) if self._counts["hash"] else 0.0,
+                "mean_verify_ms": round(self._seconds["verify"] / self._counts["verify"] * 1000, 3) if self._counts["verify"] else 0.0,
+                "mean_queue_ms": round(self._queue_seconds / jobs * 1000, 3) if jobs else 0.0,
+            }
+
+    def shutdown(self):
+        """
+        Stop the worker threads once their jobs are done. The pool is recreated on the next job.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
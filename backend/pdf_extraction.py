@@ -0,0 +1,249 @@
+import io
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from PyPDF2 import PdfReader
+
+
+class PdfBackend(ABC):
+    """
+    Interface of a PDF text-extraction backend.
+
+    A backend turns a PDF into an iterator of raw page strings; normalization
+    and the character budget are handled once in `extract_pdf_document`.
+    Backends for optional libraries import them lazily and report whether
+    they can be used through `available`.
+    """
+
+    name = None
+
+    def available(self):
+        return True
+
+    @abstractmethod
+    def iter_pages(self, data):
+        """
+        Args:
+            data (bytes): The raw content of the PDF file.
+
+        Yields:
+            str: The raw text of each page, in order.
+        """
+
+
+class PyPDF2Backend(PdfBackend):
+    """
+    Pure-Python extraction with PyPDF2. Always available, used by default.
+    """
+
+    name = "pypdf2"
+
+    def iter_pages(self, data):
+        for page in PdfReader(io.BytesIO(data)).pages:
+            yield page.extract_text() or ""  # Handle cases where text extraction might return None
+
+
+class PypdfBackend(PdfBackend):
+    """
+    Extraction with pypdf, the maintained successor of PyPDF2.
+    """
+
+    name = "pypdf"
+
+    def available(self):
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def iter_pages(self, data):
+        import pypdf
+        for page in pypdf.PdfReader(io.BytesIO(data)).pages:
+            yield page.extract_text() or ""
+
+
+class PyMuPDFBackend(PdfBackend):
+    """
+    Extraction with PyMuPDF, a binding of the MuPDF C library. Much faster
+    than the pure-Python readers on large documents.
+    """
+
+    name = "pymupdf"
+
+    def available(self):
+        try:
+            import pymupdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def iter_pages(self, data):
+        import pymupdf
+        with pymupdf.open(stream=data, filetype="pdf") as document:
+            for page in document:
+                yield page.get_text()
+
+
+BACKENDS = {backend.name: backend for backend in (PyPDF2Backend(), PypdfBackend(), PyMuPDFBackend())}
+
+DEFAULT_BACKEND = PyPDF2Backend.name
+
+ExtractionResult = namedtuple("ExtractionResult", ["text", "backend", "pages", "bytes", "seconds"])
+
+
+def configured_backends():
+    """
+    Resolve the backend preference order from the `pdf_backends` setting, a
+    comma separated list of backend names. Unknown or unavailable backends
+    are skipped and PyPDF2 is always kept as the last resort.
+
+    Returns:
+        list: The usable backends, most preferred first.
+    """
+    names = [name.strip().lower() for name in os.getenv('pdf_backends', DEFAULT_BACKEND).split(",")]
+    if DEFAULT_BACKEND not in names:
+        names.append(DEFAULT_BACKEND)
+    backends = []
+    for name in names:
+        backend = BACKENDS.get(name)
+        if backend is not None and backend not in backends and backend.available():
+            backends.append(backend)
+    return backends
+
+def normalize_pages(pages):
+    """
+    Yield the whitespace-normalized text of raw page strings.
+
+    Each piece carries its own leading space when the page boundary separates
+    two words, so joining the pieces with "" gives exactly the
+    whitespace-collapsed text of the whole document.
+
+    Args:
+        pages: An iterable of raw page strings.
+
+    Yields:
+        str: The normalized text of the next page that contains any.
+    """
+    started = False
+    pending_space = False
+    for raw in pages:
+        words = raw.split()
+        if not words:
+            pending_space = pending_space or bool(raw)
+            continue
+        piece = " ".join(words)
+        if started and (pending_space or raw[0].isspace()):
+            piece = " " + piece
+        started = True
+        pending_space = raw[-1].isspace()
+        yield piece
+
+def _extract_with_backend(backend, data, max_chars):
+    page_count = 0
+
+    def counted_pages():
+        nonlocal page_count
+        for raw in backend.iter_pages(data):
+            page_count += 1
+            yield raw
+
+    parts = []
+    char_count = 0
+    for piece in normalize_pages(counted_pages()):
+        parts.append(piece)
+        char_count += len(piece)
+        if max_chars is not None and char_count > max_chars:
+            break
+    return "".join(parts), page_count
+
+def extract_pdf_document(data, max_chars=None, backends=None):
+    """
+    Extract text from raw PDF bytes, falling back across backends.
+
+    Backends are tried in preference order. A backend that raises, or that
+    finds no text in a document another backend might read, hands over to
+    the next one. Used as the worker entrypoint of the extraction pool, so it
+    has to stay a picklable module-level function.
+
+    Args:
+        data (bytes): The raw content of the PDF file.
+        max_chars (int): Optional character budget to stop extraction early.
+        backends (list): Optional backends to use instead of the configured ones.
+
+    Returns:
+        ExtractionResult: The text plus the backend, page count, byte count
+            and time it took, for throughput accounting.
+    """
+    backends = backends or configured_backends()
+    error = None
+    result = None
+    for backend in backends:
+        start = time.perf_counter()
+        try:
+            text, pages = _extract_with_backend(backend, data, max_chars)
+        except Exception as e:
+            error = e
+            continue
+        result = ExtractionResult(text, backend.name, pages, len(data), time.perf_counter() - start)
+        if text:
+            return result
+    if result is not None:
+        return result
+    raise ValueError(f"Failed to extract text from PDF: {str(error)}")
+
+def extract_text_from_pdf(file, max_chars=None):
+    """
+    Extract text from a PDF file and clean up unnecessary line breaks and whitespace.
+
+    With `max_chars` set, extraction stops after the first page that takes the
+    text past that budget, so the length of the returned text is then a lower
+    bound of the full document length.
+
+    Args:
+        file: The PDF file to extract text from.
+        max_chars (int): Optional character budget to stop extraction early.
+
+    Returns:
+        str: The cleaned text extracted from the PDF.
+    """
+    return extract_pdf_document(file.read(), max_chars).text
+
+
+class BackendStats:
+    """
+    Throughput counters per extraction backend, fed with the
+    `ExtractionResult` of every parsed document.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def record(self, result):
+        with self._lock:
+            totals = self._totals.setdefault(
+                result.backend, {"documents": 0, "pages": 0, "bytes": 0, "seconds": 0.0}
+            )
+            totals["documents"] += 1
+            totals["pages"] += result.pages
+            totals["bytes"] += result.bytes
+            totals["seconds"] += result.seconds
+
+    def stats(self):
+        """
+        Returns:
+            dict: Per-backend totals with pages/sec and bytes/sec.
+        """
+        with self._lock:
+            report = {}
+            for name, totals in self._totals.items():
+                seconds = totals["seconds"] or float("inf")
+                report[name] = dict(
+                    totals,
+                    pages_per_sec=round(totals["pages"] / seconds, 2),
+                    bytes_per_sec=round(totals["bytes"] / seconds, 2),
+                )
+            return report
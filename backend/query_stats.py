@@ -0,0 +1,78 @@
+import threading
+from contextvars import ContextVar
+from sqlalchemy import event
+
+
+class QueryStats:
+    """
+    Count the SQL statements each request runs, per route.
+
+    `install` hooks the engine so every statement executed inside a request
+    (between `begin` and `end`) is counted against it; requests that opened a
+    database session or ran a statement are then recorded under their path,
+    giving the mean and maximum number of queries per request of each route.
+    """
+
+    def __init__(self):
+        self._current = ContextVar("db_query_counter", default=None)
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def install(self, engine):
+        """
+        Args:
+            engine (Engine): The SQLAlchemy engine whose statements are counted.
+        """
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        counter = self._current.get()
+        if counter is not None:
+            counter["queries"] += 1
+
+    def begin(self):
+        """
+        Start counting the statements of the current request.
+
+        Returns:
+            tuple: The counter and the token to pass to `end`.
+        """
+        counter = {"queries": 0, "session": False}
+        return counter, self._current.set(counter)
+
+    def session_opened(self):
+        """
+        Record that the current request uses the database, so it counts even if it ran no query.
+        """
+        counter = self._current.get()
+        if counter is not None:
+            counter["session"] = True
+
+    def end(self, route, counter, token):
+        """
+        Stop counting and record the request.
+
+        Args:
+            route (str): The request's path.
+            counter (dict): The counter returned by `begin`.
+            token (Token): The token returned by `begin`.
+        """
+        self._current.reset(token)
+        if not counter["session"] and not counter["queries"]:
+            return
+        with self._lock:
+            stats = self._routes.setdefault(route, {"requests": 0, "queries": 0, "max_queries": 0})
+            stats["requests"] += 1
+            stats["queries"] += counter["queries"]
+            stats["max_queries"] = max(stats["max_queries"], counter["queries"])
+
+    def stats(self):
+        """
+        Returns:
+            dict: Requests, queries, mean and maximum queries per request, keyed by route.
+        """
+        with self._lock:
+            return {
+                route: {**stats, "queries_per_request": round(stats["queries"] / stats["requests"], 3)}
+                for route, stats in self._routes.items()
+            }
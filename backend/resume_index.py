@@ -0,0 +1,346 @@
+import hashlib
+import heapq
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import numpy as np
+from skills import skill_taxonomy, tokenize, extract_skills, weighted_fit_score
+
+EMPTY_POSTINGS = np.zeros(0, dtype=np.int64)
+
+
+class ResumeIndex:
+    """
+    Persistent inverted index from tokens to stored resumes, with top-K
+    retrieval of the resumes that best fit a job description.
+
+    Resumes are tokenized with `tokenize` when added, and every distinct
+    token gets a posting (token, resume id) in a SQLite file shared by all
+    workers. Tokens are stored as text, so the index survives taxonomy
+    reloads; `reindex` rebuilds the postings after aliases change. Resume
+    texts are only stored when `keep_text` is set; otherwise just the
+    digest is kept and `reindex` leaves the postings of those resumes as
+    they are. Texts stored earlier stay until `drop_texts` deletes them:
+    python resume_index.py drop-texts [path]. Each
+    process caches the posting lists as sorted arrays and catches up with
+    postings added by other workers before every query.
+
+    Queries score resumes like `calculate_fit_score` without a full scan
+    (MaxScore): the job description's skills are processed from the
+    heaviest to the lightest, reading whole posting lists only until no
+    resume outside them could still reach the K-th best score. From then on
+    the remaining lists are only probed, by binary search, for the
+    candidates that can still make the top K, and candidates are dropped as
+    soon as their best possible score falls below the K-th best.
+
+    Args:
+        path (str): The SQLite file, or ":memory:".
+        keep_text (bool): Whether to store the resume texts.
+    """
+
+    def __init__(self, path, keep_text=False):
+        self.path = path
+        self.keep_text = keep_text
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            "id INTEGER PRIMARY KEY, digest TEXT UNIQUE NOT NULL, text TEXT, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "token TEXT NOT NULL, resume_id INTEGER NOT NULL, PRIMARY KEY (token, resume_id)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS postings_resume ON postings (resume_id)")
+        # Bumped by reindex, so other workers know to reload their cache
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+        self._generation = None
+        self._last_resume_id = 0
+        self._postings = {}
+        self._pending = {}
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.postings_read = 0
+        self.probes = 0
+        self.early_terminations = 0
+
+    def add(self, text, digest=None):
+        """
+        Store and index a resume; adding the same resume again is a no-op.
+
+        Args:
+            text (str): The resume text.
+            digest (str): A digest identifying the resume, defaults to the
+                SHA-256 of the text.
+
+        Returns:
+            int: The resume id.
+        """
+        digest = digest or hashlib.sha256(text.encode("utf-8")).hexdigest()
+        tokens = set(tokenize(text))
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM resumes WHERE digest = ?", (digest,)).fetchone()
+            if row is not None:
+                return row[0]
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                resume_id = self._conn.execute(
+                    "INSERT INTO resumes (digest, text, created_at) VALUES (?, ?, ?)",
+                    (digest, text if self.keep_text else None, time.time())
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO postings (token, resume_id) VALUES (?, ?)",
+                    ((token, resume_id) for token in tokens)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return resume_id
+
+    def reindex(self):
+        """
+        Rebuild the postings from the stored resume texts, for example after
+        the skill taxonomy changed. Resumes stored without their text keep
+        their postings.
+        """
+        with self._lock:
+            resumes = self._conn.execute("SELECT id, text FROM resumes WHERE text IS NOT NULL").fetchall()
+            index = skill_taxonomy.current()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for resume_id, text in resumes:
+                    self._conn.execute("DELETE FROM postings WHERE resume_id = ?", (resume_id,))
+                    self._conn.executemany(
+                        "INSERT INTO postings (token, resume_id) VALUES (?, ?)",
+                        ((token, resume_id) for token in set(tokenize(text, index)))
+                    )
+                self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def drop_texts(self):
+        """
+        Delete every stored resume text, keeping the digests and postings.
+
+        Returns:
+            int: The number of texts deleted.
+        """
+        with self._lock:
+            return self._conn.execute("UPDATE resumes SET text = NULL WHERE text IS NOT NULL").rowcount
+
+    def _refresh(self):
+        # Catch up with postings added since the last query, by any worker
+        generation = self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+        if generation != self._generation:
+            self._generation = generation
+            self._last_resume_id = 0
+            self._postings = {}
+            self._pending = {}
+        rows = self._conn.execute(
+            "SELECT token, resume_id FROM postings WHERE resume_id > ? ORDER BY resume_id", (self._last_resume_id,)
+        ).fetchall()
+        for token, resume_id in rows:
+            self._pending.setdefault(token, []).append(resume_id)
+        if rows:
+            self._last_resume_id = rows[-1][1]
+
+    def _posting_list(self, token):
+        # Resume ids only grow, so appending keeps every list sorted
+        pending = self._pending.pop(token, None)
+        postings = self._postings.get(token, EMPTY_POSTINGS)
+        if pending:
+            postings = np.concatenate([postings, np.array(pending, dtype=np.int64)])
+            self._postings[token] = postings
+        return postings
+
+    def top_k(self, job_description, k=10):
+        """
+        Find the resumes that best fit a job description.
+
+        Args:
+            job_description (str): The job description text.
+            k (int): The number of resumes to return.
+
+        Returns:
+            list: Up to `k` (resume_id, fit_score) tuples of resumes with a
+                non-zero score, best first, ties broken by resume id.
+        """
+        if k < 1:
+            return []
+        start = time.perf_counter()
+        required, preferred = extract_skills(job_description)
+        required_total = len(required)
+        preferred_total = len(preferred)
+        # Score of every (required matches, preferred matches) combination
+        score_table = np.array([
+            [weighted_fit_score(required_count, required_total, preferred_count, preferred_total)
+             for preferred_count in range(preferred_total + 1)]
+            for required_count in range(required_total + 1)
+        ])
+        # Heaviest skills first: their posting lists decide the top K soonest
+        terms = sorted(
+            required | preferred,
+            key=lambda token: (
+                -((70 / required_total if token in required else 0) + (30 / preferred_total if token in preferred else 0)),
+                token
+            )
+        )
+        remaining_required = required_total
+        remaining_preferred = preferred_total
+        seen = []
+        required_counts = None
+        candidates = None
+        early = False
+        with self._lock:
+            self._refresh()
+            size = self._last_resume_id + 1
+            for token in terms:
+                in_required = token in required
+                in_preferred = token in preferred
+                remaining_required -= in_required
+                remaining_preferred -= in_preferred
+                postings = self._posting_list(token)
+                if candidates is None:
+                    # Read the whole list: resumes seen for the first time may make the top K
+                    if required_counts is None:
+                        required_counts = np.zeros(size, dtype=np.int32)
+                        preferred_counts = np.zeros(size, dtype=np.int32)
+                    required_counts[postings] += in_required
+                    preferred_counts[postings] += in_preferred
+                    seen.append(postings)
+                    self.postings_read += len(postings)
+                    if not remaining_required + remaining_preferred:
+                        break
+                    ids = np.unique(np.concatenate(seen))
+                    if len(ids) < k:
+                        continue
+                    scores = score_table[required_counts[ids], preferred_counts[ids]]
+                    kth_best = np.partition(scores, len(scores) - k)[len(scores) - k]
+                    if score_table[remaining_required, remaining_preferred] >= kth_best:
+                        continue
+                    # No unseen resume can reach the K-th best any more
+                    early = True
+                    candidate_required = required_counts[ids]
+                    candidate_preferred = preferred_counts[ids]
+                    candidates = ids
+                else:
+                    # Probe the list only for the remaining candidates
+                    positions = np.searchsorted(postings, candidates)
+                    found = positions < len(postings)
+                    found[found] = postings[positions[found]] == candidates[found]
+                    candidate_required += found * in_required
+                    candidate_preferred += found * in_preferred
+                    self.probes += len(candidates)
+                    if not remaining_required + remaining_preferred:
+                        break
+                    scores = score_table[candidate_required, candidate_preferred]
+                    kth_best = np.partition(scores, len(scores) - k)[len(scores) - k]
+                # Drop candidates that cannot reach the K-th best even with every remaining skill
+                best_possible = score_table[
+                    np.minimum(candidate_required + remaining_required, required_total),
+                    np.minimum(candidate_preferred + remaining_preferred, preferred_total)
+                ]
+                keep = best_possible >= kth_best
+                candidates = candidates[keep]
+                candidate_required = candidate_required[keep]
+                candidate_preferred = candidate_preferred[keep]
+        if candidates is None:
+            candidates = np.unique(np.concatenate(seen)) if seen else EMPTY_POSTINGS
+            candidate_required = required_counts[candidates] if seen else EMPTY_POSTINGS
+            candidate_preferred = preferred_counts[candidates] if seen else EMPTY_POSTINGS
+        scores = score_table[candidate_required, candidate_preferred] if len(candidates) else EMPTY_POSTINGS
+        order = np.lexsort((candidates, -scores))
+        results = [
+            (int(candidates[position]), int(scores[position]))
+            for position in order[:k] if scores[position] > 0
+        ]
+        with self._lock:
+            self.queries += 1
+            self.query_seconds += time.perf_counter() - start
+            self.early_terminations += early
+        return results
+
+    def best_matches(self, job_description, k=10):
+        """
+        Like `top_k`, with the digest of each resume.
+
+        Args:
+            job_description (str): The job description text.
+            k (int): The number of resumes to return.
+
+        Returns:
+            list: Up to `k` dicts with the resume_id, digest and fit_score, best first.
+        """
+        matches = self.top_k(job_description, k)
+        if not matches:
+            return []
+        resume_ids = [resume_id for resume_id, _ in matches]
+        with self._lock:
+            digests = dict(self._conn.execute(
+                f"SELECT id, digest FROM resumes WHERE id IN ({', '.join('?' * len(resume_ids))})", resume_ids
+            ).fetchall())
+        return [
+            {"resume_id": resume_id, "digest": digests[resume_id], "fit_score": fit_score}
+            for resume_id, fit_score in matches
+        ]
+
+    def get(self, resume_id):
+        """
+        Args:
+            resume_id (int): The resume id.
+
+        Returns:
+            dict | None: The resume's digest and text, or None if unknown. The
+                text is None unless the index keeps texts.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT digest, text FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+        return {"digest": row[0], "text": row[1]} if row else None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def stats(self):
+        """
+        Returns:
+            dict: Index size and query counters.
+        """
+        with self._lock:
+            postings = self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+            resumes = self._conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+            return {
+                "resumes": resumes,
+                "postings": postings,
+                "queries": self.queries,
+                "mean_query_ms": round(self.query_seconds / self.queries * 1000, 3) if self.queries else 0.0,
+                "postings_read": self.postings_read,
+                "probes": self.probes,
+                "early_terminations": self.early_terminations,
+            }
+
+def create_resume_index():
+    """
+    Create the resume index configured by resume_index_path, storing the
+    resume texts only if resume_index_keep_text is set.
+
+    Returns:
+        ResumeIndex | None: The index, or None when resume_index_path is empty.
+    """
+    path = os.getenv('resume_index_path', './database/resume_index.db')
+    keep_text = os.getenv('resume_index_keep_text', 'false').lower() in ('1', 'true', 'yes')
+    return ResumeIndex(path, keep_text=keep_text) if path else None
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["drop-texts"]:
+        sys.exit("Usage: python resume_index.py drop-texts [path]")
+    path = sys.argv[2] if len(sys.argv) > 2 else os.getenv('resume_index_path', './database/resume_index.db')
+    print(f"Deleted {ResumeIndex(path).drop_texts()} resume texts from {path}")
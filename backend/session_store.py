@@ -0,0 +1,321 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from cache import LRUCache
+
+
+def session_size(data):
+    """
+    Approximate the memory cost of a session as the length of its text fields.
+
+    Args:
+        data (dict): The session data.
+
+    Returns:
+        int: The summed length of the string values.
+    """
+    return sum(len(value) for value in data.values() if isinstance(value, str))
+
+
+class SessionTooLarge(ValueError):
+    """
+    Raised when a write would make a session larger than the store's byte budget.
+    """
+
+
+class SessionStore(ABC):
+    """
+    Interface of the per-upload session storage.
+
+    A session is a small dict (resume text, job description, ...) stored
+    under the session ID returned by /api/resume-upload. Implementations
+    bound the number of sessions and their total size, expire sessions
+    `ttl` seconds after their last write and count evictions. A write that
+    would make one session larger than the whole byte budget is rejected
+    with `SessionTooLarge`, keeping the session as it was.
+    Reads return copies, so changes must go through `set` or `update`.
+    """
+
+    @abstractmethod
+    def get(self, session_id):
+        """
+        Read a session, counting a hit or miss and marking it recently used.
+
+        Args:
+            session_id (str): The session ID.
+
+        Returns:
+            dict | None: A copy of the session data, or None if unknown or expired.
+        """
+
+    @abstractmethod
+    def set(self, session_id, data):
+        """
+        Store or replace a session.
+
+        Args:
+            session_id (str): The session ID.
+            data (dict): The session data.
+
+        Raises:
+            SessionTooLarge: If the session exceeds the byte budget.
+        """
+
+    def update(self, session_id, **fields):
+        """
+        Add or replace fields of an existing session. This default is a get
+        then a set; stores shared between processes override it to make the
+        read-modify-write atomic.
+
+        Args:
+            session_id (str): The session ID.
+            **fields: The fields to set.
+
+        Returns:
+            bool: False if the session does not exist or has expired.
+
+        Raises:
+            SessionTooLarge: If the updated session exceeds the byte budget.
+        """
+        data = self.get(session_id)
+        if data is None:
+            return False
+        data.update(fields)
+        self.set(session_id, data)
+        return True
+
+    @abstractmethod
+    def delete(self, session_id):
+        pass
+
+    @abstractmethod
+    def keys(self):
+        """
+        Returns:
+            list: The IDs of live sessions.
+        """
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    @abstractmethod
+    def stats(self):
+        pass
+
+    @abstractmethod
+    def __contains__(self, session_id):
+        """
+        Whether a session is live, without counting a hit or miss or marking it recently used.
+        """
+
+    def __getitem__(self, session_id):
+        data = self.get(session_id)
+        if data is None:
+            raise KeyError(session_id)
+        return data
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Per-process session store backed by an LRU with expiry.
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024, ttl=3600):
+        self.max_bytes = max_bytes
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes, sizeof=session_size, ttl=ttl)
+
+    def get(self, session_id):
+        data = self._cache.get(session_id)
+        return dict(data) if data is not None else None
+
+    def set(self, session_id, data):
+        if session_size(data) > self.max_bytes:
+            raise SessionTooLarge(f"Session exceeds {self.max_bytes} bytes")
+        self._cache.put(session_id, dict(data))
+
+    def delete(self, session_id):
+        self._cache.pop(session_id)
+
+    def keys(self):
+        return self._cache.keys()
+
+    def clear(self):
+        self._cache.clear()
+
+    def __contains__(self, session_id):
+        return session_id in self._cache
+
+    def stats(self):
+        stats = self._cache.stats()
+        stats["backend"] = "memory"
+        return stats
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store kept in a SQLite file, shared by every worker process that
+    points at the same path. Sessions are evicted least recently used first.
+    `update` runs its read-modify-write in one write transaction, so workers
+    updating different fields of a session never drop each other's changes.
+    """
+
+    def __init__(self, path, max_entries=10000, max_bytes=64 * 1024 * 1024, ttl=3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, data TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access)")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, session_id):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE id = ? AND expires_at > ?", (session_id, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE sessions SET last_access = ? WHERE id = ?", (now, session_id))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, session_id, data):
+        now = time.time()
+        payload = json.dumps(data)
+        size = session_size(data)
+        if size > self.max_bytes:
+            raise SessionTooLarge(f"Session exceeds {self.max_bytes} bytes")
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._write(session_id, payload, size, now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def update(self, session_id, **fields):
+        now = time.time()
+        with self._lock:
+            # The write lock is taken before the read, so no other worker writes in between
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT data FROM sessions WHERE id = ? AND expires_at > ?", (session_id, now)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self.hits += 1
+                data = json.loads(row[0])
+                data.update(fields)
+                size = session_size(data)
+                if size > self.max_bytes:
+                    raise SessionTooLarge(f"Session exceeds {self.max_bytes} bytes")
+                self._write(session_id, json.dumps(data), size, now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def _write(self, session_id, payload, size, now):
+        # Store a session and enforce the bounds, inside the caller's transaction
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions (id, data, size, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (session_id, payload, size, now + self.ttl, now)
+        )
+        self.expirations += self._conn.execute(
+            "DELETE FROM sessions WHERE expires_at <= ?", (now,)
+        ).rowcount
+        self.evictions += self._conn.execute(
+            "DELETE FROM sessions WHERE id IN ("
+            "SELECT id FROM sessions ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        self.evictions += self._conn.execute(
+            "DELETE FROM sessions WHERE id IN ("
+            "SELECT id FROM (SELECT id, SUM(size) OVER (ORDER BY last_access DESC, id) AS running "
+            "FROM sessions) WHERE running > ?)",
+            (self.max_bytes,)
+        ).rowcount
+
+    def delete(self, session_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def keys(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM sessions WHERE expires_at > ? ORDER BY last_access", (time.time(),)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions")
+
+    def __contains__(self, session_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM sessions WHERE id = ? AND expires_at > ?", (session_id, time.time())
+            ).fetchone()
+        return row is not None
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions").fetchone()
+        return {
+            "backend": "sqlite",
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def create_session_store():
+    """
+    Build the session store selected by the environment.
+
+    `session_store` picks the backend ("memory" or "sqlite"),
+    `session_store_path` the SQLite file, and `session_max_entries`,
+    `session_max_bytes` and `session_ttl` its bounds.
+
+    Returns:
+        SessionStore: The configured store.
+    """
+    options = {
+        "max_entries": int(os.getenv('session_max_entries', 10000)),
+        "max_bytes": int(os.getenv('session_max_bytes', 64 * 1024 * 1024)),
+        "ttl": float(os.getenv('session_ttl', 3600)),
+    }
+    if os.getenv('session_store', 'memory').lower() == 'sqlite':
+        return SQLiteSessionStore(os.getenv('session_store_path', './database/sessions.db'), **options)
+    return MemorySessionStore(**options)
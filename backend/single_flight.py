@@ -0,0 +1,50 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one upstream call.
+
+    The first caller for a key starts the call; callers arriving while it is
+    still in flight await the same result (or exception) instead of starting
+    their own. The shared call is shielded, so one waiter disconnecting does
+    not cancel it for the others. Keys are forgotten as soon as the call
+    finishes, so this never serves stale results; pair it with a cache for that.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    async def do(self, key, fn):
+        """
+        Run `fn()` once per key among concurrent callers.
+
+        Args:
+            key (str): The key identifying identical calls.
+            fn: A zero-argument function returning an awaitable.
+
+        Returns:
+            The result of the shared call.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _task: self._in_flight.pop(key, None))
+        else:
+            self.deduplicated += 1
+        return await asyncio.shield(task)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Upstream calls started, calls served by joining one, and calls in flight.
+        """
+        return {
+            "calls": self.calls,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,211 @@
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+
+def is_word_char(char):
+    """
+    Match the definition of `\\w` used by `re` for str patterns.
+    """
+    return char.isalnum() or char == "_"
+
+def casefold_same_length(text):
+    """
+    Lowercase `text` without changing its length, so offsets in the result
+    are offsets in the original text.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skill vocabulary.
+
+    The automaton is built once; matching scans the text a single time, so
+    its cost grows with the text length and the number of matches, not with
+    the size of the vocabulary. Matches follow the semantics of the regex
+    `\\b(skill|...)\\b` with skills sorted longest first and IGNORECASE:
+    scanning left to right, at each position the longest skill bounded by
+    word boundaries on both sides wins, and matches never overlap.
+
+    The automaton is stored as the flat integer arrays named in `ARRAYS`, so
+    it can be written to a file and matched straight from a memory map (see
+    `from_arrays`).
+
+    Args:
+        skills (iterable): The skill phrases to match.
+        values (iterable): An integer reported with each skill's matches,
+            defaults to the skill's position in `skills`.
+    """
+
+    ARRAYS = ("offsets", "chars", "targets", "fail", "length", "output_link", "value")
+
+    def __init__(self, skills=(), values=None):
+        skills = list(skills)
+        values = list(range(len(skills))) if values is None else list(values)
+        goto = [{}]
+        length = [0]
+        value = [-1]
+        for skill, skill_value in zip(skills, values):
+            skill = casefold_same_length(skill)
+            if not skill:
+                continue
+            node = 0
+            for char in skill:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    length.append(0)
+                    value.append(-1)
+                node = next_node
+            if not length[node]:  # The first occurrence of a skill wins
+                length[node] = len(skill)
+                value[node] = skill_value
+        self._freeze(goto, length, value)
+
+    def _freeze(self, goto, length, value):
+        # Failure links and, for every node, the nearest node on its failure
+        # chain where a skill ends (0 when there is none)
+        fail = [0] * len(goto)
+        output_link = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(char, 0) if node else 0
+                fail[child] = target
+                output_link[child] = target if length[target] else output_link[target]
+                queue.append(child)
+        offsets = array("i", [0])
+        chars = array("i")
+        targets = array("i")
+        for transitions in goto:
+            for char, child in sorted(transitions.items()):
+                chars.append(ord(char))
+                targets.append(child)
+            offsets.append(len(chars))
+        self.offsets = offsets
+        self.chars = chars
+        self.targets = targets
+        self.fail = array("i", fail)
+        self.length = array("i", length)
+        self.output_link = array("i", output_link)
+        self.value = array("i", value)
+        self.size = sum(1 for skill_length in length if skill_length)
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuild a matcher from its arrays without copying them.
+
+        Args:
+            arrays (dict): Integer sequences keyed by the names in `ARRAYS`,
+                for example memoryviews over a compiled index.
+
+        Returns:
+            SkillMatcher: A matcher reading from `arrays`.
+        """
+        matcher = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            setattr(matcher, name, arrays[name])
+        matcher.size = sum(1 for skill_length in matcher.length if skill_length)
+        return matcher
+
+    def matches(self, text):
+        """
+        Find the skills in `text`.
+
+        Args:
+            text (str): The text to scan.
+
+        Yields:
+            tuple: The (start, end, value) of each match, left to right.
+        """
+        lowered = casefold_same_length(text)
+        text_length = len(text)
+        offsets = self.offsets
+        chars = self.chars
+        targets = self.targets
+        fail = self.fail
+        length = self.length
+        output_link = self.output_link
+        # Longest valid match starting at each candidate start offset
+        best = {}
+        node = 0
+        for index, char in enumerate(lowered):
+            code = ord(char)
+            while True:
+                low = offsets[node]
+                high = offsets[node + 1]
+                if low < high:
+                    position = bisect_left(chars, code, low, high)
+                    if position < high and chars[position] == code:
+                        node = targets[position]
+                        break
+                if not node:
+                    break
+                node = fail[node]
+            match = node if length[node] else output_link[node]
+            if not match:
+                continue
+            end = index + 1
+            end_is_word = end < text_length and is_word_char(text[end])
+            if is_word_char(text[index]) == end_is_word:
+                continue  # No word boundary after the match
+            while match:
+                start = end - length[match]
+                start_is_word = start > 0 and is_word_char(text[start - 1])
+                if is_word_char(text[start]) != start_is_word and length[match] > best.get(start, (0,))[0]:
+                    best[start] = (length[match], match)
+                match = output_link[match]
+        value = self.value
+        cursor = 0
+        for start in sorted(best):
+            if start >= cursor:
+                match_length, match = best[start]
+                cursor = start + match_length
+                yield start, cursor, value[match]
+
+    def finditer(self, text):
+        """
+        Find the skills in `text`.
+
+        Args:
+            text (str): The text to scan.
+
+        Yields:
+            tuple: The (start, end) offsets of each match, left to right.
+        """
+        for start, end, _ in self.matches(text):
+            yield start, end
+
+    def sub(self, repl, text):
+        """
+        Replace every match in `text`.
+
+        Args:
+            repl: A function taking the matched text and the skill's value,
+                and returning its replacement.
+            text (str): The text to scan.
+
+        Returns:
+            str: The text with matches replaced.
+        """
+        parts = []
+        cursor = 0
+        for start, end, value in self.matches(text):
+            parts.append(text[cursor:start])
+            parts.append(repl(text[start:end], value))
+            cursor = end
+        if not parts:
+            return text
+        parts.append(text[cursor:])
+        return "".join(parts)
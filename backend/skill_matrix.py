@@ -0,0 +1,185 @@
+import numpy as np
+from skills import skill_taxonomy, skill_keys, extract_skill_keys
+
+# Resumes scored per block, and (resume, job) pairs per block, bounding the
+# counts held at once however many job descriptions there are
+DEFAULT_BLOCK_ROWS = 1024
+DEFAULT_BLOCK_PAIRS = 1 << 20
+
+
+def column_jobs(job_columns, columns):
+    """
+    Invert per-job vocabulary columns into the jobs of each column, as CSC arrays.
+
+    Args:
+        job_columns (list): The vocabulary columns of each job.
+        columns (int): The vocabulary size.
+
+    Returns:
+        tuple: The `indptr` array, of length `columns` + 1, and the `jobs`
+            array, holding the jobs of column c at `jobs[indptr[c]:indptr[c + 1]]`.
+    """
+    counts = np.array([len(job) for job in job_columns], dtype=np.int64)
+    flat = np.fromiter((column for job in job_columns for column in job), dtype=np.int64, count=int(counts.sum()))
+    jobs = np.repeat(np.arange(len(job_columns), dtype=np.int64), counts)
+    order = np.argsort(flat, kind="stable")
+    indptr = np.zeros(columns + 1, dtype=np.int64)
+    np.cumsum(np.bincount(flat, minlength=columns), out=indptr[1:])
+    return indptr, jobs[order]
+
+def weighted_fit_scores(required_matches, required_totals, preferred_matches, preferred_totals):
+    """
+    Vectorized `weighted_fit_score`: required skills contribute 70% to the
+    score, preferred skills 30%.
+
+    The arithmetic is the scalar one in float64, (matches / total) * weight
+    truncated to an integer, so results are identical to it.
+
+    Args:
+        required_matches (ndarray): Required skills found, per pair.
+        required_totals (ndarray): Required skills, broadcastable to the matches.
+        preferred_matches (ndarray): Preferred skills found, per pair.
+        preferred_totals (ndarray): Preferred skills, broadcastable to the matches.
+
+    Returns:
+        ndarray: Integer fit scores between 0 and 100.
+    """
+    required_matches = np.asarray(required_matches, dtype=np.float64)
+    preferred_matches = np.asarray(preferred_matches, dtype=np.float64)
+    required_totals = np.broadcast_to(np.asarray(required_totals, dtype=np.float64), required_matches.shape)
+    preferred_totals = np.broadcast_to(np.asarray(preferred_totals, dtype=np.float64), preferred_matches.shape)
+    required_score = np.zeros(required_matches.shape)
+    np.divide(required_matches, required_totals, out=required_score, where=required_totals > 0)
+    preferred_score = np.zeros(preferred_matches.shape)
+    np.divide(preferred_matches, preferred_totals, out=preferred_score, where=preferred_totals > 0)
+    total_score = required_score * 70 + preferred_score * 30
+    return np.minimum(total_score.astype(np.int64), 100)
+
+
+class SkillMatrixScorer:
+    """
+    Fit scores of many resumes against a fixed set of job descriptions,
+    computed as sparse matrix products.
+
+    The vocabulary is the set of skill keys listed by the job descriptions.
+    Job descriptions become sparse required and preferred masks over it,
+    stored as CSC arrays of the jobs listing each vocabulary column, and
+    resumes become sparse indicator rows, stored as CSR arrays of the
+    columns they contain. For a block of resumes, the jobs of every column
+    of every resume are gathered and counted with `np.bincount`, which
+    counts the matched skills of every pair at once without materializing
+    anything of size vocabulary x jobs or resumes x vocabulary; the 70/30
+    weighting is then applied elementwise.
+
+    Args:
+        job_descriptions (list): Job description texts.
+        index (SkillIndex): The taxonomy to use, defaults to the current one.
+        block_rows (int): Resumes scored at once.
+        block_pairs (int): Pairs scored at once; with many job descriptions,
+            blocks hold fewer resumes, down to one.
+    """
+
+    def __init__(self, job_descriptions, index=None, block_rows=DEFAULT_BLOCK_ROWS, block_pairs=DEFAULT_BLOCK_PAIRS):
+        self.index = index or skill_taxonomy.current()
+        self.vocabulary = {}
+        required_columns = []
+        preferred_columns = []
+        for text in job_descriptions:
+            required, preferred = extract_skill_keys(text, self.index)
+            required_columns.append([self.vocabulary.setdefault(key, len(self.vocabulary)) for key in required])
+            preferred_columns.append([self.vocabulary.setdefault(key, len(self.vocabulary)) for key in preferred])
+        self.required_mask = column_jobs(required_columns, len(self.vocabulary))
+        self.preferred_mask = column_jobs(preferred_columns, len(self.vocabulary))
+        self.required_totals = np.array([len(columns) for columns in required_columns], dtype=np.float64)
+        self.preferred_totals = np.array([len(columns) for columns in preferred_columns], dtype=np.float64)
+        self.block_rows = max(1, min(block_rows, block_pairs // max(1, len(job_descriptions))))
+
+    def encode(self, resumes):
+        """
+        Encode resumes as sparse indicator rows over the vocabulary.
+
+        Args:
+            resumes (list): Resume texts.
+
+        Returns:
+            tuple: The CSR `indptr` and `indices` arrays.
+        """
+        vocabulary = self.vocabulary
+        indptr = [0]
+        indices = []
+        for text in resumes:
+            keys = set(skill_keys(text, self.index))
+            indices.extend(sorted(vocabulary[key] for key in keys if key in vocabulary))
+            indptr.append(len(indices))
+        return np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64)
+
+    def iter_scores(self, resumes):
+        """
+        Score resumes block by block.
+
+        Args:
+            resumes (list): Resume texts.
+
+        Yields:
+            tuple: The index of the block's first resume and its scores, an
+                integer array of shape (resumes in block, jobs).
+        """
+        for start in range(0, len(resumes), self.block_rows):
+            yield start, self.score_encoded(*self.encode(resumes[start:start + self.block_rows]))
+
+    def score_encoded(self, indptr, indices):
+        """
+        Score resumes returned by `encode`.
+
+        Args:
+            indptr (ndarray): The CSR row pointers.
+            indices (ndarray): The CSR column indices.
+
+        Returns:
+            ndarray: Integer fit scores of shape (resumes, jobs).
+        """
+        return weighted_fit_scores(
+            self._matches(indptr, indices, self.required_mask), self.required_totals,
+            self._matches(indptr, indices, self.preferred_mask), self.preferred_totals
+        )
+
+    def _matches(self, indptr, indices, mask):
+        # Skills of each resume found in each job: the product of the CSR
+        # resume rows with the CSC mask, counted over the (resume, job) pairs
+        rows = len(indptr) - 1
+        jobs = len(self.required_totals)
+        job_indptr, job_ids = mask
+        starts = job_indptr[indices]
+        counts = job_indptr[indices + 1] - starts
+        entry_resumes = np.repeat(np.arange(rows, dtype=np.int64), np.diff(indptr))
+        offsets = np.arange(int(counts.sum()), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        pairs = np.repeat(entry_resumes, counts) * jobs + job_ids[np.repeat(starts, counts) + offsets]
+        return np.bincount(pairs, minlength=rows * jobs).reshape(rows, jobs)
+
+    def score(self, resumes):
+        """
+        Args:
+            resumes (list): Resume texts.
+
+        Returns:
+            ndarray: Integer fit scores of shape (resumes, jobs).
+        """
+        blocks = [scores for _, scores in self.iter_scores(resumes)]
+        if not blocks:
+            return np.zeros((0, len(self.required_totals)), dtype=np.int64)
+        return np.vstack(blocks)
+
+def matrix_fit_scores(resumes, job_descriptions, index=None):
+    """
+    Score every resume against every job description with `SkillMatrixScorer`.
+
+    Args:
+        resumes (list): Resume texts.
+        job_descriptions (list): Job description texts.
+        index (SkillIndex): The taxonomy to use, defaults to the current one.
+
+    Returns:
+        ndarray: Integer fit scores of shape (resumes, jobs), identical to
+            `calculate_fit_score` of each pair.
+    """
+    return SkillMatrixScorer(job_descriptions, index).score(resumes)
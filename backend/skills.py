@@ -0,0 +1,320 @@
+import re
+from taxonomy import SkillTaxonomy
+
+# Skills, aliases and stop words, loaded from data/skill_taxonomy.json and
+# reloaded when that file changes
+skill_taxonomy = SkillTaxonomy()
+
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+SECTION_HEADERS = {
+    'required': re.compile(r'^required skills?:?$', re.IGNORECASE),
+    'preferred': re.compile(r'^preferred skills?:?$', re.IGNORECASE)
+}
+
+
+def skill_name(key, index):
+    """
+    Args:
+        key (int | str): A skill key returned by `skill_keys` or `extract_skill_keys`.
+        index (SkillIndex): The taxonomy the key comes from.
+
+    Returns:
+        str: The normalized token of the skill (e.g. "machine_learning").
+    """
+    return index.token(key) if isinstance(key, int) else key
+
+def skill_keys(text, index=None):
+    """
+    Tokenizes the input text into skill keys.
+
+    Skills and aliases known to the taxonomy become the integer id of their
+    canonical skill, so "Node.js", "node js" and "nodejs" are all the same
+    key. Other words become their lowercase text, minus stop words.
+
+    Args:
+        text (str): The input text to tokenize.
+        index (SkillIndex): The taxonomy to use, defaults to the current one.
+
+    Returns:
+        list: The keys of the text, in order.
+    """
+    if not isinstance(text, str):
+        return []
+    index = index or skill_taxonomy.current()
+    stop_words = index.stop_words
+    token_ids = index.token_ids
+
+    def words(segment):
+        # Words spelled like a skill token (such as "machine_learning") are that skill
+        return [token_ids.get(word, word) for word in WORD_PATTERN.findall(segment.lower()) if word not in stop_words]
+
+    keys = []
+    cursor = 0
+    for start, end, skill_id in index.matcher.matches(text):
+        keys.extend(words(text[cursor:start]))
+        keys.append(skill_id)
+        cursor = end
+    keys.extend(words(text[cursor:]))
+    return keys
+
+def tokenize(text, index=None):
+    """
+    Tokenizes the input text into normalized tokens, handling multi-word skills.
+
+    This function processes the input text to:
+    - Replace multi-word skills with a single token (e.g., "machine learning" becomes "machine_learning").
+    - Resolve aliases to their canonical skill (e.g., "node js" becomes "nodejs", like "node.js").
+    - Normalize tokens by converting to lowercase and removing special characters.
+    - Remove stop words from the tokenized text.
+
+    Args:
+        text (str): The input text to tokenize.
+        index (SkillIndex): The taxonomy to use, defaults to the current one.
+
+    Returns:
+        list: A list of normalized tokens extracted from the input text.
+    """
+    index = index or skill_taxonomy.current()
+    return [skill_name(key, index) for key in skill_keys(text, index)]
+
+def extract_skill_keys(job_description, index=None):
+    """
+    Extracts the keys of required and preferred skills from a job description.
+
+    The function parses the job description text to identify skills listed
+    under "Required Skills" and "Preferred Skills" sections. A listed skill
+    that is exactly one taxonomy skill or alias becomes that skill's integer
+    id; anything else becomes its lowercase text, with multi-word skills
+    converted to a single token using underscores.
+
+    Args:
+        job_description (str): The job description text to extract skills from.
+        index (SkillIndex): The taxonomy to use, defaults to the current one.
+
+    Returns:
+        tuple: A tuple containing two sets:
+            - required_skills (set): The keys of skills identified as required.
+            - preferred_skills (set): The keys of skills identified as preferred.
+    """
+    required_skills = set()
+    preferred_skills = set()
+
+    if not isinstance(job_description, str):
+        return required_skills, preferred_skills
+    index = index or skill_taxonomy.current()
+
+    current_section = None
+    for line in job_description.splitlines():
+        line = line.strip()
+        if not line:
+            continue  # Skip empty lines
+
+        # Check if the line is a section header
+        if SECTION_HEADERS['required'].match(line):
+            current_section = 'required'
+            continue
+        elif SECTION_HEADERS['preferred'].match(line):
+            current_section = 'preferred'
+            continue
+
+        # If within a recognized section, extract skills
+        if current_section in ['required', 'preferred']:
+            # Remove common bullet points if present
+            line = re.sub(r'^[-*•]\s*', '', line)
+            # Split skills by commas or semicolons
+            for skill in re.split(r',|;', line):
+                skill = skill.strip().lower()  # Keep multi-word skills as is
+                if not skill:
+                    continue
+                matches = list(index.matcher.matches(skill))
+                if len(matches) == 1 and matches[0][:2] == (0, len(skill)):
+                    key = matches[0][2]
+                else:
+                    # Replace multi-word skills with underscores
+                    parts = []
+                    cursor = 0
+                    for start, end, skill_id in matches:
+                        parts.append(skill[cursor:start])
+                        parts.append(index.token(skill_id))
+                        cursor = end
+                    parts.append(skill[cursor:])
+                    key = "".join(parts)
+                    key = index.token_ids.get(key, key)
+                if current_section == 'required':
+                    required_skills.add(key)
+                elif current_section == 'preferred':
+                    preferred_skills.add(key)
+
+    return required_skills, preferred_skills
+
+def extract_skills(job_description, index=None):
+    """
+    Extracts required and preferred skills from a job description.
+
+    The function parses the job description text to identify skills listed
+    under "Required Skills" and "Preferred Skills" sections. Skills are normalized
+    to lowercase and multi-word skills are converted to a single token using underscores.
+
+    Args:
+        job_description (str): The job description text to extract skills from.
+        index (SkillIndex): The taxonomy to use, defaults to the current one.
+
+    Returns:
+        tuple: A tuple containing two sets:
+            - required_skills (set): A set of skills identified as required.
+            - preferred_skills (set): A set of skills identified as preferred.
+    """
+    index = index or skill_taxonomy.current()
+    required_skills, preferred_skills = extract_skill_keys(job_description, index)
+    return (
+        {skill_name(key, index) for key in required_skills},
+        {skill_name(key, index) for key in preferred_skills}
+    )
+
+
+def weighted_fit_score(required_matches, required_total, preferred_matches, preferred_total):
+    """
+    Required skills contribute 70% to the score, preferred skills 30%.
+
+    Args:
+        required_matches (int): Number of required skills found in the resume.
+        required_total (int): Number of required skills.
+        preferred_matches (int): Number of preferred skills found in the resume.
+        preferred_total (int): Number of preferred skills.
+
+    Returns:
+        int: A fit score between 0 and 100, representing the degree of match.
+    """
+    if not required_total and not preferred_total:
+        return 0  # No skills to match
+
+    # Calculate weighted score
+    required_score = (required_matches / required_total) * 70 if required_total else 0
+    preferred_score = (preferred_matches / preferred_total) * 30 if preferred_total else 0
+
+    total_score = required_score + preferred_score
+    return min(int(total_score), 100)  # Ensure score does not exceed 100
+
+
+class SkillAnalysis:
+    """
+    Skill comparison of one resume against one job description.
+
+    The job description is parsed with `extract_skill_keys` and the resume is
+    tokenized with `skill_keys` exactly once; the fit score, the feedback and
+    the matched skills are all derived from the resulting sets. Taxonomy skills
+    are compared by integer id, so aliases match their canonical skill.
+
+    Attributes:
+        index (SkillIndex): The taxonomy both inputs were parsed with.
+        resume_tokens (set): The skill keys of the resume.
+        required_skills (set): The keys of skills listed as required.
+        preferred_skills (set): The keys of skills listed as preferred.
+        required_matches (set): Required skill keys found in the resume.
+        preferred_matches (set): Preferred skill keys found in the resume.
+        missing_required (list): Sorted names of required skills missing from the resume.
+        missing_preferred (list): Sorted names of preferred skills missing from the resume.
+    """
+
+    def __init__(self, resume_text, job_description):
+        # Both sides use the same taxonomy even if it is reloaded meanwhile
+        self.index = skill_taxonomy.current()
+        self.resume_tokens = set(skill_keys(resume_text, self.index))
+        self.required_skills, self.preferred_skills = extract_skill_keys(job_description, self.index)
+        self.required_matches = self.required_skills & self.resume_tokens
+        self.preferred_matches = self.preferred_skills & self.resume_tokens
+        self.missing_required = sorted(skill_name(key, self.index) for key in self.required_skills - self.resume_tokens)
+        self.missing_preferred = sorted(skill_name(key, self.index) for key in self.preferred_skills - self.resume_tokens)
+
+    @property
+    def matched_skills(self):
+        """
+        Returns:
+            list: Required and preferred skills found in the resume.
+        """
+        return [skill_name(key, self.index) for key in self.required_matches | self.preferred_matches]
+
+    def fit_score(self):
+        """
+        Required skills contribute 70% to the score, preferred skills 30%.
+
+        Returns:
+            int: A fit score between 0 and 100, representing the degree of match.
+        """
+        return weighted_fit_score(
+            len(self.required_matches), len(self.required_skills),
+            len(self.preferred_matches), len(self.preferred_skills)
+        )
+
+    def feedback(self):
+        """
+        Returns:
+            dict: A dictionary containing:
+                - missing_keywords (list): A list of skills missing from the resume.
+                - suggestions (list): Suggestions on how to address the missing skills.
+        """
+        suggestions = []
+        for skill in self.missing_required:
+            suggestions.append(f"Include experience with {skill.replace('_', ' ')}.")
+        for skill in self.missing_preferred:
+            suggestions.append(f"Add projects demonstrating {skill.replace('_', ' ')}.")
+
+        return {
+            "missing_keywords": self.missing_required + self.missing_preferred,
+            "suggestions": suggestions
+        }
+
+def analyze_skills(resume_text, job_description):
+    """
+    Compare the skills of a resume and a job description once, for reuse by
+    scoring, feedback and matched skills.
+
+    Args:
+        resume_text (str): The text extracted from the resume.
+        job_description (str): The job description text.
+
+    Returns:
+        SkillAnalysis: The shared analysis.
+    """
+    return SkillAnalysis(resume_text, job_description)
+
+def calculate_fit_score(resume_text, job_description):
+    """
+    Calculates a fit score based on the match between resume text and job description.
+
+    This function evaluates how well a resume aligns with a job description
+    by comparing the extracted skills from both. Required skills contribute 70%
+    to the score, while preferred skills contribute 30%.
+
+    Args:
+        resume_text (str): The text extracted from the resume.
+        job_description (str): The job description text.
+
+    Returns:
+        int: A fit score between 0 and 100, representing the degree of match.
+    """
+    if not isinstance(resume_text, str) or not isinstance(job_description, str):
+        return 0
+    return analyze_skills(resume_text, job_description).fit_score()
+
+def generate_feedback(resume_text, job_description):
+    """
+    Generates actionable feedback on missing skills in the resume.
+
+    This function identifies the skills present in the job description but
+    missing from the resume, and provides suggestions on how to improve the resume
+    to align better with the job description.
+
+    Args:
+        resume_text (str): The text extracted from the resume.
+        job_description (str): The job description text.
+
+    Returns:
+        dict: A dictionary containing:
+            - missing_keywords (list): A list of skills missing from the resume.
+            - suggestions (list): Suggestions on how to address the missing skills.
+    """
+    if not isinstance(resume_text, str) or not isinstance(job_description, str):
+        return {"missing_keywords": [], "suggestions": []}
+    return analyze_skills(resume_text, job_description).feedback()
@@ -0,0 +1,362 @@
+"""
+Skill taxonomy loaded from a data file and compiled into a binary index.
+
+The taxonomy (skills, aliases and stop words) lives in a JSON file, by default
+data/skill_taxonomy.json. It is compiled into an index file holding the skill
+matcher's automaton as flat int32 arrays; every worker process memory-maps
+that file read-only, so they share one copy through the page cache instead of
+each building its own automaton. Precompile it with:
+    python taxonomy.py [data/skill_taxonomy.json]
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from skill_matcher import SkillMatcher
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_taxonomy.json")
+INDEX_MAGIC = b"SKIX"
+INDEX_FORMAT = 1
+# Magic, format and header length, followed by the JSON header and the arrays
+INDEX_PREFIX = struct.Struct("<4sII")
+
+
+def skill_token(skill):
+    """
+    Args:
+        skill (str): A skill phrase.
+
+    Returns:
+        str: The single token the phrase is replaced with when tokenizing.
+    """
+    return skill.lower().replace(' ', '_').replace('/', '').replace('.', '')
+
+def load_taxonomy(data):
+    """
+    Parse and validate a taxonomy document.
+
+    Args:
+        data (bytes): The JSON document.
+
+    Returns:
+        dict: The taxonomy with `version`, `skills`, `aliases` and `stop_words`.
+
+    Raises:
+        ValueError: If the document is not a valid taxonomy.
+    """
+    try:
+        taxonomy = json.loads(data)
+    except ValueError as e:
+        raise ValueError(f"Invalid skill taxonomy: {e}")
+    skills = taxonomy.get("skills") if isinstance(taxonomy, dict) else None
+    aliases = taxonomy.get("aliases", {}) if isinstance(taxonomy, dict) else None
+    stop_words = taxonomy.get("stop_words", []) if isinstance(taxonomy, dict) else None
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError("Invalid skill taxonomy: 'skills' must be a list of strings")
+    if not isinstance(aliases, dict) or not all(isinstance(skill, str) for skill in aliases.values()):
+        raise ValueError("Invalid skill taxonomy: 'aliases' must map aliases to skills")
+    if not isinstance(stop_words, list) or not all(isinstance(word, str) for word in stop_words):
+        raise ValueError("Invalid skill taxonomy: 'stop_words' must be a list of strings")
+    unknown = sorted(set(aliases.values()) - set(skills))
+    if unknown:
+        raise ValueError(f"Invalid skill taxonomy: aliases of unknown skills {unknown}")
+    return {
+        "version": taxonomy.get("version"),
+        "skills": skills,
+        "aliases": aliases,
+        "stop_words": stop_words,
+    }
+
+def compile_taxonomy(data, index_path):
+    """
+    Compile a taxonomy document into an index file.
+
+    The index is written to a temporary file and renamed over `index_path`,
+    so readers never see a partially written index.
+
+    Args:
+        data (bytes): The JSON taxonomy document.
+        index_path (str): Where to write the index.
+
+    Returns:
+        float: The seconds spent compiling.
+
+    Raises:
+        ValueError: If the document is not a valid taxonomy.
+    """
+    start = time.perf_counter()
+    taxonomy = load_taxonomy(data)
+    # Skills sharing a token (such as "ci/cd pipelines" and "cicd pipelines")
+    # share a value; aliases take the value of the skill they stand for
+    token_values = {}
+    for skill in taxonomy["skills"]:
+        token_values.setdefault(skill_token(skill), len(token_values))
+    tokens = list(token_values)
+    phrases = list(taxonomy["skills"]) + list(taxonomy["aliases"])
+    values = [token_values[skill_token(skill)] for skill in taxonomy["skills"]]
+    values += [token_values[skill_token(skill)] for skill in taxonomy["aliases"].values()]
+    matcher = SkillMatcher(phrases, values)
+
+    encoded = [token.encode("utf-8") for token in tokens]
+    token_offsets = array("i", [0])
+    for token in encoded:
+        token_offsets.append(token_offsets[-1] + len(token))
+    arrays = [(name, getattr(matcher, name)) for name in SkillMatcher.ARRAYS]
+    arrays.append(("token_offsets", token_offsets))
+    layout = {}
+    position = 0
+    for name, values_array in arrays:
+        layout[name] = [position, len(values_array)]
+        position += len(values_array) * values_array.itemsize
+    layout["token_blob"] = [position, token_offsets[-1]]
+    header = json.dumps({
+        "source_sha256": hashlib.sha256(data).hexdigest(),
+        "byteorder": sys.byteorder,
+        "version": taxonomy["version"],
+        "skills": len(taxonomy["skills"]),
+        "aliases": len(taxonomy["aliases"]),
+        "tokens": len(tokens),
+        "stop_words": taxonomy["stop_words"],
+        "layout": layout,
+    }).encode("utf-8")
+    header += b" " * (-(INDEX_PREFIX.size + len(header)) % 8)  # Align the arrays
+
+    directory = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".skill_index-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(INDEX_PREFIX.pack(INDEX_MAGIC, INDEX_FORMAT, len(header)))
+            file.write(header)
+            for _, values_array in arrays:
+                file.write(values_array.tobytes())
+            file.write(b"".join(encoded))
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, index_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return time.perf_counter() - start
+
+
+class SkillIndex:
+    """
+    A compiled taxonomy, memory-mapped read-only.
+
+    Attributes:
+        matcher (SkillMatcher): The matcher over skills and aliases, reading
+            straight from the mapped file; match values are token ids.
+        stop_words (frozenset): Tokens dropped when tokenizing.
+        header (dict): The index header (source digest, counts, layout).
+        size (int): The size of the index file in bytes.
+
+    Raises:
+        ValueError: If the file is not an index in the current format.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self.size = len(self._mmap)
+        if self.size < INDEX_PREFIX.size:
+            raise ValueError(f"Not a skill index: {path}")
+        magic, index_format, header_length = INDEX_PREFIX.unpack_from(self._mmap)
+        if magic != INDEX_MAGIC or index_format != INDEX_FORMAT:
+            raise ValueError(f"Not a skill index in format {INDEX_FORMAT}: {path}")
+        self.header = json.loads(self._mmap[INDEX_PREFIX.size:INDEX_PREFIX.size + header_length])
+        if self.header["byteorder"] != sys.byteorder:
+            raise ValueError(f"Skill index was compiled on a {self.header['byteorder']}-endian machine: {path}")
+        base = INDEX_PREFIX.size + header_length
+        view = memoryview(self._mmap)
+        arrays = {}
+        for name, (offset, count) in self.header["layout"].items():
+            if name != "token_blob":
+                arrays[name] = view[base + offset:base + offset + 4 * count].cast("i")
+        blob_offset, blob_length = self.header["layout"]["token_blob"]
+        self._token_blob = view[base + blob_offset:base + blob_offset + blob_length]
+        self._token_offsets = arrays.pop("token_offsets")
+        self.matcher = SkillMatcher.from_arrays(arrays)
+        self.stop_words = frozenset(self.header["stop_words"])
+        self._token_ids = None
+
+    def token(self, value):
+        """
+        Args:
+            value (int): A match value of `matcher`.
+
+        Returns:
+            str: The token of the matched skill.
+        """
+        return bytes(self._token_blob[self._token_offsets[value]:self._token_offsets[value + 1]]).decode("utf-8")
+
+    @property
+    def token_ids(self):
+        """
+        Returns:
+            dict: The id of every skill token, built on first use.
+        """
+        if self._token_ids is None:
+            self._token_ids = {self.token(value): value for value in range(self.header["tokens"])}
+        return self._token_ids
+
+
+class SkillTaxonomy:
+    """
+    The current skill index, recompiled and swapped in when the data file changes.
+
+    `current` only reads the loaded index, loading it on first use. Once
+    `start` is called, a background thread checks the data file's modification
+    time every `reload_interval` seconds. When it changed, the index is
+    recompiled (unless another worker already compiled this exact document)
+    and swapped in with a single assignment, so requests never wait for a
+    compile; callers holding the previous index keep using it until they are
+    done. A broken data file is counted in `stats` and leaves the previous
+    index in place.
+
+    Args:
+        path (str): The JSON taxonomy file.
+        index_path (str): The compiled index file, defaults to `path` with an .idx suffix.
+        reload_interval (float): Seconds between checks of the data file, 0 disables reloading.
+    """
+
+    def __init__(self, path=None, index_path=None, reload_interval=None):
+        self.path = path or os.getenv('skill_taxonomy_path') or DEFAULT_TAXONOMY_PATH
+        self.index_path = index_path or os.getenv('skill_index_path') or os.path.splitext(self.path)[0] + ".idx"
+        if reload_interval is None:
+            reload_interval = float(os.getenv('skill_taxonomy_reload_interval', 5))
+        self.reload_interval = reload_interval
+        self._index = None
+        self._stamp = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._watcher = None
+        self.compile_seconds = None
+        self.loads = 0
+        self.reload_errors = 0
+        self.last_error = None
+
+    def current(self):
+        """
+        Returns:
+            SkillIndex: The current index, loaded on first use.
+        """
+        index = self._index
+        if index is None:
+            self.reload()
+            index = self._index
+        return index
+
+    def start(self):
+        """
+        Load the index if needed, then watch the data file for changes from a
+        background thread, unless reloading is disabled.
+        """
+        self.current()
+        if not self.reload_interval or self._watcher is not None:
+            return
+        self._stopped.clear()
+        self._watcher = threading.Thread(target=self._watch, name="skill-taxonomy-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        """
+        Stop watching the data file, waiting for a reload in progress.
+        """
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            self._stopped.set()
+            watcher.join()
+
+    def _watch(self):
+        while not self._stopped.wait(self.reload_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                self._reload_failed(e)
+
+    def _reload_failed(self, error):
+        self.reload_errors += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+
+    def reload(self, force=False):
+        """
+        Load the data file if it changed since the last load.
+
+        Only one caller reloads at a time; once an index is loaded, others
+        keep using it instead of waiting. A failed reload is counted in
+        `stats` and keeps the current index.
+
+        Args:
+            force (bool): Recompile even if the data file did not change.
+
+        Returns:
+            bool: Whether a new index was swapped in.
+
+        Raises:
+            ValueError | OSError: If no index is loaded yet and loading fails.
+        """
+        if not self._lock.acquire(blocking=self._index is None):
+            return False
+        try:
+            try:
+                stat = os.stat(self.path)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                if self._index is not None and stamp == self._stamp and not force:
+                    return False
+                with open(self.path, "rb") as file:
+                    data = file.read()
+                index = None
+                if not force and os.path.exists(self.index_path):
+                    try:
+                        index = SkillIndex(self.index_path)
+                    except ValueError:
+                        index = None
+                    if index is not None and index.header["source_sha256"] != hashlib.sha256(data).hexdigest():
+                        index = None
+                if index is None:
+                    self.compile_seconds = compile_taxonomy(data, self.index_path)
+                    index = SkillIndex(self.index_path)
+            except (OSError, ValueError) as e:
+                if self._index is None:
+                    raise
+                self._reload_failed(e)
+                return False
+            self._index = index
+            self._stamp = stamp
+            self.loads += 1
+            return True
+        finally:
+            self._lock.release()
+
+    def stats(self):
+        """
+        Returns:
+            dict: The loaded taxonomy's size, compile time, reload counters and
+                the last reload error.
+        """
+        index = self._index
+        return {
+            "path": self.path,
+            "version": index.header["version"] if index else None,
+            "skills": index.header["skills"] if index else 0,
+            "aliases": index.header["aliases"] if index else 0,
+            "stop_words": len(index.stop_words) if index else 0,
+            "index_bytes": index.size if index else 0,
+            "compile_seconds": round(self.compile_seconds, 4) if self.compile_seconds is not None else None,
+            "loads": self.loads,
+            "reload_errors": self.reload_errors,
+            "last_error": self.last_error,
+        }
+
+if __name__ == "__main__":
+    taxonomy = SkillTaxonomy(*sys.argv[1:2], reload_interval=0)
+    taxonomy.reload(force=True)
+    print(taxonomy.stats())
@@ -0,0 +1,24 @@
+import atexit
+import os
+import shutil
+import tempfile
+import pytest
+
+# Point the SQLite files main opens on import at a scratch directory, so the
+# tests never write into the real ./database files
+scratch = tempfile.mkdtemp(prefix="backend-tests-")
+atexit.register(shutil.rmtree, scratch, ignore_errors=True)
+for name, filename in (
+    ("resume_index_path", "resume_index.db"),
+    ("job_corpus_path", "job_corpus.db"),
+    ("job_queue_path", "jobs.db"),
+    ("session_store_path", "sessions.db"),
+):
+    os.environ[name] = os.path.join(scratch, filename)
+os.environ["database_url"] = "sqlite:///" + os.path.join(scratch, "database.db")
+
+@pytest.fixture
+def auth_headers():
+    # A bearer token for the routes that always require one
+    from backend import main
+    return {"Authorization": f"Bearer {main.token_verifier.issue('tester@example.com')}"}
@@ -0,0 +1,100 @@
+from fastapi.testclient import TestClient
+from backend import main
+from backend.main import app
+from backend.auth import bearer_token, user_key
+import time
+import jwt
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+# Taken from main so that raised errors are the ones its exception handler expects
+TokenVerifier = main.TokenVerifier
+InvalidToken = main.InvalidToken
+
+SECRET = "test-secret-of-at-least-thirty-two-bytes"
+
+@pytest.fixture
+def verifier(monkeypatch):
+    verifier = TokenVerifier(secret=SECRET, algorithm="HS256", lifetime=60)
+    monkeypatch.setattr(main, "token_verifier", verifier)
+    return verifier
+
+"""
+Tests
+"""
+# VERIFIER TESTS
+def test_issued_tokens_verify_once_then_hit_the_cache(verifier):
+    token = verifier.issue("user@example.com")
+    claims = verifier.verify(token)
+    assert claims["email"] == "user@example.com"
+    assert claims["user_key"] == user_key("user@example.com")
+    assert verifier.verify(token) == claims
+    stats = verifier.stats()
+    assert stats["verified"] == 1
+    assert stats["cache"]["hits"] == 1
+
+def test_forged_and_malformed_tokens_are_rejected(verifier):
+    forged = jwt.encode({"email": "user@example.com", "exp": time.time() + 60}, "another-secret-of-thirty-two-bytes", "HS256")
+    for token in (forged, "not-a-token"):
+        with pytest.raises(InvalidToken):
+            verifier.verify(token)
+    without_exp = jwt.encode({"email": "user@example.com"}, SECRET, "HS256")
+    with pytest.raises(InvalidToken):
+        verifier.verify(without_exp)
+    assert verifier.stats()["rejected"] == 3
+
+def test_expired_tokens_are_rejected_even_when_cached(verifier):
+    token = verifier.issue("user@example.com")
+    verifier.verify(token)
+    # The token expires while it is cached
+    verifier._cache.get(token)["exp"] = time.time() - 1
+    with pytest.raises(InvalidToken, match="expired"):
+        verifier.verify(token)
+    assert len(verifier._cache) == 0
+    expired = jwt.encode({"email": "user@example.com", "exp": time.time() - 10}, SECRET, "HS256")
+    with pytest.raises(InvalidToken, match="expired"):
+        verifier.verify(expired)
+    assert verifier.stats()["expired"] == 2
+
+def test_callers_get_copies_of_the_claims(verifier):
+    token = verifier.issue("user@example.com")
+    verifier.verify(token)["email"] = "changed@example.com"
+    assert verifier.verify(token)["email"] == "user@example.com"
+
+def test_bearer_token_and_user_key():
+    assert bearer_token("Bearer abc") == "abc"
+    assert bearer_token("bearer  abc ") == "abc"
+    assert bearer_token("Basic abc") is None
+    assert bearer_token(None) is None
+    assert user_key(" User@Example.com") == user_key("user@example.com")
+    assert user_key("a@example.com") != user_key("b@example.com")
+
+# ENDPOINT TESTS
+def test_invalid_tokens_get_401(verifier):
+    response = client.get("/api/analysis-jobs/unknown", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert response.json()["status"] == "error"
+    token = verifier.issue("user@example.com")
+    response = client.get("/api/analysis-jobs/unknown", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 404
+
+def test_require_auth_rejects_anonymous_requests(verifier, monkeypatch):
+    assert client.get("/api/analysis-jobs/unknown").status_code == 404
+    monkeypatch.setattr(main, "REQUIRE_AUTH", True)
+    assert client.get("/api/analysis-jobs/unknown").status_code == 401
+    token = verifier.issue("user@example.com")
+    assert client.get("/api/analysis-jobs/unknown", headers={"Authorization": f"Bearer {token}"}).status_code == 404
+    metrics = client.get("/api/metrics", headers={"Authorization": f"Bearer {token}"}).json()
+    assert metrics["auth_tokens"]["verified"] == 1
+
+def test_cross_user_routes_always_require_a_token(verifier):
+    assert client.get("/api/metrics").status_code == 401
+    assert client.post("/api/top-resumes", json={"job_description": "Required Skills:\n- Python"}).status_code == 401
+    assert client.post("/api/batch-fit-score", json={"resumes": ["Python"], "job_descriptions": ["Python"]}).status_code == 401
+    token = verifier.issue("user@example.com")
+    assert client.get("/api/metrics", headers={"Authorization": f"Bearer {token}"}).status_code == 200
@@ -0,0 +1,89 @@
+from fastapi.testclient import TestClient
+from backend.main import app, batch_stats
+from backend.batch_scoring import BATCH_ENGINES, BatchStats, batch_fit_scores
+from backend.skills import calculate_fit_score, extract_skill_keys, skill_keys
+from unittest.mock import patch
+import json
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+resumes = [
+    "Software engineer skilled in Python, AWS and REST APIs.",
+    "Frontend developer: JavaScript, React JS, HTML5, CSS3, Node.js.",
+    "Data scientist with machine learning, Python and SQL.",
+    "",
+]
+
+job_descriptions = [
+    "Required Skills:\n- Python\n- AWS\n- REST APIs\n\nPreferred Skills:\n- Docker\n- Kubernetes",
+    "Required Skills:\n- JavaScript, NodeJS\nPreferred Skills:\n- React JS",
+    "Required Skills:\n- Machine Learning; SQL",
+    "No skill sections here.",
+]
+
+"""
+Tests
+"""
+@pytest.mark.parametrize("engine", BATCH_ENGINES)
+def test_batch_scores_match_scalar_scores(engine):
+    scores = list(batch_fit_scores(resumes, job_descriptions, engine=engine))
+    assert len(scores) == len(resumes) * len(job_descriptions)
+    for resume_index, job_index, fit_score in scores:
+        assert fit_score == calculate_fit_score(resumes[resume_index], job_descriptions[job_index])
+
+@pytest.mark.parametrize("engine", BATCH_ENGINES)
+def test_batch_scores_one_resume_against_many_jobs(engine):
+    scores = list(batch_fit_scores(resumes[:1], job_descriptions, engine=engine))
+    assert [(resume_index, job_index) for resume_index, job_index, _ in scores] == [(0, 0), (0, 1), (0, 2), (0, 3)]
+    assert scores[0][2] == 70
+
+def test_batch_tokenizes_each_document_once():
+    with patch("backend.batch_scoring.skill_keys", wraps=skill_keys) as tokenizer, \
+         patch("backend.batch_scoring.extract_skill_keys", wraps=extract_skill_keys) as extract:
+        list(batch_fit_scores(resumes, job_descriptions, engine="scalar"))
+    assert tokenizer.call_count == len(resumes)
+    assert extract.call_count == len(job_descriptions)
+
+def test_batch_stats_report_throughput():
+    stats = BatchStats()
+    stats.record(100, 0.5)
+    assert stats.stats() == {"batches": 1, "pairs": 100, "seconds": 0.5, "pairs_per_sec": 200.0}
+
+# ENDPOINT TESTS
+
+def test_batch_endpoint_streams_ndjson(auth_headers):
+    pairs_before = batch_stats.pairs
+    response = client.post("/api/batch-fit-score", json={"resumes": resumes, "job_descriptions": job_descriptions}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results, summary = lines[:-1], lines[-1]
+    assert len(results) == 16
+    for result in results:
+        assert result["fit_score"] == calculate_fit_score(
+            resumes[result["resume"]], job_descriptions[result["job_description"]]
+        )
+    assert summary["pairs"] == 16
+    assert "pairs_per_sec" in summary
+    assert batch_stats.pairs == pairs_before + 16
+
+def test_batch_endpoint_scores_many_postings(auth_headers):
+    # 20,000 postings with a skill of their own: dense vocabulary x jobs masks would take gigabytes
+    postings = [job_descriptions[i % len(job_descriptions)] + f"\n- skill{i}" for i in range(20000)]
+    response = client.post("/api/batch-fit-score", json={"resumes": resumes[:1], "job_descriptions": postings}, headers=auth_headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1]["pairs"] == 20000
+    assert [line["fit_score"] for line in lines[:4]] == [calculate_fit_score(resumes[0], job) for job in postings[:4]]
+
+def test_batch_endpoint_rejects_empty_and_oversized_batches(auth_headers):
+    response = client.post("/api/batch-fit-score", json={"resumes": [], "job_descriptions": job_descriptions}, headers=auth_headers)
+    assert response.status_code == 400
+    with patch("backend.main.BATCH_MAX_PAIRS", 10):
+        response = client.post("/api/batch-fit-score", json={"resumes": resumes, "job_descriptions": job_descriptions}, headers=auth_headers)
+    assert response.status_code == 400
+    assert "Too many pairs" in response.json()["error"]
@@ -0,0 +1,74 @@
+from fastapi.testclient import TestClient
+from backend.main import app, pdf_text_cache, extraction_pool
+from backend.cache import LRUCache, PdfTextCache
+from unittest.mock import patch
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from io import BytesIO
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+@pytest.fixture
+def clear_pdf_text_cache():
+    pdf_text_cache.clear()
+    yield
+    pdf_text_cache.clear()
+
+def create_pdf_bytes(text):
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.drawString(100, 750, text)
+    c.save()
+    return buffer.getvalue()
+
+"""
+Tests
+"""
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+def test_lru_cache_respects_byte_budget():
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.put("a", "x" * 6)
+    cache.put("b", "y" * 6)
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 6
+    cache.put("c", "z" * 11)
+    assert "c" not in cache
+
+def test_pdf_text_cache_disk_tier(tmp_path):
+    digest = PdfTextCache.digest(b"%PDF-1.4 test")
+    PdfTextCache(directory=str(tmp_path)).put(digest, "Resume text")
+    fresh = PdfTextCache(directory=str(tmp_path))
+    assert fresh.get(digest) == "Resume text"
+    assert fresh.get(digest) == "Resume text"
+    stats = fresh.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 0
+
+def test_resume_upload_reuses_cached_text(clear_pdf_text_cache, auth_headers):
+    pdf = create_pdf_bytes("Cached Resume")
+    with patch.object(extraction_pool, "submit", wraps=extraction_pool.submit) as submit:
+        for _ in range(2):
+            response = client.post(
+                "/api/resume-upload",
+                files={"file": ("resume.pdf", BytesIO(pdf), "application/pdf")},
+            )
+            assert response.status_code == 200
+            assert response.json()["character_count"] == len("Cached Resume")
+    assert submit.call_count == 1
+    stats = client.get("/api/metrics", headers=auth_headers).json()["pdf_text_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
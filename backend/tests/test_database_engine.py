@@ -0,0 +1,96 @@
+from backend.database.engine import create_database_engine, create_async_database_engine, async_database_url, engine_options, sqlite_pragmas
+from backend.database import models
+from backend import main
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import asyncio
+
+"""
+Setup and helper
+"""
+def pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+"""
+Tests
+"""
+def test_sqlite_file_engine_is_tuned(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1  # NORMAL
+    assert pragma(engine, "cache_size") == sqlite_pragmas()["cache_size"]
+    assert pragma(engine, "foreign_keys") == 1
+    assert pragma(engine, "busy_timeout") == 5000
+    assert engine.pool.size() == 5
+    engine.dispose()
+
+def test_settings_come_from_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("database_url", f"sqlite:///{tmp_path / 'env.db'}")
+    monkeypatch.setenv("database_pool_size", "2")
+    monkeypatch.setenv("database_busy_timeout", "0.5")
+    monkeypatch.setenv("sqlite_synchronous", "FULL")
+    engine = create_database_engine()
+    assert str(engine.url).endswith("env.db")
+    assert engine.pool.size() == 2
+    assert pragma(engine, "busy_timeout") == 500
+    assert pragma(engine, "synchronous") == 2  # FULL
+    engine.dispose()
+
+def test_in_memory_sqlite_shares_one_connection():
+    engine = create_database_engine("sqlite://")
+    assert isinstance(engine.pool, StaticPool)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM t")).scalar() == 0
+
+def test_other_databases_get_pool_options_only():
+    options = engine_options("postgresql://user@localhost/app", pool_size=20)
+    assert options == {"pool_size": 20, "max_overflow": 10, "pool_timeout": 30.0, "pool_pre_ping": True}
+
+def test_async_urls_get_an_async_driver():
+    assert async_database_url("sqlite:///./users.db") == "sqlite+aiosqlite:///./users.db"
+    assert async_database_url("postgresql://user:pw@localhost/app") == "postgresql+asyncpg://user:pw@localhost/app"
+    assert async_database_url("postgresql+psycopg://localhost/app") == "postgresql+psycopg://localhost/app"
+
+def test_async_sqlite_engine_is_tuned(tmp_path):
+    async def check():
+        engine = create_async_database_engine(f"sqlite:///{tmp_path / 'users.db'}", pool_size=3)
+        async with engine.connect() as connection:
+            journal_mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+            busy_timeout = (await connection.execute(text("PRAGMA busy_timeout"))).scalar()
+        size = engine.pool.size()
+        await engine.dispose()
+        return journal_mode, busy_timeout, size
+
+    assert asyncio.run(check()) == ("wal", 5000, 3)
+
+def test_threaded_session_runs_user_queries():
+    engine = create_database_engine("sqlite://")
+    models.Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    async def check():
+        db = models.ThreadedSession(SessionLocal())
+        db.add(models.User(email="a@b.c", username="a", hashed_password="h"))
+        await db.commit()
+        user = await db.run_sync(models.find_user, "a@b.c")
+        deleted = await db.run_sync(models.delete_user, "a@b.c")
+        missing = await db.run_sync(models.find_user, "a@b.c")
+        await db.close()
+        return user.username, deleted, missing
+
+    assert asyncio.run(check()) == ("a", True, None)
+
+def test_async_engine_lives_with_the_app():
+    # Outside the app's lifespan no async engine (and no driver thread) exists
+    assert main.models.async_engine is None
+    with TestClient(main.app):
+        assert main.models.async_engine is not None
+        assert main.models.AsyncSessionLocal is not None
+        assert main.models.open_async_sessions() is None
+    assert main.models.async_engine is None
+    assert main.models.AsyncSessionLocal is None
@@ -0,0 +1,124 @@
+from fastapi.testclient import TestClient
+from backend.main import app, extraction_pool
+from backend.extraction_pool import ExtractionPool, ExtractionPoolSaturated
+from backend.pdf_extraction import extract_pdf_document
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from io import BytesIO
+import asyncio
+import time
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+def create_pdf_bytes(text):
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.drawString(100, 750, text)
+    c.save()
+    return buffer.getvalue()
+
+def slow_job(seconds):
+    time.sleep(seconds)
+    return seconds
+
+def failing_job():
+    raise ValueError("not a PDF")
+
+"""
+Tests
+"""
+def test_pool_extracts_text_in_worker_process():
+    pool = ExtractionPool(max_workers=1, max_queue_depth=2, timeout=30)
+    try:
+        text = asyncio.run(pool.submit(extract_pdf_document, create_pdf_bytes("Hello World"))).text
+    finally:
+        pool.shutdown()
+    assert text == "Hello World"
+    assert pool.stats()["completed"] == 1
+    assert pool.stats()["in_flight"] == 0
+
+def test_pool_rejects_when_saturated():
+    pool = ExtractionPool(max_workers=0, max_queue_depth=1, timeout=5)
+
+    async def run():
+        first = asyncio.ensure_future(pool.submit(slow_job, 0.2))
+        await asyncio.sleep(0)
+        with pytest.raises(ExtractionPoolSaturated):
+            await pool.submit(slow_job, 0)
+        return await first
+
+    assert asyncio.run(run()) == 0.2
+    assert pool.stats()["rejected"] == 1
+
+def test_pool_times_out_slow_jobs():
+    pool = ExtractionPool(max_workers=0, max_queue_depth=1, timeout=0.05)
+
+    async def run():
+        with pytest.raises(TimeoutError):
+            await pool.submit(slow_job, 0.3)
+        # The worker thread is still running the job, so it keeps its slot
+        assert pool.stats()["in_flight"] == 1
+        with pytest.raises(ExtractionPoolSaturated):
+            await pool.submit(slow_job, 0)
+        await asyncio.sleep(0.5)
+        return await pool.submit(slow_job, 0)
+
+    assert asyncio.run(run()) == 0
+    stats = pool.stats()
+    assert stats["timed_out"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["completed"] == 2
+    pool.shutdown()
+
+def test_pool_recycles_workers_stuck_on_hung_jobs():
+    pool = ExtractionPool(max_workers=2, max_queue_depth=2, timeout=0.2, max_hung=2)
+
+    async def run():
+        # Start the worker processes, so the hung jobs run right away
+        await pool.submit(slow_job, 0)
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                await pool.submit(slow_job, 60)
+        return await pool.submit(slow_job, 0)
+
+    try:
+        assert asyncio.run(run()) == 0
+    finally:
+        pool.shutdown()
+    stats = pool.stats()
+    assert stats["recycled"] == 1
+    assert (stats["timed_out"], stats["hung"], stats["in_flight"]) == (2, 0, 0)
+
+def test_pool_counts_failed_jobs_apart():
+    pool = ExtractionPool(max_workers=0, max_queue_depth=1, timeout=5)
+    with pytest.raises(ValueError):
+        asyncio.run(pool.submit(failing_job))
+    stats = pool.stats()
+    assert (stats["completed"], stats["failed"], stats["in_flight"]) == (0, 1, 0)
+    pool.shutdown()
+
+def test_resume_upload_returns_429_when_pool_is_full(monkeypatch):
+    monkeypatch.setattr(extraction_pool, "max_queue_depth", 0)
+    response = client.post(
+        "/api/resume-upload",
+        files={"file": ("test.pdf", BytesIO(create_pdf_bytes("Hello World")), "application/pdf")},
+    )
+    assert response.status_code == 429
+    assert response.json()["status"] == "error"
+    assert "Retry-After" in response.headers
+
+def test_resume_upload_returns_503_when_parsing_times_out(monkeypatch):
+    async def timed_out(*args):
+        raise TimeoutError("PDF extraction exceeded 10 seconds.")
+
+    monkeypatch.setattr(extraction_pool, "submit", timed_out)
+    response = client.post(
+        "/api/resume-upload",
+        files={"file": ("test.pdf", BytesIO(create_pdf_bytes("Timed out resume")), "application/pdf")},
+    )
+    assert response.status_code == 503
+    assert response.json()["status"] == "error"
@@ -0,0 +1,222 @@
+from fastapi.testclient import TestClient
+from backend import main
+from backend.main import app, session_store, llm_client
+from backend.job_queue import JobQueue, JobWorkerPool, create_job_queue
+from backend.benchmarks.llm_stub import LLMStubServer
+import asyncio
+import sqlite3
+import time
+import pytest
+
+"""
+Setup and helper
+"""
+@pytest.fixture
+def stub():
+    with LLMStubServer() as server:
+        yield server
+
+async def run_until_finished(pool, job_id, timeout=5.0):
+    pool.start()
+    pool.wake()
+    deadline = time.monotonic() + timeout
+    while pool.queue.get(job_id)["status"] not in ("done", "dead") and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    await pool.stop()
+    return pool.queue.get(job_id)
+
+"""
+Tests
+"""
+# QUEUE TESTS
+def test_submit_claim_complete():
+    queue = JobQueue(":memory:")
+    job_id = queue.submit("analysis", {"resume_text": "Python"})
+    job = queue.claim()
+    assert job == {"id": job_id, "kind": "analysis", "payload": {"resume_text": "Python"}, "attempt": 1}
+    assert queue.claim() is None
+    assert queue.get(job_id)["status"] == "running"
+    assert queue.complete(job_id, 1, {"fit_score": 80}, seconds=0.5)
+    job = queue.get(job_id)
+    assert job["status"] == "done"
+    assert job["result"] == {"fit_score": 80}
+    assert job["run_seconds"] == 0.5
+    assert job["queue_seconds"] >= 0
+    assert queue.stats()["done"] == 1
+
+def test_failed_jobs_are_retried_then_dead_lettered():
+    queue = JobQueue(":memory:", max_attempts=2, retry_backoff=0)
+    job_id = queue.submit("analysis", {})
+    assert queue.fail(queue.claim()["id"], 1, "timeout")
+    job = queue.claim()
+    assert job["attempt"] == 2
+    assert queue.fail(job["id"], 2, "timeout again") is False
+    assert queue.claim() is None
+    job = queue.get(job_id)
+    assert job["status"] == "dead"
+    assert job["error"] == "timeout again"
+    stats = queue.stats()
+    assert stats["dead"] == 1
+    assert stats["retries"] == 1
+
+def test_retries_wait_for_the_backoff():
+    queue = JobQueue(":memory:", retry_backoff=60)
+    queue.submit("analysis", {})
+    queue.fail(queue.claim()["id"], 1, "rate limited")
+    assert queue.claim() is None
+
+def test_jobs_survive_restarts(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    queue = JobQueue(path, lease=0)
+    queued = queue.submit("analysis", {"n": 1})
+    running = queue.submit("analysis", {"n": 2})
+    assert queue.claim()["id"] == queued
+    # The process dies while running the first job
+    restarted = JobQueue(path)
+    claimed = {restarted.claim()["id"], restarted.claim()["id"]}
+    assert claimed == {queued, running}
+    assert restarted.stats()["reclaimed"] == 1
+
+def test_expired_lease_on_last_attempt_dead_letters():
+    queue = JobQueue(":memory:", max_attempts=1, lease=0)
+    job_id = queue.submit("analysis", {})
+    queue.claim()
+    assert queue.claim() is None
+    assert queue.get(job_id)["status"] == "dead"
+    assert queue.get(job_id)["error"] == "Lease expired"
+
+def test_expired_attempts_cannot_overwrite_the_next_one():
+    queue = JobQueue(":memory:", lease=0)
+    job_id = queue.submit("analysis", {})
+    first = queue.claim()
+    second = queue.claim()
+    assert second["attempt"] == 2
+    assert queue.complete(job_id, 2, {"fit_score": 80})
+    assert not queue.complete(job_id, 1, {"fit_score": 0})
+    assert queue.fail(job_id, first["attempt"], "late failure") is None
+    job = queue.get(job_id)
+    assert job["status"] == "done"
+    assert job["result"] == {"fit_score": 80}
+    assert queue.stats()["stale"] == 2
+
+def test_finished_jobs_drop_their_payload_and_are_purged(monkeypatch):
+    queue = JobQueue(":memory:", max_attempts=1, retention=60)
+    done = queue.submit("analysis", {"resume_text": "Python"})
+    dead = queue.submit("analysis", {"resume_text": "Rust"})
+    queue.complete(done, queue.claim()["attempt"], {"fit_score": 80})
+    queue.fail(dead, queue.claim()["attempt"], "timeout")
+    payloads = queue._conn.execute("SELECT payload FROM jobs").fetchall()
+    assert payloads == [(None,), (None,)]
+    # A minute past the retention, the next claim deletes both
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert queue.claim() is None
+    assert queue.get(done) is None and queue.get(dead) is None
+    assert queue.stats()["purged"] == 2
+
+def test_lease_is_configured_and_outlasts_the_timeout(monkeypatch):
+    monkeypatch.setenv("job_queue_path", "")
+    monkeypatch.setenv("job_lease", "30")
+    assert create_job_queue().lease == 30
+    assert create_job_queue(min_lease=120).lease == 120
+
+# WORKER TESTS
+def test_workers_retry_failing_handlers():
+    calls = []
+
+    async def flaky(payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise RuntimeError("upstream unavailable")
+        return {"echo": payload["n"]}
+
+    queue = JobQueue(":memory:", retry_backoff=0)
+    pool = JobWorkerPool(queue, {"analysis": flaky}, concurrency=2, poll_interval=0.01)
+    job_id = queue.submit("analysis", {"n": 7})
+    job = asyncio.run(run_until_finished(pool, job_id))
+    assert job["status"] == "done"
+    assert job["result"] == {"echo": 7}
+    assert job["attempts"] == 2
+    assert pool.stats()["workers"] == 0
+
+def test_workers_time_out_and_dead_letter():
+    async def slow(payload):
+        await asyncio.sleep(10)
+
+    queue = JobQueue(":memory:", max_attempts=1)
+    pool = JobWorkerPool(queue, {"analysis": slow}, timeout=0.05, poll_interval=0.01)
+    job = asyncio.run(run_until_finished(pool, queue.submit("analysis", {})))
+    assert job["status"] == "dead"
+    assert job["error"] == "TimeoutError"
+
+def test_workers_survive_queue_errors():
+    class LockedOnce(JobQueue):
+        locked = {"claim": 1, "complete": 1}
+
+        def claim(self):
+            if self.locked["claim"]:
+                self.locked["claim"] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            return super().claim()
+
+        def complete(self, job_id, attempt, result, seconds=0.0):
+            if self.locked["complete"]:
+                self.locked["complete"] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            return super().complete(job_id, attempt, result, seconds)
+
+    async def echo(payload):
+        return payload
+
+    queue = LockedOnce(":memory:", lease=0)
+    pool = JobWorkerPool(queue, {"analysis": echo}, concurrency=1, poll_interval=0.01)
+
+    async def run():
+        job_id = queue.submit("analysis", {"n": 1})
+        pool.start()
+        deadline = time.monotonic() + 5
+        while queue.get(job_id)["status"] != "done" and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        workers = pool.stats()["workers"]
+        await pool.stop()
+        return queue.get(job_id), workers
+
+    job, workers = asyncio.run(run())
+    assert job["status"] == "done"
+    assert job["attempts"] == 2
+    assert workers == 1
+    assert pool.stats()["errors"] == 2
+
+def test_unknown_job_kind_is_dead_lettered():
+    queue = JobQueue(":memory:", max_attempts=1)
+    pool = JobWorkerPool(queue, {}, poll_interval=0.01)
+    job = asyncio.run(run_until_finished(pool, queue.submit("resize", {})))
+    assert job["status"] == "dead"
+    assert "resize" in job["error"]
+
+# ENDPOINT TESTS
+def test_analysis_job_endpoints(stub, monkeypatch, auth_headers):
+    monkeypatch.setattr(llm_client, "base_url", stub.base_url)
+    monkeypatch.setattr(llm_client, "api_key", "stub-key")
+    monkeypatch.setattr(main, "job_queue", JobQueue(":memory:"))
+    monkeypatch.setattr(main.analysis_workers, "queue", main.job_queue)
+    session_store.set("job-session", {
+        "resume_text": "Engineer skilled in Rust and Go.",
+        "job_description": "Required Skills:\n- Rust"
+    })
+    with TestClient(app) as client:
+        response = client.post("/api/analysis-jobs", headers={"X-Session-Id": "job-session"})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        deadline = time.monotonic() + 5
+        while True:
+            response = client.get(f"/api/analysis-jobs/{job_id}")
+            assert response.status_code == 200
+            if response.json()["status"] == "done" or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        assert response.json()["result"]["fit_score"] == 80
+        assert client.get("/api/analysis-jobs/unknown").status_code == 404
+        assert client.post("/api/analysis-jobs", headers={"X-Session-Id": "missing"}).status_code == 400
+        assert client.get("/api/metrics", headers=auth_headers).json()["analysis_jobs"]["done"] == 1
+    session_store.clear()
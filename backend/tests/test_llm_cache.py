@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+from backend.main import app, session_store, llm_client, analysis_cache
+from backend.llm_cache import AnalysisCache
+from backend.benchmarks.llm_stub import LLMStubServer
+from unittest.mock import patch
+import time
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+analysis = {"fit_score": 80, "feedback": [{"category": "skills", "text": "Add AWS."}]}
+
+@pytest.fixture
+def stub(monkeypatch):
+    analysis_cache.invalidate()
+    with LLMStubServer() as server:
+        monkeypatch.setattr(llm_client, "base_url", server.base_url)
+        monkeypatch.setattr(llm_client, "api_key", "stub-key")
+        yield server
+    analysis_cache.invalidate()
+
+"""
+Tests
+"""
+def test_key_ignores_whitespace_but_not_model_or_version():
+    cache = AnalysisCache(1)
+    key = cache.key("gpt-4o-mini", "Python  developer\n", "Required: Python")
+    assert key == cache.key("gpt-4o-mini", "Python developer", " Required:  Python ")
+    assert key != cache.key("gpt-4o", "Python developer", "Required: Python")
+    assert key != AnalysisCache(2).key("gpt-4o-mini", "Python developer", "Required: Python")
+
+def test_cache_expires_entries():
+    cache = AnalysisCache(1, ttl=60)
+    cache.put("k", analysis)
+    assert cache.get("k") == analysis
+    with patch("time.monotonic", return_value=time.monotonic() + 120):
+        assert cache.get("k") is None
+
+def test_sqlite_tier_persists_and_drops_old_prompt_versions(tmp_path):
+    path = str(tmp_path / "analysis.db")
+    AnalysisCache(1, path=path).put("k", analysis)
+    fresh = AnalysisCache(1, path=path)
+    assert fresh.get("k") == analysis
+    assert fresh.stats()["disk_hits"] == 1
+    assert AnalysisCache(2, path=path).get("k") is None
+    assert AnalysisCache(1, path=path).get("k") is None
+
+def test_analyze_serves_repeated_inputs_from_cache(stub):
+    for session_id in ("cache-a", "cache-b"):
+        session_store.set(session_id, {
+            "resume_text": "Engineer skilled in Python and AWS.",
+            "job_description": "Required Skills:\n- Python\n- AWS"
+        })
+    first = client.post("/api/analyze", headers={"X-Session-Id": "cache-a"})
+    second = client.post("/api/analyze", headers={"X-Session-Id": "cache-b"})
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert stub.requests == 1
+    assert analysis_cache.stats()["hits"] == 1
@@ -0,0 +1,94 @@
+from fastapi.testclient import TestClient
+from backend.main import app, session_store, llm_client
+from backend.llm_client import LLMClient
+from backend.benchmarks.llm_stub import LLMStubServer
+import asyncio
+import time
+import openai
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+messages = [{"role": "user", "content": "Evaluate this resume."}]
+
+@pytest.fixture
+def stub():
+    with LLMStubServer() as server:
+        yield server
+
+def make_client(stub, **options):
+    return LLMClient(api_key="stub-key", base_url=stub.base_url, backoff_base=0.01, **options)
+
+"""
+Tests
+"""
+def test_chat_completion_against_stub(stub):
+    llm = make_client(stub)
+    completion = asyncio.run(llm.chat_completion(model="gpt-4o-mini", messages=messages))
+    assert '"fit_score": 80' in completion.choices[0].message.content
+    assert stub.prompts == ["Evaluate this resume."]
+    assert llm.stats()["requests"] == 1
+
+def test_chat_completion_retries_server_errors(stub):
+    stub.fail_first = 1
+    llm = make_client(stub, max_retries=2)
+    asyncio.run(llm.chat_completion(model="gpt-4o-mini", messages=messages))
+    assert stub.requests == 2
+    assert llm.stats()["retries"] == 1
+
+def test_chat_completion_gives_up_after_max_retries(stub):
+    stub.fail_first = 5
+    llm = make_client(stub, max_retries=1)
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(llm.chat_completion(model="gpt-4o-mini", messages=messages))
+    assert stub.requests == 2
+    assert llm.stats()["failures"] == 1
+
+def test_client_is_closed_on_loop_change_and_aclose(stub):
+    llm = make_client(stub, timeout=0.0)
+    assert llm.timeout == 0.0
+    llm.timeout = 30
+
+    async def call():
+        await llm.chat_completion(model="gpt-4o-mini", messages=messages)
+        return llm._client
+
+    first = asyncio.run(call())
+
+    async def call_then_close():
+        second = await call()
+        await llm.aclose()
+        return second
+
+    second = asyncio.run(call_then_close())
+    assert second is not first
+    assert first.is_closed() and second.is_closed()
+    assert llm._client is None
+
+def test_chat_completion_limits_concurrency(stub):
+    stub.latency = 0.2
+    llm = make_client(stub, max_concurrency=2)
+
+    async def run():
+        await asyncio.gather(*(llm.chat_completion(model="gpt-4o-mini", messages=messages) for _ in range(4)))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    assert time.perf_counter() - start >= 0.4
+    assert stub.requests == 4
+
+def test_fit_score_endpoint_uses_async_client(stub, monkeypatch):
+    monkeypatch.setattr(llm_client, "base_url", stub.base_url)
+    monkeypatch.setattr(llm_client, "api_key", "stub-key")
+    session_store.set("llm-session", {
+        "resume_text": "Engineer skilled in Python and AWS.",
+        "job_description": "Required Skills:\n- Python\n- AWS"
+    })
+    response = client.post("/api/fit-score", headers={"X-Session-Id": "llm-session"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["fit_score"] == 70
+    assert {"category": "skills", "text": "Include experience with AWS services."} in data["feedback"]
@@ -0,0 +1,97 @@
+from fastapi.testclient import TestClient
+from backend import main
+from backend.main import app, session_store
+from backend.local_scorer import JobCorpus, SimilarityScorer, SIMILARITY_METHODS
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+JOB = (
+    "We are hiring a backend engineer.\n"
+    "Required Skills:\n- Python\n- AWS\n- Machine Learning\n\n"
+    "Preferred Skills:\n- Docker, Kubernetes"
+)
+
+def make_scorer(*job_descriptions):
+    corpus = JobCorpus(":memory:", refresh_interval=0)
+    for job_description in job_descriptions:
+        corpus.add(job_description)
+    return SimilarityScorer(corpus)
+
+@pytest.fixture
+def fit_score_session(monkeypatch):
+    monkeypatch.setattr(main, "similarity_scorer", make_scorer(JOB))
+    session_store.set("local", {"resume_text": "Python and AWS engineer, Docker daily.", "job_description": JOB})
+    yield "local"
+    session_store.clear()
+
+"""
+Tests
+"""
+# CORPUS TESTS
+def test_corpus_counts_each_job_description_once():
+    corpus = JobCorpus(":memory:", refresh_interval=0)
+    assert corpus.add(JOB)
+    assert not corpus.add(JOB)
+    assert corpus.add("Required Skills:\n- Java")
+    assert corpus.stats()["documents"] == 2
+
+def test_rare_tokens_weigh_more():
+    corpus = JobCorpus(":memory:", refresh_interval=0)
+    corpus.add("Python and SQL")
+    corpus.add("Python and Java")
+    corpus.add("Python and Terraform")
+    idf, unknown_idf, average_length = corpus.idf_table()
+    assert idf["python"] < idf["sql"] < unknown_idf
+    assert idf["python"] > 0
+    assert average_length == 2
+
+def test_idf_table_is_reloaded_at_most_every_refresh_interval():
+    corpus = JobCorpus(":memory:", refresh_interval=3600)
+    corpus.add("Python")
+    table = corpus.idf_table()
+    corpus.add("Java")
+    assert corpus.idf_table() is table
+    corpus.refresh_interval = 0
+    assert "java" in corpus.idf_table()[0]
+    assert corpus.loads == 2
+
+# SIMILARITY TESTS
+@pytest.mark.parametrize("method", SIMILARITY_METHODS)
+def test_similarity_bounds(method):
+    scorer = make_scorer(JOB, "Required Skills:\n- Java\n- SQL")
+    assert scorer.score(JOB, JOB, method) == 100
+    assert scorer.score("Gardening and carpentry.", JOB, method) == 0
+    assert 0 < scorer.score("Python and AWS engineer", JOB, method) < 100
+
+@pytest.mark.parametrize("method", SIMILARITY_METHODS)
+def test_required_skills_weigh_more_than_other_words(method):
+    scorer = make_scorer(JOB)
+    assert scorer.score("Python, AWS and Machine Learning", JOB, method) > \
+        scorer.score("We are hiring a backend engineer", JOB, method)
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        make_scorer().score("Python", JOB, "word2vec")
+
+# ENDPOINT TESTS
+def test_fit_score_local_scoring_skips_the_llm(monkeypatch, fit_score_session):
+    async def no_llm(*args, **kwargs):
+        raise AssertionError("The LLM must not be called")
+    monkeypatch.setattr(main.llm_client, "chat_completion", no_llm)
+    response = client.post("/api/fit-score", json={"session_id": fit_score_session, "scoring": "bm25"})
+    assert response.status_code == 200
+    data = response.json()
+    assert 0 < data["similarity_score"] < 100
+    assert data["fit_score"] == main.calculate_fit_score(session_store[fit_score_session]["resume_text"], JOB)
+    assert sorted(data["matched_skills"]) == ["aws", "docker", "python"]
+    assert all(item["category"] == "skills" for item in data["feedback"])
+    assert main.similarity_scorer.stats()["requests"] == 1
+
+def test_fit_score_unknown_scoring(fit_score_session):
+    response = client.post("/api/fit-score", json={"session_id": fit_score_session, "scoring": "magic"})
+    assert response.status_code == 400
+    assert response.json()["status"] == "error"
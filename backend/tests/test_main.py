@@ -1,9 +1,11 @@
 from fastapi.testclient import TestClient
 from backend.database.models import User
-from backend.main import app, get_db, extract_text_from_pdf, temp_storage, calculate_fit_score, generate_feedback, tokenize, STOP_WORDS, extract_skills
+from backend.main import app, get_db, get_async_db, models, extract_text_from_pdf, session_store, llm_client, calculate_fit_score, generate_feedback, tokenize, extract_skills
+from backend.benchmarks.llm_stub import LLMStubServer
 from unittest.mock import MagicMock
 import pytest
 import os
+import json
 from io import BytesIO
 import jwt
 import bcrypt
@@ -24,15 +26,24 @@ def override_get_db():
         pass
 app.dependency_overrides[get_db] = override_get_db
 
+async def override_get_async_db():
+    yield models.ThreadedSession(mock_session)
+app.dependency_overrides[get_async_db] = override_get_async_db
+
 @pytest.fixture
 def mock_db_session():
     return mock_session
 
+@pytest.fixture
+def stub():
+    with LLMStubServer() as server:
+        yield server
+
 @pytest.fixture
 def clear_temp_storage():
-    temp_storage.clear()
+    session_store.clear()
     yield
-    temp_storage.clear()
+    session_store.clear()
 
 register_payload_1 = {
     "email": "test@example.com",
@@ -217,16 +228,16 @@ def test_data_insertion_and_retrieval(clear_temp_storage):
     )
     assert response.status_code == 200
     assert response.json()["message"] == "Resume uploaded successfully."
-    session_id = next(iter(temp_storage))
-    assert session_id in temp_storage 
-    assert "resume_text" in temp_storage[session_id]
-    assert temp_storage[session_id]["resume_text"] == "Resume text here"
+    session_id = next(iter(session_store))
+    assert session_id in session_store 
+    assert "resume_text" in session_store[session_id]
+    assert session_store[session_id]["resume_text"] == "Resume text here"
     job_description_payload = {"job_description": "Job description here"}
     job_response = client.post("/api/job-description", json=job_description_payload)
     assert job_response.status_code == 200
     assert job_response.json()["message"] == "Job description submitted successfully."
-    assert "job_description" in temp_storage[session_id]
-    assert temp_storage[session_id]["job_description"] == "Job description here"
+    assert "job_description" in session_store[session_id]
+    assert session_store[session_id]["job_description"] == "Job description here"
 
 # TOKENIZATION TESTS 
 
@@ -722,4 +733,42 @@ def test_fit_score_endpoint_oversized_inputs():
     }
 
     response = client.post("/api/fit-score")
-    assert response.status_code == 400
\ No newline at end of file
+    assert response.status_code == 400
+
+# FIT SCORE STREAMING TESTS
+
+def test_fit_score_streams_keyword_results_before_llm_feedback(stub, monkeypatch):
+    monkeypatch.setattr(llm_client, "base_url", stub.base_url)
+    monkeypatch.setattr(llm_client, "api_key", "stub-key")
+    stub.latency = 0.2
+    session_store.set("stream-session", {
+        "resume_text": "Engineer skilled in Python and Docker.",
+        "job_description": "Required Skills:\n- Python\n- AWS"
+    })
+    with client.stream("POST", "/api/fit-score", json={"session_id": "stream-session", "stream": True}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+    assert len(lines) == 2
+    partial, complete = lines
+    assert partial["status"] == "partial"
+    assert partial["fit_score"] == 35
+    assert partial["matched_skills"] == ["python"]
+    assert partial["missing_keywords"] == ["aws"]
+    assert partial["feedback"] == [{"category": "skills", "text": text} for text in partial["suggestions"]]
+    assert complete["status"] == "complete"
+    assert len(complete["feedback"]) > 1
+    assert complete["feedback"][-1] == partial["feedback"][0]
+
+def test_fit_score_stream_reports_llm_errors(monkeypatch):
+    async def failing_completion(**kwargs):
+        raise ValueError("LLM unavailable")
+    monkeypatch.setattr(llm_client, "chat_completion", failing_completion)
+    session_store.set("stream-error", {
+        "resume_text": "Engineer skilled in Go.",
+        "job_description": "Required Skills:\n- Go"
+    })
+    response = client.post("/api/fit-score", json={"session_id": "stream-error", "stream": True})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["status"] for line in lines] == ["partial", "error"]
+    assert "LLM unavailable" in lines[1]["error"]
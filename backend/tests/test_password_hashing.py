@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+from backend import main
+from backend.main import app
+from backend.password_hashing import PasswordHasher, HasherSaturated
+import asyncio
+import bcrypt
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+"""
+Tests
+"""
+def test_hash_and_verify():
+    hasher = PasswordHasher(rounds=4, max_workers=2)
+
+    async def run():
+        hashed = await hasher.hash("s3cret")
+        return hashed, await hasher.verify("s3cret", hashed), await hasher.verify("wrong", hashed.decode('utf-8'))
+
+    hashed, verified, wrong = asyncio.run(run())
+    assert hashed.startswith(b"$2b$04$")
+    assert verified and not wrong
+    stats = hasher.stats()
+    assert stats["hashes"] == 1
+    assert stats["verifications"] == 2
+    assert stats["in_flight"] == 0
+    assert stats["mean_hash_ms"] > 0
+    hasher.shutdown()
+
+def test_existing_hashes_keep_their_work_factor():
+    hashed = bcrypt.hashpw(b"s3cret", bcrypt.gensalt(5))
+    assert asyncio.run(PasswordHasher(rounds=4, max_workers=1).verify("s3cret", hashed))
+
+def test_concurrent_jobs_run_in_parallel():
+    hasher = PasswordHasher(rounds=4, max_workers=4)
+
+    async def run():
+        hashed = await hasher.hash("s3cret")
+        return await asyncio.gather(*(hasher.verify("s3cret", hashed) for _ in range(16)))
+
+    assert all(asyncio.run(run()))
+    assert hasher.stats()["verifications"] == 16
+
+def test_full_queue_rejects_jobs():
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_queue_depth=0)
+    with pytest.raises(HasherSaturated):
+        asyncio.run(hasher.hash("s3cret"))
+    assert hasher.stats()["rejected"] == 1
+
+def test_register_answers_429_when_saturated(monkeypatch, auth_headers):
+    # main raises the HasherSaturated of the module it imported
+    monkeypatch.setattr(main, "password_hasher", main.PasswordHasher(rounds=4, max_workers=1, max_queue_depth=0))
+    response = client.post("/api/register", json={"email": "busy@example.com", "password": "pass123", "username": "busy"})
+    assert response.status_code == 429
+    assert client.get("/api/metrics", headers=auth_headers).json()["password_hashing"]["rejected"] == 1
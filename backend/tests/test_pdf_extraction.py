@@ -0,0 +1,117 @@
+from backend.pdf_extraction import (
+    extract_text_from_pdf, extract_pdf_document, configured_backends, normalize_pages,
+    PdfBackend, PyPDF2Backend, BackendStats, BACKENDS
+)
+from PyPDF2 import PdfReader
+from PyPDF2._page import PageObject
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from unittest.mock import patch
+from io import BytesIO
+import pytest
+
+"""
+Setup and helper
+"""
+def create_multi_page_pdf(pages):
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    for lines in pages:
+        for i, line in enumerate(lines):
+            c.drawString(50, 750 - 15 * i, line)
+        c.showPage()
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+class FailingBackend(PdfBackend):
+    name = "failing"
+
+    def iter_pages(self, data):
+        raise RuntimeError("cannot parse")
+        yield
+
+class EmptyBackend(PdfBackend):
+    name = "empty"
+
+    def iter_pages(self, data):
+        yield ""
+
+def full_text(buffer):
+    text = ""
+    for page in PdfReader(buffer).pages:
+        text += page.extract_text() or ""
+    return " ".join(text.split())
+
+"""
+Tests
+"""
+def test_normalized_pages_match_whole_document_normalization():
+    pdf = create_multi_page_pdf([
+        ["Jane   Doe", "Python developer"],
+        [],
+        ["Skills:", "AWS,  Docker"],
+        ["Experience"],
+    ])
+    expected = full_text(pdf)
+    assert "".join(normalize_pages(PyPDF2Backend().iter_pages(pdf.getvalue()))) == expected
+
+def test_extract_text_from_pdf_stops_after_budget():
+    page = ["word " * 18] * 40
+    pdf = create_multi_page_pdf([page] * 6)
+    with patch.object(PageObject, "extract_text", autospec=True, side_effect=PageObject.extract_text) as extract:
+        text = extract_text_from_pdf(pdf, max_chars=5000)
+    assert len(text) > 5000
+    assert extract.call_count < 6
+
+def test_extract_text_from_pdf_without_budget_reads_every_page():
+    pdf = create_multi_page_pdf([["first page"], ["second page"]])
+    assert extract_text_from_pdf(pdf) == "first page second page"
+
+# BACKEND TESTS
+
+def test_backends_must_implement_iter_pages():
+    class NoPages(PdfBackend):
+        name = "none"
+
+    with pytest.raises(TypeError):
+        NoPages()
+
+def test_extract_pdf_document_falls_back_on_failure_and_empty_text():
+    data = create_multi_page_pdf([["Hello World"]]).getvalue()
+    result = extract_pdf_document(data, backends=[FailingBackend(), EmptyBackend(), PyPDF2Backend()])
+    assert result.text == "Hello World"
+    assert result.backend == "pypdf2"
+    assert result.pages == 1
+    assert result.bytes == len(data)
+
+def test_extract_pdf_document_reports_last_error():
+    try:
+        extract_pdf_document(b"not a pdf", backends=[FailingBackend()])
+    except ValueError as e:
+        assert "Failed to extract text from PDF: cannot parse" in str(e)
+    else:
+        raise AssertionError("Expected ValueError")
+
+def test_configured_backends_skips_unknown_and_keeps_default(monkeypatch):
+    monkeypatch.setenv("pdf_backends", "unknown, pypdf2")
+    assert [backend.name for backend in configured_backends()] == ["pypdf2"]
+    monkeypatch.setenv("pdf_backends", "unknown")
+    assert [backend.name for backend in configured_backends()] == ["pypdf2"]
+
+def test_optional_backends_match_default_output():
+    data = create_multi_page_pdf([["Jane Doe", "Python developer"], ["Skills: AWS, Docker"]]).getvalue()
+    expected = extract_pdf_document(data, backends=[BACKENDS["pypdf2"]]).text
+    for backend in BACKENDS.values():
+        if backend.available():
+            assert extract_pdf_document(data, backends=[backend]).text == expected
+
+def test_backend_stats_reports_throughput():
+    data = create_multi_page_pdf([["one"], ["two"]]).getvalue()
+    stats = BackendStats()
+    stats.record(extract_pdf_document(data))
+    report = stats.stats()["pypdf2"]
+    assert report["documents"] == 1
+    assert report["pages"] == 2
+    assert report["pages_per_sec"] > 0
+    assert report["bytes_per_sec"] > 0
@@ -0,0 +1,132 @@
+from fastapi.testclient import TestClient
+from backend import main
+from backend.main import app
+from backend.resume_index import ResumeIndex
+from backend.skills import calculate_fit_score
+from reportlab.pdfgen import canvas
+from io import BytesIO
+import random
+import sqlite3
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+SKILLS = ["Python", "AWS", "Docker", "Kubernetes", "SQL", "Node.js", "Machine Learning", "Terraform", "Java", "C#"]
+
+def random_resume(rng):
+    return "Engineer with " + ", ".join(rng.sample(SKILLS, rng.randint(0, 6))) + f". Candidate {rng.random()}"
+
+def brute_force(resumes, job_description, k):
+    scored = [(calculate_fit_score(text, job_description), resume_id) for resume_id, text in resumes.items()]
+    return [(resume_id, score) for score, resume_id in sorted(scored, key=lambda item: (-item[0], item[1])) if score > 0][:k]
+
+def create_pdf_in_memory(text):
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer)
+    c.drawString(100, 750, text)
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+JOB = (
+    "Required Skills:\n- Python\n- AWS\n- Machine Learning\n\n"
+    "Preferred Skills:\n- Docker, Kubernetes\n- Node.js"
+)
+
+"""
+Tests
+"""
+def test_top_k_matches_full_scan():
+    rng = random.Random(3)
+    index = ResumeIndex(":memory:")
+    resumes = {}
+    for _ in range(300):
+        text = random_resume(rng)
+        resumes[index.add(text)] = text
+    for k in (1, 5, 20, 500):
+        assert index.top_k(JOB, k) == brute_force(resumes, JOB, k)
+    job = "Required Skills:\n- SQL\nPreferred Skills:\n- Terraform; Java"
+    assert index.top_k(job, 10) == brute_force(resumes, job, 10)
+
+def test_top_k_terminates_early():
+    index = ResumeIndex(":memory:")
+    for i in range(20):
+        index.add(f"Python AWS Machine Learning expert {i}")
+    for i in range(200):
+        index.add(f"Docker and Kubernetes operator {i}")
+    results = index.top_k(JOB, 5)
+    assert [score for _, score in results] == [70] * 5
+    stats = index.stats()
+    assert stats["early_terminations"] == 1
+    # The long Docker and Kubernetes lists were only probed for the 20 candidates
+    assert stats["postings_read"] == 3 * 20
+    assert stats["probes"] == 3 * 20
+
+def test_add_is_idempotent_and_persistent(tmp_path):
+    path = str(tmp_path / "resumes.db")
+    index = ResumeIndex(path)
+    first = index.add("Python and AWS", digest="abc")
+    assert index.add("Python and AWS", digest="abc") == first
+    assert len(index) == 1
+    reopened = ResumeIndex(path)
+    assert reopened.top_k("Required Skills:\n- Python", 3) == [(first, 70)]
+    assert reopened.get(first) == {"digest": "abc", "text": None}
+
+def test_texts_are_only_kept_when_asked(tmp_path):
+    path = str(tmp_path / "resumes.db")
+    index = ResumeIndex(path, keep_text=True)
+    resume_id = index.add("Python and AWS", digest="abc")
+    assert index.get(resume_id) == {"digest": "abc", "text": "Python and AWS"}
+    index.reindex()
+    assert index.top_k("Required Skills:\n- AWS", 3) == [(resume_id, 70)]
+    # Opening the index without keep_text stores no new texts but keeps the old ones
+    reopened = ResumeIndex(path)
+    other_id = reopened.add("Docker", digest="def")
+    assert reopened.get(resume_id)["text"] == "Python and AWS"
+    assert reopened.get(other_id)["text"] is None
+    # Until they are dropped explicitly, keeping the postings
+    assert reopened.drop_texts() == 1
+    assert reopened.get(resume_id) == {"digest": "abc", "text": None}
+    reopened.reindex()
+    assert reopened.top_k("Required Skills:\n- AWS", 3) == [(resume_id, 70)]
+
+def test_top_k_without_skills():
+    index = ResumeIndex(":memory:")
+    index.add("Python")
+    assert index.top_k("No sections here", 5) == []
+    assert index.top_k(JOB, 0) == []
+
+# ENDPOINT TESTS
+
+def test_top_resumes_endpoint(monkeypatch, auth_headers):
+    index = ResumeIndex(":memory:")
+    monkeypatch.setattr(main, "resume_index", index)
+    strong = index.add("Python, AWS, Machine Learning, Docker", digest="strong")
+    weak = index.add("Python only", digest="weak")
+    response = client.post("/api/top-resumes", json={"job_description": JOB, "k": 2}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"resume_id": strong, "digest": "strong", "fit_score": 80},
+        {"resume_id": weak, "digest": "weak", "fit_score": 23},
+    ]
+    response = client.post("/api/top-resumes", json={"job_description": JOB, "k": 0}, headers=auth_headers)
+    assert response.status_code == 400
+    assert client.post("/api/top-resumes", json={"job_description": JOB, "k": 2}).status_code == 401
+    monkeypatch.setattr(main, "resume_index", None)
+    response = client.post("/api/top-resumes", json={"job_description": JOB}, headers=auth_headers)
+    assert response.status_code == 400
+
+def test_upload_succeeds_when_indexing_fails(monkeypatch):
+    class LockedIndex(ResumeIndex):
+        def add(self, text, digest=None):
+            raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(main, "resume_index", LockedIndex(":memory:"))
+    response = client.post(
+        "/api/resume-upload",
+        files={"file": ("resume.pdf", create_pdf_in_memory("Python and AWS"), "application/pdf")},
+    )
+    assert response.status_code == 200
+    assert main.session_store.get(response.json()["session_id"])["resume_text"]
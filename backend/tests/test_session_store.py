@@ -0,0 +1,193 @@
+from fastapi.testclient import TestClient
+from backend import main
+from backend.main import app, session_store
+from backend.session_store import SessionStore, MemorySessionStore, SQLiteSessionStore, SessionTooLarge, create_session_store
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from io import BytesIO
+from unittest.mock import patch
+import threading
+import time
+import pytest
+
+"""
+Setup and helper
+"""
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def factory(**options):
+        if request.param == "sqlite":
+            return SQLiteSessionStore(str(tmp_path / "sessions.db"), **options)
+        return MemorySessionStore(**options)
+    return factory
+
+def create_pdf_in_memory(text):
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.drawString(100, 750, text)
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+def upload_resume(client, text, headers=None):
+    response = client.post(
+        "/api/resume-upload",
+        files={"file": ("resume.pdf", create_pdf_in_memory(text), "application/pdf")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return response.json()["session_id"]
+
+"""
+Tests
+"""
+def test_store_set_get_update(make_store):
+    store = make_store()
+    store.set("abc", {"resume_text": "Resume"})
+    assert store.update("abc", job_description="Job")
+    assert store.get("abc") == {"resume_text": "Resume", "job_description": "Job"}
+    assert not store.update("missing", job_description="Job")
+    assert "abc" in store and "missing" not in store
+
+def test_membership_checks_leave_stats_and_recency_alone(make_store):
+    store = make_store(max_entries=2)
+    store.set("a", {"resume_text": "1"})
+    time.sleep(0.01)
+    store.set("b", {"resume_text": "2"})
+    time.sleep(0.01)
+    assert "a" in store and "missing" not in store
+    assert (store.stats()["hits"], store.stats()["misses"]) == (0, 0)
+    store.set("c", {"resume_text": "3"})
+    assert "a" not in store
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()
+
+def test_store_returns_copies(make_store):
+    store = make_store()
+    store.set("abc", {"resume_text": "Resume"})
+    store.get("abc")["resume_text"] = "Changed"
+    assert store.get("abc")["resume_text"] == "Resume"
+
+def test_store_evicts_least_recently_used(make_store):
+    store = make_store(max_entries=2)
+    store.set("a", {"resume_text": "1"})
+    time.sleep(0.01)
+    store.set("b", {"resume_text": "2"})
+    time.sleep(0.01)
+    store.get("a")
+    time.sleep(0.01)
+    store.set("c", {"resume_text": "3"})
+    assert sorted(store.keys()) == ["a", "c"]
+    assert store.stats()["evictions"] == 1
+
+def test_store_respects_byte_budget(make_store):
+    store = make_store(max_bytes=10)
+    store.set("a", {"resume_text": "x" * 6})
+    time.sleep(0.01)
+    store.set("b", {"resume_text": "y" * 6})
+    assert store.keys() == ["b"]
+    assert store.stats()["bytes"] == 6
+
+def test_oversized_writes_are_rejected_and_keep_the_session(make_store):
+    store = make_store(max_bytes=10)
+    store.set("a", {"resume_text": "x" * 6})
+    with pytest.raises(SessionTooLarge):
+        store.update("a", job_description="y" * 6)
+    with pytest.raises(SessionTooLarge):
+        store.set("a", {"resume_text": "z" * 11})
+    assert store.get("a") == {"resume_text": "x" * 6}
+
+def test_store_expires_sessions(make_store):
+    store = make_store(ttl=60)
+    store.set("a", {"resume_text": "Resume"})
+    later = time.time() + 120
+    with patch("time.monotonic", return_value=time.monotonic() + 120), patch("time.time", return_value=later):
+        assert store.get("a") is None
+        assert store.keys() == []
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    SQLiteSessionStore(path).set("abc", {"resume_text": "Resume"})
+    assert SQLiteSessionStore(path).get("abc") == {"resume_text": "Resume"}
+
+def test_sqlite_store_updates_are_atomic_across_instances(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    SQLiteSessionStore(path).set("shared", {"resume_text": "Resume"})
+
+    def worker(name):
+        store = SQLiteSessionStore(path)
+        for i in range(50):
+            assert store.update("shared", **{f"{name}_{i}": "x"})
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ("a", "b", "c")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(SQLiteSessionStore(path).get("shared")) == 1 + 3 * 50
+
+def test_create_session_store_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("session_store", "sqlite")
+    monkeypatch.setenv("session_store_path", str(tmp_path / "sessions.db"))
+    monkeypatch.setenv("session_max_entries", "5")
+    store = create_session_store()
+    assert isinstance(store, SQLiteSessionStore)
+    assert store.max_entries == 5
+
+# SESSION LOOKUP TESTS
+
+def test_resume_upload_sets_session_cookie():
+    client = TestClient(app)
+    session_id = upload_resume(client, "Cookie Resume")
+    assert client.cookies.get("session_id") == session_id
+    response = client.post("/api/job-description", json={"job_description": "Cookie job"})
+    assert response.status_code == 200
+    assert session_store.get(session_id)["job_description"] == "Cookie job"
+
+def test_concurrent_users_keep_separate_sessions():
+    first, second = TestClient(app), TestClient(app)
+    first_id = upload_resume(first, "First Resume")
+    second_id = upload_resume(second, "Second Resume")
+    anonymous = TestClient(app)
+    assert anonymous.post(
+        "/api/job-description", json={"job_description": "Second job"}, headers={"X-Session-Id": second_id}
+    ).status_code == 200
+    assert anonymous.post(
+        "/api/job-description", json={"job_description": "First job", "session_id": first_id}
+    ).status_code == 200
+    assert session_store.get(first_id) == {"resume_text": "First Resume", "job_description": "First job"}
+    assert session_store.get(second_id) == {"resume_text": "Second Resume", "job_description": "Second job"}
+
+def test_sessions_uploaded_with_a_token_belong_to_their_user():
+    owner = {"Authorization": f"Bearer {main.token_verifier.issue('owner@example.com')}"}
+    other = {"Authorization": f"Bearer {main.token_verifier.issue('other@example.com')}"}
+    client = TestClient(app)
+    session_id = upload_resume(client, "Owned Resume", headers=owner)
+    job = {"job_description": "Owned job", "session_id": session_id}
+    assert client.post("/api/job-description", json=job, headers=other).status_code == 400
+    assert client.post("/api/job-description", json=job).status_code == 400
+    assert client.post("/api/job-description", json=job, headers=owner).status_code == 200
+    assert client.post("/api/fit-score", json={"session_id": session_id}, headers=other).status_code == 400
+    assert session_store.get(session_id)["job_description"] == "Owned job"
+
+def test_oversized_job_description_gets_413(monkeypatch):
+    client = TestClient(app)
+    session_id = upload_resume(client, "Resume")
+    monkeypatch.setattr(main, "session_store", main.session_store.__class__(max_bytes=10))
+    main.session_store.set(session_id, {"resume_text": "Resume"})
+    response = client.post("/api/job-description", json={"job_description": "A long job"}, headers={"X-Session-Id": session_id})
+    assert response.status_code == 413
+    assert main.session_store.get(session_id) == {"resume_text": "Resume"}
+
+def test_requests_without_a_known_session_are_rejected():
+    client = TestClient(app)
+    upload_resume(TestClient(app), "Someone else")
+    response = client.post("/api/job-description", json={"job_description": "Job"})
+    assert response.status_code == 400
+    response = client.post("/api/job-description", json={"job_description": "Job"}, headers={"X-Session-Id": "unknown"})
+    assert response.status_code == 400
+    response = client.post("/api/fit-score", headers={"X-Session-Id": "unknown"})
+    assert response.status_code == 400
+    assert response.json()["error"] == "Resume or job description not provided."
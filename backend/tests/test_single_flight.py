@@ -0,0 +1,79 @@
+from backend.main import app, session_store, llm_client, analysis_cache, analysis_single_flight
+from backend.single_flight import SingleFlight
+from backend.benchmarks.llm_stub import LLMStubServer
+import asyncio
+import httpx
+
+"""
+Setup and helper
+"""
+async def slow_value(value, calls):
+    calls.append(value)
+    await asyncio.sleep(0.05)
+    return value
+
+async def slow_failure(calls):
+    calls.append(None)
+    await asyncio.sleep(0.05)
+    raise ValueError("upstream failed")
+
+"""
+Tests
+"""
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", lambda: slow_value(1, calls)) for _ in range(5)))
+
+    assert asyncio.run(run()) == [1] * 5
+    assert calls == [1]
+    assert flight.stats() == {"calls": 1, "deduplicated": 4, "in_flight": 0}
+
+def test_different_keys_and_sequential_calls_are_not_shared():
+    flight = SingleFlight()
+    calls = []
+
+    async def run():
+        await asyncio.gather(flight.do("a", lambda: slow_value("a", calls)), flight.do("b", lambda: slow_value("b", calls)))
+        await flight.do("a", lambda: slow_value("a", calls))
+
+    asyncio.run(run())
+    assert calls == ["a", "b", "a"]
+    assert flight.stats()["deduplicated"] == 0
+
+def test_errors_propagate_to_every_waiter():
+    flight = SingleFlight()
+    calls = []
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", lambda: slow_failure(calls)) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(calls) == 1
+
+def test_concurrent_identical_analyses_call_openai_once(monkeypatch):
+    analysis_cache.invalidate()
+    deduplicated = analysis_single_flight.deduplicated
+    session_store.set("flight-session", {
+        "resume_text": "Single flight engineer skilled in Python.",
+        "job_description": "Required Skills:\n- Python"
+    })
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/api/analyze", headers={"X-Session-Id": "flight-session"}) for _ in range(5)
+            ))
+
+    with LLMStubServer(latency=0.2) as stub:
+        monkeypatch.setattr(llm_client, "base_url", stub.base_url)
+        monkeypatch.setattr(llm_client, "api_key", "stub-key")
+        responses = asyncio.run(run())
+    assert [response.status_code for response in responses] == [200] * 5
+    assert stub.requests == 1
+    assert analysis_single_flight.deduplicated - deduplicated == 4
+    analysis_cache.invalidate()
@@ -0,0 +1,63 @@
+from backend.skill_matcher import SkillMatcher
+from backend.taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy
+import random
+import re
+
+"""
+Setup and helper
+"""
+with open(DEFAULT_TAXONOMY_PATH, "rb") as file:
+    MULTI_WORD_SKILLS = load_taxonomy(file.read())["skills"]
+
+def regex_for(skills):
+    return re.compile(
+        r'\b(' + '|'.join(re.escape(skill) for skill in sorted(skills, key=lambda x: -len(x))) + r')\b',
+        re.IGNORECASE
+    )
+
+def regex_spans(pattern, text):
+    return [match.span() for match in pattern.finditer(text)]
+
+FRAGMENTS = MULTI_WORD_SKILLS + [
+    "rest", "api", "data", "Node", "JS", "c", "+", "#", "/", ".", "_", "-", ",", " ", "  ", "\n",
+    "pipelines", "learning", "Machine", "x", "1", "é", "İ",
+]
+
+"""
+Tests
+"""
+def test_matcher_prefers_longest_skill():
+    matcher = SkillMatcher(["rest api", "rest apis", "api"])
+    assert list(matcher.finditer("Built REST APIs and an API.")) == [(6, 15), (23, 26)]
+
+def test_matcher_requires_word_boundaries():
+    matcher = SkillMatcher(["java", "c++"])
+    assert list(matcher.finditer("javascript java")) == [(11, 15)]
+    # Like the regex, a trailing \b after "+" needs a word character next
+    assert list(matcher.finditer("c++ c++x")) == [(4, 7)]
+
+def test_matcher_sub_replaces_matches():
+    matcher = SkillMatcher(MULTI_WORD_SKILLS)
+    text = "Machine Learning with Node.js and CI/CD Pipelines"
+    assert matcher.sub(lambda skill, value: skill.lower().replace(' ', '_').replace('/', '').replace('.', ''), text) == (
+        "machine_learning with nodejs and cicd_pipelines"
+    )
+
+def test_matcher_agrees_with_regex_on_random_text():
+    rng = random.Random(7)
+    pattern = regex_for(MULTI_WORD_SKILLS)
+    matcher = SkillMatcher(MULTI_WORD_SKILLS)
+    for _ in range(2000):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12)))
+        if rng.random() < 0.5:
+            text = text.upper()
+        assert list(matcher.finditer(text)) == regex_spans(pattern, text), text
+
+def test_matcher_agrees_with_regex_on_overlapping_vocabulary():
+    rng = random.Random(11)
+    skills = ["a", "ab", "abc", "bc", "bcd", "c", "cd a", "d a b", "a b"]
+    pattern = regex_for(skills)
+    matcher = SkillMatcher(skills)
+    for _ in range(2000):
+        text = "".join(rng.choice("abcd _.") for _ in range(rng.randint(0, 15)))
+        assert list(matcher.finditer(text)) == regex_spans(pattern, text), text
@@ -0,0 +1,88 @@
+from backend.skill_matrix import SkillMatrixScorer, matrix_fit_scores, weighted_fit_scores
+from backend.skills import calculate_fit_score, extract_skill_keys, skill_keys, weighted_fit_score
+from backend.taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy
+from unittest.mock import patch
+import random
+
+"""
+Setup and helper
+"""
+with open(DEFAULT_TAXONOMY_PATH, "rb") as file:
+    taxonomy = load_taxonomy(file.read())
+VOCABULARY = taxonomy["skills"] + list(taxonomy["aliases"]) + ["sql", "statistics", "leadership", "r"]
+
+def random_documents(rng, resume_count, job_count):
+    resumes = [
+        " ".join(rng.choice(VOCABULARY + ["and", "with", "team"]) for _ in range(rng.randint(0, 30)))
+        for _ in range(resume_count)
+    ]
+    jobs = []
+    for _ in range(job_count):
+        required = rng.sample(VOCABULARY, rng.randint(0, 7))
+        preferred = rng.sample(VOCABULARY, rng.randint(0, 5))
+        sections = []
+        if required or rng.random() < 0.5:
+            sections.append("Required Skills:\n" + "\n".join(f"- {skill}" for skill in required))
+        if preferred:
+            sections.append("Preferred Skills:\n" + ", ".join(preferred))
+        jobs.append("\n\n".join(sections))
+    return resumes, jobs
+
+"""
+Tests
+"""
+def test_matrix_scores_identical_to_scalar():
+    rng = random.Random(5)
+    resumes, jobs = random_documents(rng, 60, 40)
+    scores = matrix_fit_scores(resumes, jobs)
+    assert scores.shape == (60, 40)
+    for resume_index, resume in enumerate(resumes):
+        for job_index, job in enumerate(jobs):
+            assert scores[resume_index, job_index] == calculate_fit_score(resume, job)
+
+def test_matrix_scores_across_blocks():
+    rng = random.Random(9)
+    resumes, jobs = random_documents(rng, 25, 6)
+    scorer = SkillMatrixScorer(jobs, block_rows=4)
+    starts = [start for start, _ in scorer.iter_scores(resumes)]
+    assert starts == list(range(0, 25, 4))
+    assert (scorer.score(resumes) == matrix_fit_scores(resumes, jobs)).all()
+    # Blocks shrink so that resumes x jobs stays within block_pairs
+    scorer = SkillMatrixScorer(jobs, block_pairs=13)
+    assert [start for start, _ in scorer.iter_scores(resumes)] == list(range(0, 25, 2))
+    assert SkillMatrixScorer(jobs, block_pairs=1).block_rows == 1
+
+def test_job_masks_stay_sparse():
+    skills = taxonomy["skills"]
+    jobs = [f"Required Skills:\n- {skills[i % len(skills)]}\n- {skills[(i * 7 + 1) % len(skills)]}" for i in range(3000)]
+    scorer = SkillMatrixScorer(jobs)
+    # One entry per listed skill, not vocabulary x jobs
+    indptr, job_ids = scorer.required_mask
+    assert indptr.shape == (len(scorer.vocabulary) + 1,)
+    assert job_ids.shape == (2 * len(jobs),)
+    assert scorer.preferred_mask[1].shape == (0,)
+    resume = " ".join(skills[:5])
+    assert scorer.score([resume])[0].tolist() == [calculate_fit_score(resume, job) for job in jobs]
+
+def test_matrix_scores_edge_cases():
+    scores = matrix_fit_scores(["Python", None, ""], ["Required Skills:\n- Python", "", None])
+    assert scores.tolist() == [[70, 0, 0], [0, 0, 0], [0, 0, 0]]
+    assert matrix_fit_scores([], ["Required Skills:\n- Python"]).shape == (0, 1)
+
+def test_weighted_fit_scores_match_scalar_weighting():
+    for required_total in range(0, 8):
+        for preferred_total in range(0, 8):
+            for required in range(required_total + 1):
+                for preferred in range(preferred_total + 1):
+                    assert weighted_fit_scores(required, required_total, preferred, preferred_total) == (
+                        weighted_fit_score(required, required_total, preferred, preferred_total)
+                    )
+
+def test_matrix_tokenizes_each_document_once():
+    rng = random.Random(1)
+    resumes, jobs = random_documents(rng, 10, 5)
+    with patch("backend.skill_matrix.skill_keys", wraps=skill_keys) as tokenizer, \
+         patch("backend.skill_matrix.extract_skill_keys", wraps=extract_skill_keys) as extract:
+        matrix_fit_scores(resumes, jobs)
+    assert tokenizer.call_count == 10
+    assert extract.call_count == 5
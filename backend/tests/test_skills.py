@@ -0,0 +1,63 @@
+from backend.skills import analyze_skills, calculate_fit_score, generate_feedback, extract_skill_keys, skill_keys
+from unittest.mock import patch
+
+"""
+Setup and helper
+"""
+resume_text = (
+    "Jane Smith\n"
+    "Software Developer with experience in Python, Java, and SQL.\n"
+    "Projects have involved data pipelines, REST APIs, and Docker.\n"
+)
+
+job_description = (
+    "Required Skills:\n"
+    "- Python\n"
+    "- AWS\n"
+    "- REST APIs\n\n"
+    "Preferred Skills:\n"
+    "- Docker\n"
+    "- Kubernetes"
+)
+
+"""
+Tests
+"""
+def test_skill_analysis_matches_wrappers():
+    analysis = analyze_skills(resume_text, job_description)
+    assert analysis.fit_score() == calculate_fit_score(resume_text, job_description)
+    assert analysis.feedback() == generate_feedback(resume_text, job_description)
+    assert sorted(analysis.matched_skills) == ["docker", "python", "rest_apis"]
+    assert analysis.missing_required == ["aws"]
+    assert analysis.missing_preferred == ["kubernetes"]
+
+def test_skill_analysis_parses_each_input_once():
+    with patch("backend.skills.extract_skill_keys", wraps=extract_skill_keys) as extract, \
+         patch("backend.skills.skill_keys", wraps=skill_keys) as tokenizer:
+        analysis = analyze_skills(resume_text, job_description)
+        analysis.fit_score()
+        analysis.feedback()
+        analysis.matched_skills
+    assert extract.call_count == 1
+    assert tokenizer.call_count == 1
+
+def test_skill_analysis_without_skills():
+    analysis = analyze_skills(resume_text, "")
+    assert analysis.fit_score() == 0
+    assert analysis.feedback() == {"missing_keywords": [], "suggestions": []}
+    assert analysis.matched_skills == []
+
+def test_aliases_match_their_canonical_skill():
+    job = "Required Skills:\n- Node.js\n- CI/CD Pipelines\n\nPreferred Skills:\n- Kubernetes"
+    resume = "Built services in NodeJS, ran cicd pipelines on K8s."
+    analysis = analyze_skills(resume, job)
+    assert analysis.fit_score() == 100
+    assert sorted(analysis.matched_skills) == ["cicd_pipelines", "kubernetes", "nodejs"]
+
+def test_taxonomy_skills_are_compared_by_id():
+    required, preferred = extract_skill_keys("Required Skills:\n- Python, SQL\nPreferred Skills:\n- node js")
+    keys = skill_keys("python and nodejs and sql")
+    assert all(isinstance(key, int) for key in preferred)
+    assert {key for key in required if isinstance(key, int)} == {keys[0]}
+    assert "sql" in required and "sql" in keys
+    assert preferred == {keys[1]}
@@ -0,0 +1,104 @@
+from backend.skill_matcher import SkillMatcher
+from backend.skills import tokenize
+from backend.taxonomy import SkillTaxonomy, SkillIndex, compile_taxonomy, load_taxonomy
+import json
+import os
+import pytest
+import time
+
+"""
+Setup and helper
+"""
+def write_taxonomy(path, skills, aliases=None, stop_words=None, mtime=None):
+    path.write_text(json.dumps({
+        "version": 1,
+        "skills": skills,
+        "aliases": aliases or {},
+        "stop_words": stop_words or ["and", "with"]
+    }))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+def skill_tokens(index, text):
+    return [index.token(value) for _, _, value in index.matcher.matches(text)]
+
+"""
+Tests
+"""
+def test_compiled_index_matches_like_the_matcher(tmp_path):
+    skills = ["machine learning", "c++", "node.js", "ci/cd pipelines", "java"]
+    source = tmp_path / "taxonomy.json"
+    write_taxonomy(source, skills)
+    compile_taxonomy(source.read_bytes(), str(tmp_path / "taxonomy.idx"))
+    index = SkillIndex(str(tmp_path / "taxonomy.idx"))
+    text = "Java, C++ and Machine Learning with Node.js on CI/CD pipelines; javascript"
+    assert list(index.matcher.finditer(text)) == list(SkillMatcher(skills).finditer(text))
+    assert skill_tokens(index, text) == ["java", "machine_learning", "nodejs", "cicd_pipelines"]
+    assert index.stop_words == {"and", "with"}
+
+def test_aliases_resolve_to_their_skill(tmp_path):
+    source = tmp_path / "taxonomy.json"
+    write_taxonomy(source, ["kubernetes"], aliases={"k8s": "kubernetes"})
+    compile_taxonomy(source.read_bytes(), str(tmp_path / "taxonomy.idx"))
+    index = SkillIndex(str(tmp_path / "taxonomy.idx"))
+    assert tokenize("K8S and Kubernetes", index) == ["kubernetes", "kubernetes"]
+
+def test_invalid_taxonomy_is_rejected():
+    with pytest.raises(ValueError):
+        load_taxonomy(b"not json")
+    with pytest.raises(ValueError):
+        load_taxonomy(json.dumps({"skills": ["python"], "aliases": {"py": "pyhton"}}).encode())
+
+def test_taxonomy_reloads_when_file_changes(tmp_path):
+    source = tmp_path / "taxonomy.json"
+    write_taxonomy(source, ["machine learning"], mtime=1000)
+    taxonomy = SkillTaxonomy(str(source), reload_interval=0)
+    old_index = taxonomy.current()
+    assert taxonomy.reload() is False  # Unchanged
+
+    write_taxonomy(source, ["machine learning", "deep learning"], mtime=2000)
+    assert taxonomy.reload() is True
+    new_index = taxonomy.current()
+    assert skill_tokens(new_index, "deep learning") == ["deep_learning"]
+    # Callers still holding the previous index keep working
+    assert skill_tokens(old_index, "deep learning and machine learning") == ["machine_learning"]
+    assert taxonomy.stats()["loads"] == 2
+
+def test_taxonomy_keeps_current_index_on_broken_file(tmp_path):
+    source = tmp_path / "taxonomy.json"
+    write_taxonomy(source, ["machine learning"], mtime=1000)
+    taxonomy = SkillTaxonomy(str(source), reload_interval=0)
+    index = taxonomy.current()
+    source.write_text("{broken")
+    os.utime(source, (2000, 2000))
+    assert taxonomy.reload() is False
+    assert taxonomy.current() is index
+    assert taxonomy.stats()["reload_errors"] == 1
+    assert taxonomy.stats()["last_error"].startswith("ValueError: Invalid skill taxonomy")
+
+def test_taxonomy_reloads_in_the_background(tmp_path):
+    source = tmp_path / "taxonomy.json"
+    write_taxonomy(source, ["machine learning"], mtime=1000)
+    taxonomy = SkillTaxonomy(str(source), reload_interval=0.01)
+    taxonomy.start()
+    try:
+        index = taxonomy.current()
+        write_taxonomy(source, ["machine learning", "deep learning"], mtime=2000)
+        deadline = time.monotonic() + 5
+        while taxonomy.current() is index and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert skill_tokens(taxonomy.current(), "deep learning") == ["deep_learning"]
+    finally:
+        taxonomy.stop()
+    assert taxonomy.stats()["loads"] == 2
+
+def test_taxonomy_reuses_index_compiled_by_another_worker(tmp_path):
+    source = tmp_path / "taxonomy.json"
+    write_taxonomy(source, ["machine learning"])
+    first = SkillTaxonomy(str(source), reload_interval=0)
+    first.current()
+    second = SkillTaxonomy(str(source), reload_interval=0)
+    assert skill_tokens(second.current(), "machine learning") == ["machine_learning"]
+    assert first.stats()["compile_seconds"] is not None
+    assert second.stats()["compile_seconds"] is None
+    assert second.stats()["index_bytes"] == os.path.getsize(tmp_path / "taxonomy.idx")
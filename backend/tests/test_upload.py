@@ -0,0 +1,96 @@
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from backend.main import app, upload_stats
+from backend.upload import read_pdf_upload, content_length_exceeds, UploadStats, UploadTooLarge, NotAPdf
+from io import BytesIO
+import asyncio
+import hashlib
+import tracemalloc
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+class CountingFile(BytesIO):
+    def __init__(self, content):
+        super().__init__(content)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+def make_upload(content, declare_size=True):
+    stream = CountingFile(content)
+    return UploadFile(stream, size=len(content) if declare_size else None), stream
+
+"""
+Tests
+"""
+def test_read_pdf_upload_returns_content_and_digest():
+    content = b"%PDF-1.4\n" + b"x" * 200000
+    upload, _ = make_upload(content)
+    stats = UploadStats()
+    data, digest = asyncio.run(read_pdf_upload(upload, 1024 * 1024, stats, chunk_size=4096))
+    assert data == content
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert stats.stats()["accepted"] == 1
+    assert stats.stats()["largest_upload_bytes"] == len(content)
+
+def test_read_pdf_upload_holds_one_copy_of_the_content():
+    content = b"%PDF-1.4\n" + b"x" * (2 * 1024 * 1024)
+    upload, _ = make_upload(content)
+    tracemalloc.start()
+    data, _ = asyncio.run(read_pdf_upload(upload, 4 * 1024 * 1024))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert data == content
+    # The returned bytes plus a chunk in flight, not the chunks and their join
+    assert peak < 1.5 * len(content)
+
+def test_read_pdf_upload_rejects_declared_size_without_reading():
+    upload, stream = make_upload(b"%PDF-" + b"x" * 5000)
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(read_pdf_upload(upload, 1000))
+    assert stream.bytes_read == 0
+
+def test_read_pdf_upload_stops_at_limit_when_size_unknown():
+    upload, stream = make_upload(b"%PDF-" + b"x" * 100000, declare_size=False)
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(read_pdf_upload(upload, 10000, chunk_size=4096))
+    assert stream.bytes_read <= 10000 + 4096
+
+def test_read_pdf_upload_rejects_bad_magic_on_first_chunk():
+    upload, stream = make_upload(b"GIF89a" + b"x" * 100000, declare_size=False)
+    stats = UploadStats()
+    with pytest.raises(NotAPdf):
+        asyncio.run(read_pdf_upload(upload, 1024 * 1024, stats, chunk_size=4096))
+    assert stream.bytes_read == 4096
+    assert stats.stats()["rejected_not_pdf"] == 1
+
+def test_content_length_exceeds():
+    assert content_length_exceeds({"content-length": str(10 * 1024 * 1024)}, 2 * 1024 * 1024)
+    assert not content_length_exceeds({"content-length": str(2 * 1024 * 1024 + 1000)}, 2 * 1024 * 1024)
+    assert not content_length_exceeds({}, 100)
+    assert not content_length_exceeds({"content-length": "chunked"}, 100)
+
+def test_resume_upload_rejects_declared_oversized_body_before_reading_it():
+    rejected = upload_stats.stats()["rejected_too_large"]
+    response = client.post(
+        "/api/resume-upload",
+        files={"file": ("large.pdf", BytesIO(b"%PDF-" + b"x" * (3 * 1024 * 1024)), "application/pdf")},
+    )
+    assert response.status_code == 400
+    assert response.json() == {"error": "File size exceeds the 2MB limit.", "status": "error"}
+    assert upload_stats.stats()["rejected_too_large"] == rejected + 1
+
+def test_resume_upload_rejects_pdf_content_type_with_non_pdf_bytes():
+    response = client.post(
+        "/api/resume-upload",
+        files={"file": ("fake.pdf", BytesIO(b"This is not a valid PDF file."), "application/pdf")},
+    )
+    assert response.status_code == 400
+    assert response.json()["error"] == "Invalid file type. Only PDF files are allowed."
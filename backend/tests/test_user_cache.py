@@ -0,0 +1,113 @@
+from fastapi.testclient import TestClient
+from backend import main
+from backend.main import app, get_async_db
+from backend.user_cache import UserCache
+from backend.query_stats import QueryStats
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from types import SimpleNamespace
+import asyncio
+import httpx
+import pytest
+
+"""
+Setup and helper
+"""
+client = TestClient(app)
+
+USER = SimpleNamespace(email="cache@example.com", username="cache", hashed_password=b"hash")
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'users.db'}"
+    main.models.Base.metadata.create_all(bind=create_engine(url))
+    engine = main.models.create_async_database_engine(url)
+    SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    stats = main.QueryStats()
+    stats.install(engine.sync_engine)
+    monkeypatch.setattr(main, "query_stats", stats)
+    monkeypatch.setattr(main, "user_cache", main.UserCache(ttl=60))
+    monkeypatch.setattr(main, "password_hasher", main.PasswordHasher(rounds=4, max_workers=1))
+
+    async def override_get_async_db():
+        stats.session_opened()
+        async with SessionLocal() as db:
+            yield db
+
+    previous = app.dependency_overrides.get(get_async_db)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield stats
+    if previous is None:
+        app.dependency_overrides.pop(get_async_db)
+    else:
+        app.dependency_overrides[get_async_db] = previous
+    asyncio.run(engine.dispose())
+
+"""
+Tests
+"""
+# USER CACHE TESTS
+def test_cached_records_until_invalidated():
+    cache = UserCache(ttl=60)
+    assert cache.get(USER.email) is None
+    record = cache.put(USER)
+    assert record == {"email": "cache@example.com", "username": "cache", "hashed_password": b"hash"}
+    assert cache.get(USER.email) == record
+    cache.invalidate(USER.email)
+    assert cache.get(USER.email) is None
+    assert cache.stats()["hits"] == 1
+
+def test_zero_ttl_disables_the_cache():
+    cache = UserCache(ttl=0)
+    assert cache.put(USER)["email"] == USER.email
+    assert cache.get(USER.email) is None
+    assert not cache.stats()["enabled"]
+
+# QUERY STATS TESTS
+def test_queries_are_counted_per_route():
+    engine = create_engine("sqlite://")
+    stats = QueryStats()
+    stats.install(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        for queries in (2, 1):
+            counter, token = stats.begin()
+            for _ in range(queries):
+                connection.execute(text("SELECT 1"))
+            stats.end("/api/login", counter, token)
+        counter, token = stats.begin()
+        stats.end("/", counter, token)
+    assert stats.stats() == {"/api/login": {"requests": 2, "queries": 3, "max_queries": 2, "queries_per_request": 1.5}}
+
+# ENDPOINT TESTS
+def test_login_runs_one_query_then_hits_the_cache(database, auth_headers):
+    credentials = {"email": "cached@example.com", "password": "pass123"}
+    assert client.post("/api/register", json={**credentials, "username": "cached"}).status_code == 201
+    for _ in range(3):
+        assert client.post("/api/login", json=credentials).status_code == 200
+    assert client.post("/api/login", json={**credentials, "password": "wrong"}).status_code == 400
+    login = database.stats()["/api/login"]
+    assert login["requests"] == 4
+    assert login["max_queries"] == 1
+    assert login["queries"] == 1
+    metrics = client.get("/api/metrics", headers=auth_headers).json()
+    assert metrics["user_cache"]["hits"] == 3
+    assert metrics["db_queries"]["/api/login"]["queries_per_request"] == 0.25
+
+def test_concurrent_duplicate_registrations_get_400(database):
+    payload = {"email": "race@example.com", "password": "pass123", "username": "race"}
+
+    async def register_concurrently():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            responses = await asyncio.gather(*(async_client.post("/api/register", json=payload) for _ in range(5)))
+        return sorted(response.status_code for response in responses)
+
+    assert asyncio.run(register_concurrently()) == [201, 400, 400, 400, 400]
+
+def test_delete_invalidates_the_cached_user(database):
+    credentials = {"email": "deleted@example.com", "password": "pass123"}
+    client.post("/api/register", json={**credentials, "username": "deleted"})
+    assert client.post("/api/login", json=credentials).status_code == 200
+    assert client.delete("/api/delete", params={"email": credentials["email"]}).status_code == 200
+    assert client.post("/api/login", json=credentials).status_code == 400
@@ -0,0 +1,130 @@
+import hashlib
+import threading
+
+PDF_MAGIC = b"%PDF-"
+
+# Size of each read from the spooled upload
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Allowance for the multipart boundaries and part headers around an uploaded file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """
+    Raised as soon as an upload is known to exceed the size limit.
+    """
+
+
+class NotAPdf(ValueError):
+    """
+    Raised when the first bytes of an upload are not a PDF header.
+    """
+
+
+class UploadStats:
+    """
+    Counters for upload ingestion, including the size of the largest upload
+    read so far.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.rejected_too_large = 0
+        self.rejected_not_pdf = 0
+        self.bytes_read = 0
+        self.largest_upload_bytes = 0
+
+    def record(self, outcome, bytes_read):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.bytes_read += bytes_read
+            self.largest_upload_bytes = max(self.largest_upload_bytes, bytes_read)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Upload counters.
+        """
+        return {
+            "accepted": self.accepted,
+            "rejected_too_large": self.rejected_too_large,
+            "rejected_not_pdf": self.rejected_not_pdf,
+            "bytes_read": self.bytes_read,
+            "largest_upload_bytes": self.largest_upload_bytes,
+        }
+
+
+async def read_pdf_upload(file, max_bytes, stats=None, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    Validate an uploaded PDF in chunks, then read it in one piece.
+
+    By the time an `UploadFile` is handed over, Starlette has already spooled
+    the body (see `content_length_exceeds` for rejecting it earlier). The
+    declared size is checked before the spool is read, the magic bytes are
+    checked on the first chunk, and the validation pass stops as soon as the
+    running total passes `max_bytes`. Chunks are dropped once hashed, so the
+    validation pass holds one chunk at a time; the accepted file is then read
+    back from the spool as a single bytes object, without joining chunks.
+
+    Args:
+        file (UploadFile): The uploaded file.
+        max_bytes (int): The maximum accepted size in bytes.
+        stats (UploadStats): Optional counters to update.
+        chunk_size (int): The number of bytes read per chunk.
+
+    Returns:
+        tuple: The file content as bytes and its hex SHA-256 digest.
+
+    Raises:
+        UploadTooLarge: If the file is larger than `max_bytes`.
+        NotAPdf: If the file does not start with a PDF header.
+    """
+    def reject(error, outcome, bytes_read):
+        if stats is not None:
+            stats.record(outcome, bytes_read)
+        raise error
+
+    if file.size is not None and file.size > max_bytes:
+        reject(UploadTooLarge("File size exceeds the limit."), "rejected_too_large", 0)
+
+    digest = hashlib.sha256()
+    total = 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        # Spooled uploads return full chunks until EOF, so the header is in the first one
+        if total == 0 and not chunk.startswith(PDF_MAGIC):
+            reject(NotAPdf("File is not a PDF."), "rejected_not_pdf", len(chunk))
+        total += len(chunk)
+        if total > max_bytes:
+            reject(UploadTooLarge("File size exceeds the limit."), "rejected_too_large", total)
+        digest.update(chunk)
+
+    if total == 0:
+        reject(NotAPdf("File is not a PDF."), "rejected_not_pdf", total)
+    await file.seek(0)
+    data = await file.read()
+    if stats is not None:
+        stats.record("accepted", total)
+    return data, digest.hexdigest()
+
+def content_length_exceeds(headers, max_bytes):
+    """
+    Whether a request declares a body too large for an upload of `max_bytes`,
+    so it can be rejected before the body is read at all.
+
+    Args:
+        headers (Mapping): The request headers.
+        max_bytes (int): The maximum accepted file size in bytes.
+
+    Returns:
+        bool: True if Content-Length exceeds `max_bytes` plus the multipart
+            overhead; False if it does not or is not declared.
+    """
+    try:
+        return int(headers.get("content-length")) > max_bytes + MULTIPART_OVERHEAD
+    except (TypeError, ValueError):
+        return False
@@ -0,0 +1,72 @@
+import os
+from cache import LRUCache
+
+
+class UserCache:
+    """
+    Short-lived cache of user records in front of the users table.
+
+    Records are plain dicts of the user's email, username and password hash,
+    keyed by email, so they can be shared between requests without holding
+    on to ORM instances. They expire `ttl` seconds after they were loaded;
+    register and delete invalidate the user's entry in this process, and
+    other workers see the change once their entry expires. A `ttl` of 0
+    disables the cache.
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        if max_entries is None:
+            max_entries = int(os.getenv('user_cache_max_entries', 10000))
+        if ttl is None:
+            ttl = float(os.getenv('user_cache_ttl', 30))
+        self.ttl = ttl
+        self.enabled = ttl > 0 and max_entries > 0
+        self._cache = LRUCache(max_entries=max_entries, sizeof=lambda record: 1, ttl=ttl)
+
+    def get(self, email):
+        """
+        Args:
+            email (str): The user's email.
+
+        Returns:
+            dict | None: The cached user record, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        return self._cache.get(email)
+
+    def put(self, user):
+        """
+        Cache a user loaded from the database.
+
+        Args:
+            user (models.User): The user.
+
+        Returns:
+            dict: The user's record.
+        """
+        record = {"email": user.email, "username": user.username, "hashed_password": user.hashed_password}
+        if self.enabled:
+            self._cache.put(user.email, record)
+        return record
+
+    def invalidate(self, email):
+        """
+        Drop a user's record, after it was created, changed or deleted.
+
+        Args:
+            email (str): The user's email.
+        """
+        self._cache.pop(email)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Whether the cache is enabled, its TTL and its LRU counters.
+        """
+        stats = self._cache.stats()
+        stats.pop("bytes")
+        return {"enabled": self.enabled, "ttl": self.ttl, **stats}
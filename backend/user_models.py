@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class BaseUserPayload(BaseModel):
     email: str
@@ -10,9 +11,24 @@ class RegisterPayload(BaseUserPayload):
 class LoginPayload(BaseUserPayload):
     pass
 
-class JobDescriptionPayload(BaseModel):
+class SessionPayload(BaseModel):
+   session_id: Optional[str] = None
+
+class FitScorePayload(SessionPayload):
+   scoring: Optional[str] = None
+   stream: bool = False
+
+class JobDescriptionPayload(SessionPayload):
    job_description: str
 
+class BatchFitScorePayload(BaseModel):
+    resumes: List[str]
+    job_descriptions: List[str]
+
+class TopResumesPayload(BaseModel):
+    job_description: str
+    k: int = 10
+
 class InputData(BaseModel):
     resume_text: str
     job_description: str
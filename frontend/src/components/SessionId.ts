@@ -0,0 +1,15 @@
+// The session ID handed out by /api/resume-upload. The backend also sets it as
+// a cookie, but browsers only send that cookie when the backend is same-site,
+// so every call that needs the session sends it as the X-Session-Id header.
+const SESSION_ID_KEY = "sessionId";
+
+export const saveSessionId = (sessionId?: string) => {
+  if (sessionId) {
+    localStorage.setItem(SESSION_ID_KEY, sessionId);
+  }
+};
+
+export const sessionHeaders = (): Record<string, string> => {
+  const sessionId = localStorage.getItem(SESSION_ID_KEY);
+  return sessionId ? { "X-Session-Id": sessionId } : {};
+};
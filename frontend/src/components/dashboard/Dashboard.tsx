@@ -6,6 +6,7 @@ import SkillsMatched from './SkillsMatched';
 import ResumeView from './ResumeView';
 import FeedbackFilter from './FeedbackFilter';
 import CheckToken from '../CheckToken';
+import { sessionHeaders } from '../SessionId';
 import "../../styles/dashboard/dashboard.css";
 const backendUrl = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8000';
 
@@ -27,7 +28,7 @@ const Dashboard = () => {
   useEffect(() => {
     const getFitScoreData = async () => {
       try {
-        const response = await axios.post(`${backendUrl}/api/fit-score`);
+        const response = await axios.post(`${backendUrl}/api/fit-score`, null, { headers: sessionHeaders() });
         setFitScoreData(response.data);
         localStorage.setItem('fitScoreData', JSON.stringify(response.data));
         console.log('Fetched fit score data:', response.data);
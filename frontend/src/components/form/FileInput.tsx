@@ -1,5 +1,6 @@
 import React from "react";
 import axios from "axios";
+import { saveSessionId } from "../SessionId";
 import "../../styles/form/file_input.css"
 const backendUrl = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8000'; // Fallback to localhost in dev
 
@@ -34,6 +35,7 @@ const FileInput: React.FC<FileInputProps> = ({ label }) => {
         },
       });
 
+      saveSessionId(response.data.session_id);
       alert(response.data.message);
     } catch (error) {
       console.error(error);
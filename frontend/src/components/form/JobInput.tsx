@@ -1,5 +1,6 @@
 import React, { useState } from "react";
 import axios from "axios";
+import { sessionHeaders } from "../SessionId";
 import "../../styles/styles.css"; // Import global styles
 const backendUrl = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8000'; // Fallback to localhost in dev
 
@@ -24,7 +25,8 @@ const JobInput: React.FC<JobInputProps> = ({ label }) => {
         `${backendUrl}/api/job-description`,
         {
           job_description: text,
-        }
+        },
+        { headers: sessionHeaders() }
       );
       alert(response.data.message);
     } catch (error) {
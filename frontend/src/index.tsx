@@ -1,9 +1,14 @@
 import React from 'react';
 import ReactDOM from 'react-dom/client';
+import axios from 'axios';
 import './styles/styles.css';
 import App from './App';
 import reportWebVitals from './reportWebVitals';
 
+// Send the session_id cookie set by /api/resume-upload along with the
+// X-Session-Id header, for backends on the same site
+axios.defaults.withCredentials = true;
+
 const root = ReactDOM.createRoot(
   document.getElementById('root') as HTMLElement
 );
@@ -81,13 +81,33 @@ describe("JobInput Component", () => {
     await waitFor(() =>
       expect(axios.post).toHaveBeenCalledWith(
         "http://localhost:8000/api/job-description",
-        { job_description: "This is a sample job description." }
+        { job_description: "This is a sample job description." },
+        { headers: {} }
       )
     );
 
     expect(window.alert).toHaveBeenCalledWith("Job description submitted successfully");
   });
 
+  test("sends the session ID saved by the resume upload", async () => {
+    localStorage.setItem("sessionId", "session-123");
+    (axios.post as jest.Mock).mockResolvedValueOnce({ data: { message: "Job description submitted successfully" } });
+
+    render(<JobInput label="Job Description" softLimit={0} hardLimit={5000}/>);
+
+    fireEvent.change(screen.getByPlaceholderText("Enter the job description here..."), { target: { value: "Python" } });
+    fireEvent.click(screen.getByRole("button", { name: "Submit" }));
+
+    await waitFor(() =>
+      expect(axios.post).toHaveBeenCalledWith(
+        "http://localhost:8000/api/job-description",
+        { job_description: "Python" },
+        { headers: { "X-Session-Id": "session-123" } }
+      )
+    );
+    localStorage.removeItem("sessionId");
+  });
+
   test("shows error alert when submission fails", async () => {
     const mockError = new Error("Network Error");
 